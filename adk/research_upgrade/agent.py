@@ -1,9 +1,10 @@
-import google.generativeai as genai
 from src.agents.base import Agent
 
 class RootAgent(Agent):
     """Root agent for handling user queries."""
     def __init__(self, api_key: str):
         super().__init__("RootAgent", "Main Assistant", None, None)
+        # Imported here: google.generativeai is slow to import and only this agent needs it.
+        import google.generativeai as genai
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel('gemini-pro')
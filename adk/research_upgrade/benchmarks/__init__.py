@@ -0,0 +1 @@
+"""Benchmarks for the research workflow; see `run_benchmarks.py`."""
@@ -0,0 +1,65 @@
+"""
+Synthetic Paper Corpora and Offline Search Tools
+
+Corpora reuse the stand-in server's deterministic paper generator, so a
+benchmark at size N sees the same papers on every machine and every run.
+`CorpusSearchTool` replaces ArXivTool / SemanticScholarTool: it answers each
+planner query from an in-memory corpus without any network or sleeping.
+"""
+from typing import Any, Dict, List, Tuple
+
+from src.tools.standin_server import synthetic_paper
+
+CORPUS_QUERY = "benchmark corpus"
+
+
+def to_tool_paper(paper: Dict[str, Any], source: str) -> Dict[str, Any]:
+    """Shape a synthetic paper like the dicts returned by the network tools."""
+    return {
+        "title": paper["title"],
+        "authors": list(paper["authors"]),
+        "abstract": paper["abstract"],
+        "year": str(paper["year"]),
+        "url": f"http://arxiv.org/abs/{paper['id']}v1",
+        "doi": f"10.48550/arXiv.{paper['id']}",
+        "arxiv_id": paper["id"],
+        "source": source,
+    }
+
+
+def make_corpus(size: int) -> List[Dict[str, Any]]:
+    """`size` distinct papers, as returned by the arXiv tool."""
+    return [to_tool_paper(synthetic_paper(CORPUS_QUERY, i), "arxiv") for i in range(size)]
+
+
+def make_source_corpora(size: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """arXiv and Semantic Scholar result sets for a workflow run over `size` papers.
+
+    Every other Semantic Scholar paper is also on arXiv (same DOI, so it is
+    merged by deduplication); the rest only exist on Semantic Scholar.
+    """
+    arxiv = make_corpus(size)
+    semantic_scholar = [
+        to_tool_paper(synthetic_paper(CORPUS_QUERY, i if i % 2 == 0 else size + i), "semantic_scholar")
+        for i in range(size)
+    ]
+    return arxiv, semantic_scholar
+
+
+class CorpusSearchTool:
+    """Offline stand-in for a search tool.
+
+    Queries are assigned round-robin to `shards` disjoint slices of the corpus
+    in first-seen order, so the planner's queries together return the whole
+    corpus once instead of the same top results ten times.
+    """
+
+    def __init__(self, papers: List[Dict[str, Any]], shards: int = 10):
+        self.papers = papers
+        self.shards = max(1, shards)
+        self._assigned: Dict[str, int] = {}
+
+    async def search(self, query: str, max_results: int = 100) -> List[Dict[str, Any]]:
+        shard = self._assigned.setdefault(query, len(self._assigned) % self.shards)
+        # Copies: the retriever annotates the dicts it returns.
+        return [dict(p) for p in self.papers[shard::self.shards][:max_results]]
@@ -0,0 +1,347 @@
+"""
+Benchmark Suite
+
+Times each agent on its own, the output formatters, and the whole
+`ResearchWorkflow.execute` over synthetic corpora of 10, 1k, 10k and 100k
+papers. Network tools are replaced by `CorpusSearchTool`, so runs are offline
+and deterministic. For every benchmark and size the suite records the median
+and best wall time over `--repeat` runs, plus peak traced memory from one
+extra run under `tracemalloc` (kept separate because tracing slows code down).
+
+`startup` runs each entry point of `benchmarks/startup.py` under
+`python -X importtime` (best of `--repeat`) and checks its total import time
+against a fixed budget (not the baseline: times this small are too noisy for
+a ratio), so a heavy import that creeps back into `--help`, `--replay` or a
+batch worker fails the suite. Both apps are covered: this one and the crewAI
+app two levels up. `tests/test_startup.py` checks the same entry points
+without timing them: it fails if one imports a module it must not.
+
+Results are written as JSON. Pass `--baseline` to compare against an earlier
+results file; the exit status is 1 if anything got slower or bigger than the
+tolerance allows, so the suite can gate a change before it ships.
+
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --baseline bench.json --output bench_new.json
+    python -m benchmarks.run_benchmarks --full --only ResearchWorkflow
+    python -m benchmarks.run_benchmarks --only startup
+"""
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from config.settings import Settings
+from src.agents.research_agents import ResearchPlannerAgent, PaperRetrieverAgent, ContentExtractorAgent
+from src.agents.analysis_agents import AnalysisAgent, CriticAgent, ValidatorAgent, ReferenceManagerAgent, SynthesisAgent
+from src.memory.paper_table import PaperTable
+from src.memory.research_memory import ResearchMemory
+from src.orchestration.workflow import ResearchWorkflow
+from src.output.formatters import OutputFormatter
+from src.tools.citation_generator import CitationGeneratorTool
+from src.tools.fact_checker_tool import FactCheckerTool
+from benchmarks.corpus import CORPUS_QUERY, CorpusSearchTool, make_corpus, make_source_corpora
+from benchmarks.startup import STARTUP, import_time
+
+RESULTS_VERSION = 1
+# 100k papers takes tens of minutes (mostly retrieval dedup), so it is opt-in via --sizes.
+DEFAULT_SIZES = (10, 1000, 10000)
+FULL_SIZES = DEFAULT_SIZES + (100000,)
+
+# A setup coroutine receives (size, workdir) and returns the coroutine function to time.
+Setup = Callable[[int, Path], Awaitable[Callable[[], Awaitable[Any]]]]
+
+
+class _NullLogger:
+    """Accepts every WorkflowLogger call and prints nothing."""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+# Corpora are generated once per size and shared; benchmarks copy papers before mutating them.
+_corpora: Dict[int, List[Dict[str, Any]]] = {}
+_source_corpora: Dict[int, Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]] = {}
+
+
+def corpus(size: int) -> List[Dict[str, Any]]:
+    if size not in _corpora:
+        _corpora[size] = make_corpus(size)
+    return _corpora[size]
+
+
+def source_corpora(size: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    if size not in _source_corpora:
+        _source_corpora[size] = make_source_corpora(size)
+    return _source_corpora[size]
+
+
+def _memory(size: int) -> ResearchMemory:
+    return ResearchMemory(max_entries=max(1000, size))
+
+
+async def _prepared_memory(size: int, upto: str) -> ResearchMemory:
+    """Memory holding every agent result produced before `upto` in the workflow."""
+    memory, logger = _memory(size), _NullLogger()
+    await ResearchPlannerAgent(memory, logger).execute(CORPUS_QUERY)
+    memory.store_agent_result("PaperRetrieverAgent", {"papers": PaperTable.from_records(corpus(size)), "count": size})
+    stages = [
+        ("ContentExtractorAgent", lambda: ContentExtractorAgent(memory, logger)),
+        ("AnalysisAgent", lambda: AnalysisAgent(memory, logger)),
+        ("CriticAgent", lambda: CriticAgent(memory, logger)),
+        ("ReferenceManagerAgent", lambda: ReferenceManagerAgent(memory, logger, CitationGeneratorTool())),
+        ("ValidatorAgent", lambda: ValidatorAgent(memory, logger, FactCheckerTool())),
+        ("SynthesisAgent", lambda: SynthesisAgent(memory, logger)),
+    ]
+    for name, make in stages:
+        if name == upto:
+            break
+        await make().execute()
+    return memory
+
+
+# Benchmarks
+async def setup_retriever(size: int, workdir: Path):
+    memory, logger = _memory(size), _NullLogger()
+    await ResearchPlannerAgent(memory, logger).execute(CORPUS_QUERY)
+    arxiv, semantic_scholar = source_corpora(size)
+    agent = PaperRetrieverAgent(memory, logger, CorpusSearchTool(arxiv), CorpusSearchTool(semantic_scholar))
+    return lambda: agent.execute(max_papers=size)
+
+
+def _agent_setup(name: str, make: Callable[[ResearchMemory], Any]) -> Setup:
+    async def setup(size: int, workdir: Path):
+        memory = await _prepared_memory(size, name)
+        agent = make(memory)
+        return agent.execute
+    return setup
+
+
+async def setup_formatter(size: int, workdir: Path):
+    memory = await _prepared_memory(size, "end")
+    synthesis = memory.get_agent_result("SynthesisAgent")
+    data_package = {"literature_review": synthesis.get("literature_review", ""), **memory.get_all_results()}
+    formatter = OutputFormatter(Settings(output_dir=str(workdir)))
+
+    async def run():
+        stem = formatter.default_stem()
+        await asyncio.gather(*(formatter.generate(fmt, data_package, stem=stem) for fmt in ("json", "markdown", "html")))
+    return run
+
+
+async def setup_workflow(size: int, workdir: Path):
+    settings = Settings(
+        max_papers=size,
+        output_dir=str(workdir),
+        source_rate_limits={},
+        enable_search_cache=False,
+        enable_checkpoints=False,
+        enable_tracing=False,
+        memory_cache_size=max(1000, size),
+    )
+    workflow = ResearchWorkflow(settings, _NullLogger())
+    arxiv, semantic_scholar = source_corpora(size)
+    workflow.paper_retriever.arxiv_tool = CorpusSearchTool(arxiv)
+    workflow.paper_retriever.semantic_tool = CorpusSearchTool(semantic_scholar)
+
+    async def run():
+        try:
+            return await workflow.execute(CORPUS_QUERY)
+        finally:
+            await workflow.aclose()
+    return run
+
+
+BENCHMARKS: Dict[str, Setup] = {
+    "PaperRetrieverAgent": setup_retriever,
+    "ContentExtractorAgent": _agent_setup("ContentExtractorAgent", lambda m: ContentExtractorAgent(m, _NullLogger())),
+    "AnalysisAgent": _agent_setup("AnalysisAgent", lambda m: AnalysisAgent(m, _NullLogger())),
+    "CriticAgent": _agent_setup("CriticAgent", lambda m: CriticAgent(m, _NullLogger())),
+    "ReferenceManagerAgent": _agent_setup(
+        "ReferenceManagerAgent", lambda m: ReferenceManagerAgent(m, _NullLogger(), CitationGeneratorTool())),
+    "ValidatorAgent": _agent_setup("ValidatorAgent", lambda m: ValidatorAgent(m, _NullLogger(), FactCheckerTool())),
+    "SynthesisAgent": _agent_setup("SynthesisAgent", lambda m: SynthesisAgent(m, _NullLogger())),
+    "OutputFormatter": setup_formatter,
+    "ResearchWorkflow": setup_workflow,
+}
+
+
+# Measurement
+async def _timed(setup: Setup, size: int) -> float:
+    with tempfile.TemporaryDirectory(prefix="bench_") as workdir:
+        run = await setup(size, Path(workdir))
+        gc.collect()
+        started = time.perf_counter()
+        await run()
+        return time.perf_counter() - started
+
+
+async def _traced(setup: Setup, size: int) -> int:
+    """Peak bytes allocated by the timed section, above what setup left behind."""
+    with tempfile.TemporaryDirectory(prefix="bench_") as workdir:
+        run = await setup(size, Path(workdir))
+        gc.collect()
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            await run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return max(0, peak - baseline)
+
+
+def measure(setup: Setup, size: int, repeat: int, trace_memory: bool = True) -> Dict[str, Any]:
+    times = [asyncio.run(_timed(setup, size)) for _ in range(max(1, repeat))]
+    result = {
+        "wall_s": round(statistics.median(times), 6),
+        "best_s": round(min(times), 6),
+        "runs": len(times),
+    }
+    if trace_memory:
+        result["peak_mb"] = round(asyncio.run(_traced(setup, size)) / 2**20, 3)
+    return result
+
+
+def measure_startup(repeat: int) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for name, (cwd, args, budget, _) in STARTUP.items():
+        if not cwd.is_dir():
+            continue
+        runs = [import_time(cwd, args) for _ in range(max(1, repeat))]
+        result = {
+            "import_s": round(min(r[0] for r in runs), 6),
+            "wall_s": round(statistics.median(r[1] for r in runs), 6),
+            "budget_s": budget,
+        }
+        results[f"startup:{name}"] = result
+        flag = "" if result["import_s"] <= budget else "  OVER BUDGET"
+        print(f"{'startup':<24} {name:<22} {result['import_s'] * 1000:>8.2f} ms imports "
+              f"(budget {budget * 1000:.0f} ms), {result['wall_s'] * 1000:.0f} ms wall{flag}", flush=True)
+    return results
+
+
+def over_budget(report: Dict[str, Any]) -> List[str]:
+    return [key for key, r in report["results"].items() if "budget_s" in r and r["import_s"] > r["budget_s"]]
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def run_suite(names: List[str], sizes: List[int], repeat: int, trace_memory: bool = True) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, Any]] = {}
+    if "startup" in names:
+        results.update(measure_startup(repeat))
+    for size in sizes:
+        for name in names:
+            if name == "startup":
+                continue
+            # Large corpora are slow; one timed run is enough to spot a regression there.
+            runs = repeat if size <= 10000 else 1
+            result = measure(BENCHMARKS[name], size, runs, trace_memory)
+            results[f"{name}@{size}"] = result
+            peak = f", peak {result['peak_mb']:.1f} MB" if "peak_mb" in result else ""
+            print(f"{name:<24} n={size:<7} {result['wall_s'] * 1000:>10.2f} ms{peak}", flush=True)
+    return {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float,
+            min_seconds: float) -> List[Dict[str, Any]]:
+    """Benchmarks that got slower (or used more memory) than `tolerance` allows.
+
+    Time is compared on the best run, which is the least sensitive to noise
+    from other processes. Timings under `min_seconds` in both files are ignored.
+    """
+    regressions = []
+    for key, now in current["results"].items():
+        before = baseline.get("results", {}).get(key)
+        if not before:
+            continue
+        checks = [("best_s", min_seconds), ("peak_mb", 1.0)]
+        for metric, floor in checks:
+            old, new = before.get(metric), now.get(metric)
+            if old is None or new is None or max(old, new) < floor or old <= 0:
+                continue
+            ratio = new / old
+            if ratio > 1 + tolerance:
+                regressions.append({"benchmark": key, "metric": metric, "baseline": old,
+                                    "current": new, "ratio": round(ratio, 3)})
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the research agents and workflow")
+    parser.add_argument("--sizes", type=str, default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated corpus sizes")
+    parser.add_argument("--full", action="store_true", help="Also run the 100k-paper corpus")
+    parser.add_argument("--only", type=str, default=None, help="Comma-separated benchmark names to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark (median is reported)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run")
+    parser.add_argument("--output", type=str, default="benchmark_results.json", help="Where to write results")
+    parser.add_argument("--baseline", type=str, default=None, help="Earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown/growth, e.g. 0.25 = 25%%")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="Ignore timings below this as noise")
+    args = parser.parse_args()
+
+    sizes = list(FULL_SIZES) if args.full else [int(s) for s in args.sizes.split(",") if s.strip()]
+    available = ["startup", *BENCHMARKS]
+    names = [n.strip() for n in args.only.split(",")] if args.only else available
+    unknown = [n for n in names if n not in available]
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(unknown)}. Available: {', '.join(available)}")
+
+    report = run_suite(names, sizes, args.repeat, trace_memory=not args.no_memory)
+    status = 0
+    slow_starts = over_budget(report)
+    if slow_starts:
+        print(f"{len(slow_starts)} entry point(s) over their startup budget: {', '.join(slow_starts)}")
+        status = 1
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance, args.min_seconds)
+        report["baseline"] = {"path": args.baseline, "commit": baseline.get("meta", {}).get("commit", ""),
+                              "tolerance": args.tolerance, "regressions": regressions}
+        for r in regressions:
+            print(f"REGRESSION {r['benchmark']} {r['metric']}: {r['baseline']} -> {r['current']} (x{r['ratio']})")
+        print(f"{len(regressions)} regression(s) against {args.baseline}")
+        status = 1 if regressions or slow_starts else 0
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results: {args.output}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
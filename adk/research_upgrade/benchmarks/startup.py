@@ -0,0 +1,72 @@
+"""
+Startup Entry Points
+
+The entry points whose startup is guarded, and what each must not import.
+`run_benchmarks --only startup` times them against their budgets;
+`tests/test_startup.py` checks, deterministically, that none of them loads a
+heavy dependency it has no use for. Only the standard library is imported
+here, so reading `STARTUP` costs nothing.
+"""
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, FrozenSet, List, NamedTuple, Set, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CREW_ROOT = PROJECT_ROOT.parent.parent
+
+# Dependencies that make startup slow; only the code that needs them imports them.
+CREWAI = frozenset({"crewai", "crewai_tools"})
+HEAVY = CREWAI | {"google.generativeai", "numpy", "aiohttp"}
+
+
+class EntryPoint(NamedTuple):
+    cwd: Path
+    args: List[str]
+    budget: float  # seconds of total import time, interpreter startup included
+    absent: FrozenSet[str]  # modules (and their submodules) it must not import
+
+
+STARTUP: Dict[str, EntryPoint] = {
+    "main --help": EntryPoint(PROJECT_ROOT, ["main.py", "--help"], 0.25, HEAVY),
+    "artifact_store --help": EntryPoint(PROJECT_ROOT, ["-m", "src.output.artifact_store", "--help"], 0.25, HEAVY),
+    # What `main.py --replay/--batch` and batch workers load before any work starts
+    "import workflow": EntryPoint(PROJECT_ROOT, ["-c", "import src.orchestration.workflow"], 0.6,
+                                  CREWAI | {"google.generativeai"}),
+    "crew main --help": EntryPoint(CREW_ROOT, ["-m", "src.research_crew.main", "--help"], 0.25, HEAVY),
+    "crew run_index --help": EntryPoint(CREW_ROOT, ["-m", "src.research_crew.run_index", "--help"], 0.25, HEAVY),
+}
+# Rows of `-X importtime` output: "import time: <self> | <cumulative> | <indent><module>";
+# top-level imports have no indent.
+_IMPORT_TIME_ROW = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _importtime(cwd: Path, args: List[str]) -> Tuple[str, float]:
+    """stderr and wall seconds of one `python -X importtime` run."""
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=cwd,
+                         capture_output=True, text=True, timeout=120)
+    wall = time.perf_counter() - started
+    if out.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} exited with {out.returncode}: {out.stderr.strip().splitlines()[-1:]}")
+    return out.stderr, wall
+
+
+def import_time(cwd: Path, args: List[str]) -> Tuple[float, float]:
+    """(total import seconds, process wall seconds) of one `python -X importtime` run."""
+    stderr, wall = _importtime(cwd, args)
+    rows = (m for m in map(_IMPORT_TIME_ROW.match, stderr.splitlines()) if m and len(m.group(2)) == 1)
+    return sum(int(m.group(1)) for m in rows) / 1e6, wall
+
+
+def imported_modules(cwd: Path, args: List[str]) -> Set[str]:
+    """Every module one run imports (beyond those loaded with the interpreter)."""
+    stderr, _ = _importtime(cwd, args)
+    return {m.group(3) for m in map(_IMPORT_TIME_ROW.match, stderr.splitlines()) if m}
+
+
+def unwanted(modules: Set[str], absent: FrozenSet[str]) -> List[str]:
+    """The modules of `absent` that were imported, directly or through a submodule."""
+    return sorted(name for name in absent if any(m == name or m.startswith(name + ".") for m in modules))
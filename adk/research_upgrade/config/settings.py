@@ -2,14 +2,36 @@
 Configuration Settings for Google ADK Research Assistant
 """
 
+import hashlib
+import json
 import os
-from dataclasses import dataclass, field
-from typing import List
-from pathlib import Path
-from dotenv import load_dotenv
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List
 
-# Load environment variables from .env file
-load_dotenv()
+_dotenv_loaded = False
+
+
+def _env(name: str, default: str = "") -> str:
+    """`os.getenv`, after loading `.env` once. python-dotenv is imported on first
+    use, when Settings is created, rather than when this module is imported."""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _dotenv_loaded = True
+    return os.getenv(name, default)
+
+# Fields that only affect where/how results are written or transported, not what
+# the agents compute. They are left out of the checkpoint fingerprint so that,
+# e.g., changing output formats does not invalidate earlier agent results.
+_NON_SEMANTIC_FIELDS = frozenset({
+    "google_api_key", "semantic_scholar_api_key",
+    "output_dir", "output_formats", "fast_json", "artifact_store", "log_level", "verbose", "enable_tracing", "trace_path",
+    "log_file", "log_json", "log_max_bytes", "log_backup_count",
+    "http_timeout", "http_max_connections", "http_max_connections_per_host", "http_max_retries",
+    "enable_search_cache", "search_cache_path",
+    "enable_checkpoints", "checkpoint_dir", "resume", "batch_concurrency", "enable_parallel",
+})
 
 
 @dataclass
@@ -17,8 +39,8 @@ class Settings:
     """Application settings"""
 
     # API Keys
-    google_api_key: str = field(default_factory=lambda: os.getenv("GOOGLE_API_KEY", ""))
-    semantic_scholar_api_key: str = field(default_factory=lambda: os.getenv("SEMANTIC_SCHOLAR_API_KEY", ""))
+    google_api_key: str = field(default_factory=lambda: _env("GOOGLE_API_KEY", ""))
+    semantic_scholar_api_key: str = field(default_factory=lambda: _env("SEMANTIC_SCHOLAR_API_KEY", ""))
 
     # Research Parameters
     max_papers: int = 50
@@ -26,34 +48,83 @@ class Settings:
     # Agent Configuration
     enable_parallel: bool = True
     enable_validation: bool = True
+    # Opt-in: stream papers through retrieval -> extraction -> citation
+    enable_streaming: bool = False
+    stream_queue_size: int = 32
+
+    # Retrieval fan-out: global limit on concurrent query/source calls, plus
+    # per-source budgets in calls/second (arXiv pages are also spaced by ArXivTool).
+    retrieval_concurrency: int = 8
+    source_rate_limits: Dict[str, float] = field(default_factory=lambda: {"semantic_scholar": 1.0})
 
     # Tool Configuration
     arxiv_max_results: int = 100
+    arxiv_page_size: int = 100
+    arxiv_page_concurrency: int = 3
+    arxiv_request_interval: float = 3.0  # arXiv asks for >= 3s between requests
     semantic_scholar_max_results: int = 100
+    # Point these at a local stand-in server (src/tools/standin_server.py) for offline runs
+    arxiv_base_url: str = field(default_factory=lambda: _env("ARXIV_BASE_URL", "https://export.arxiv.org/api/query"))
+    semantic_scholar_base_url: str = field(
+        default_factory=lambda: _env("SEMANTIC_SCHOLAR_BASE_URL", "https://api.semanticscholar.org/graph/v1"))
     web_scraper_timeout: int = 30
 
+    # HTTP Transport Configuration (one pooled client per workflow)
+    http_timeout: int = 15
+    http_max_connections: int = 100
+    http_max_connections_per_host: int = 10
+    http_max_retries: int = 4
+    # Record/replay: "off", "record" (save final responses) or "replay" (no network)
+    http_cassette_mode: str = field(default_factory=lambda: _env("HTTP_CASSETTE_MODE", "off"))
+    http_cassette_path: str = field(default_factory=lambda: _env("HTTP_CASSETTE_PATH", ""))
+
     # Output Configuration
     output_dir: str = "./output"
     output_formats: List[str] = field(default_factory=lambda: ["markdown", "json", "html"])
+    fast_json: bool = True  # encode the JSON output with orjson when it is installed
+    # Opt-in: store outputs as compressed, de-duplicated blobs in <output_dir>/.store
+    # instead of regular files; the review_<ts>.* names become views
+    # (python -m src.output.artifact_store cat ...)
+    artifact_store: bool = False
+    # Stream BibTeX/APA citations to <output_dir>/<stem>.bib and .apa.txt instead of
+    # keeping every string in memory (for very large bibliographies); the review
+    # then has no reference list of its own.
+    stream_citations: bool = False
 
     # Logging Configuration
     log_level: str = "INFO"
     verbose: bool = False
+    log_file: str = "logs/workflow.log"
+    log_json: bool = False  # one JSON object per line instead of text
+    log_max_bytes: int = 10 * 2**20  # rotate past this size
+    log_backup_count: int = 5
+    # Span tracing (workflow / agent / tool call), appended as JSONL per run
+    enable_tracing: bool = True
+    trace_path: str = "./logs/traces.jsonl"
 
     # Memory Configuration
     memory_cache_size: int = 1000
     memory_ttl: int = 3600  # 1 hour in seconds
 
+    # Persistent search-result cache (uses memory_ttl and memory_cache_size)
+    enable_search_cache: bool = True
+    search_cache_path: str = "./.cache/search_cache.sqlite3"
+
+    # Checkpointing: every agent result is persisted; `resume` reuses unchanged ones
+    enable_checkpoints: bool = True
+    checkpoint_dir: str = "./.cache/checkpoints"
+    resume: bool = False
+
+    # Batch mode: topics run concurrently in one process, sharing pools and caches
+    batch_concurrency: int = 4
+
     # Validation Configuration
     fact_check_threshold: float = 0.8
     consistency_threshold: float = 0.75
 
     def __post_init__(self):
-        """Validate and setup settings"""
-        # Create output directory
-        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
-        (Path(self.output_dir) / "logs").mkdir(exist_ok=True)
-        
+        """Validate settings. Directories are created by whatever writes to them
+        (OutputFormatter, the logger, caches), not here."""
         if not self.google_api_key:
             print("⚠️  Warning: GOOGLE_API_KEY not set in environment. The application may not function correctly.")
 
@@ -65,4 +136,9 @@ class Settings:
             "enable_validation": self.enable_validation,
             "output_formats": self.output_formats,
             "verbose": self.verbose
-        }
\ No newline at end of file
+        }
+
+    def fingerprint(self) -> str:
+        """Stable hash of the settings that influence agent results."""
+        relevant = {k: v for k, v in asdict(self).items() if k not in _NON_SEMANTIC_FIELDS}
+        return hashlib.sha256(json.dumps(relevant, sort_keys=True, default=str).encode("utf-8")).hexdigest()
@@ -4,7 +4,9 @@ Main entry point for the Research Assistant
 
 import argparse
 import asyncio
+import json
 import sys
+from datetime import datetime
 from pathlib import Path
 
 # Ensure `src` package is importable when running this script directly
@@ -16,32 +18,65 @@ SRC_DIR = PROJECT_ROOT / "src"
 # imports that use the `src.` package namespace. Adding the project root
 # (which contains `src/`) is sufficient so `import src...` resolves.
 
-from src.orchestration.workflow import ResearchWorkflow
-from config.settings import Settings
-from src.monitoring.logger import WorkflowLogger
+# The workflow (NumPy, aiohttp, every agent) and settings (python-dotenv) are imported
+# inside main(), after the arguments parse, so `--help` and usage errors return at once.
 
 
-async def main():
+def parse_args(argv=None):
     parser = argparse.ArgumentParser(description="Run the Research Workflow")
     parser.add_argument("topic", nargs="?", default="Artificial Intelligence in Healthcare", help="Research topic to analyze")
     parser.add_argument("--max-papers", type=int, default=10, help="Maximum number of papers to retrieve and analyze")
     parser.add_argument("--output-dir", type=str, default=None, help="Override output directory")
-    args = parser.parse_args()
+    parser.add_argument("--stream", action="store_true", help="Extract and cite each paper as soon as it is retrieved")
+    parser.add_argument("--stream-citations", action="store_true", help="Write citations straight to .bib/.apa.txt files instead of keeping them in memory")
+    parser.add_argument("--artifact-store", action="store_true", help="Keep the review files as compressed, de-duplicated blobs in <output-dir>/.store")
+    parser.add_argument("--resume", action="store_true", help="Reuse checkpointed agent results whose inputs are unchanged")
+    parser.add_argument("--record", type=str, default=None, metavar="CASSETTE", help="Record arXiv/Semantic Scholar responses to CASSETTE")
+    parser.add_argument("--replay", type=str, default=None, metavar="CASSETTE", help="Answer arXiv/Semantic Scholar requests from CASSETTE, offline")
+    parser.add_argument("--batch", type=str, default=None, metavar="FILE", help="Run every topic in FILE (one per line, '-' for stdin) in one process")
+    parser.add_argument("--concurrency", type=int, default=None, help="Number of batch topics to run at once")
+    return parser.parse_args(argv)
+
+
+async def main(args=None):
+    args = args or parse_args()
+    from config.settings import Settings
+    from src.monitoring.logger import WorkflowLogger
+    from src.orchestration.workflow import ResearchWorkflow
 
     # Initialize settings and logger
     settings = Settings()
     if args.output_dir:
         settings.output_dir = args.output_dir
     settings.max_papers = args.max_papers
-    logger = WorkflowLogger(verbose=settings.verbose)
+    settings.enable_streaming = args.stream or settings.enable_streaming
+    settings.stream_citations = args.stream_citations or settings.stream_citations
+    settings.artifact_store = args.artifact_store or settings.artifact_store
+    settings.resume = args.resume or settings.resume
+    if args.record:
+        # A warm search cache would hide requests from the recorder.
+        settings.http_cassette_mode, settings.http_cassette_path = "record", args.record
+        settings.enable_search_cache = False
+    elif args.replay:
+        settings.http_cassette_mode, settings.http_cassette_path = "replay", args.replay
+    logger = WorkflowLogger.from_settings(settings)
 
-    try:
-        # Initialize the research workflow
-        workflow = ResearchWorkflow(settings, logger)
+    if args.batch:
+        try:
+            await run_batch(args, settings, logger)
+        finally:
+            logger.close()
+        return
 
+    # Initialize the research workflow
+    workflow = ResearchWorkflow(settings, logger)
+
+    try:
         # Execute the workflow with the provided topic
         print(f"Running research workflow for topic: {args.topic}")
         results = await workflow.execute(args.topic)
+        # Let the background writer catch up so the summary isn't interleaved with log lines
+        logger.flush()
 
         # Print results summary
         print("\nWorkflow Results:")
@@ -52,11 +87,50 @@ async def main():
         print("\nOutput Files:")
         for file in results['output_files']:
             print(f"- {file}")
+        if settings.artifact_store:
+            print("(review files are stored compressed; read them with: python -m src.output.artifact_store cat <file name>)")
+        if results.get('trace_id'):
+            print(f"\nTrace: {settings.trace_path} (trace_id {results['trace_id']})")
 
     except Exception as e:
         logger.error(f"Main workflow failed: {str(e)}", exc_info=True)
         raise
+    finally:
+        await workflow.aclose()
+        logger.close()
+
+
+async def run_batch(args, settings, logger):
+    from src.orchestration.batch import BatchRunner, read_topics
+
+    if args.batch == "-":
+        topics = read_topics(sys.stdin)
+    else:
+        with open(args.batch, "r", encoding="utf-8") as f:
+            topics = read_topics(f)
+    if not topics:
+        print(f"No topics found in {args.batch}")
+        return
+
+    concurrency = args.concurrency or settings.batch_concurrency
+    print(f"Running research workflow for {len(topics)} topics (concurrency {concurrency})")
+    summary = await BatchRunner(settings, logger, concurrency=concurrency).run(topics)
+    logger.flush()
+
+    print("\nBatch Results:")
+    print(f"Topics: {summary['succeeded']}/{summary['topics']} succeeded")
+    print(f"Wall Time: {summary['wall_time_s']:.2f} seconds")
+    print(f"Throughput: {summary['topics_per_min']:.1f} topics/min, {summary['papers_per_sec']:.2f} papers/s")
+    for phase, stats in summary["phase_latency_s"].items():
+        print(f"- {phase}: p50 {stats['p50']:.2f}s, p95 {stats['p95']:.2f}s")
+    for failure in summary["failed"]:
+        print(f"FAILED {failure['topic']}: {failure['error']}")
+
+    summary_path = Path(settings.output_dir) / f"batch_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, default=str)
+    print(f"\nSummary: {summary_path}")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main(parse_args()))
\ No newline at end of file
@@ -1,12 +1,16 @@
 # src/agents/analysis_agents.py
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
-from collections import Counter
+import numpy as np
 from .base import Agent  # Import the base class
+from src.memory.paper_table import PaperTable, factorize
+from src.monitoring import tracing
+from src.output.review_renderer import ChunkSink, ReviewRenderer
 
 class AnalysisAgent(Agent):
     """Analyzes research methods, identifies patterns, and extracts trends."""
+    depends_on = ("ContentExtractorAgent",)
     def __init__(self, memory, logger):
         super().__init__("AnalysisAgent", "Methodology Comparison Expert", memory, logger)
 
@@ -23,46 +27,137 @@ class AnalysisAgent(Agent):
             if not content_result or not content_result.get("extracted_papers"):
                 raise ValueError("No extracted content found in memory to analyze.")
             
-            papers = content_result.get("extracted_papers", [])
-            
-            # Perform mock analysis
-            all_methodologies = [method for p in papers for method in p.get("methodology", [])]
-            method_counts = Counter(all_methodologies)
-            
-            comparison_table = [{
-                "methodology": method,
-                "count": count,
-                "percentage": (count / len(all_methodologies) * 100) if all_methodologies else 0,
-                "avg_relevance": 0.85 # Mock value
-            } for method, count in method_counts.items()]
-
-            all_years = [p.get("year") for p in papers if p.get("year")]
-            year_counts = Counter(all_years)
-            peak_year = year_counts.most_common(1)[0][0] if year_counts else "N/A"
+            papers = PaperTable.from_records(content_result.get("extracted_papers", []))
+            result = self.analyze(papers)
+            method_count = result["methodology_comparison"]["total_methodologies"]
 
-            result = {
-                "methodology_comparison": {
-                    "comparison_table": sorted(comparison_table, key=lambda x: x['count'], reverse=True),
-                    "total_methodologies": len(method_counts),
-                    "most_common": method_counts.most_common(1)[0][0] if method_counts else "N/A"
-                },
-                "trends_analysis": {
-                    "yearly_trends": [{"year": y, "paper_count": c} for y, c in sorted(year_counts.items())],
-                    "total_years_covered": len(year_counts),
-                    "peak_year": peak_year
-                },
-                "total_papers_analyzed": len(papers)
-            }
-            
             self.memory.store_agent_result(self.name, result)
-            self.logger.agent_complete(self.name, "success", f"Analyzed {len(papers)} papers and identified {len(method_counts)} methodologies.")
+            tracing.annotate(papers=len(papers), methodologies=method_count)
+            self.logger.agent_complete(self.name, "success", f"Analyzed {len(papers)} papers and identified {method_count} methodologies.")
             return result
         except Exception as e:
             self.logger.log_error(self.name, str(e))
             return {"error": str(e)}
 
+    @staticmethod
+    def analyze(papers: PaperTable, top_n: int = 10) -> Dict[str, Any]:
+        """Group-by aggregates over the table's columns.
+
+        Counts and relevance means are NumPy `bincount`s over integer group
+        codes; building the codes for methodologies and authors (`factorize`)
+        is one dict lookup per value. Groups without a scored paper report
+        `avg_relevance` None, not 0.0.
+        """
+        n = len(papers)
+        relevance = papers.column("relevance") if papers.has_column("relevance") else np.full(n, np.nan)
+        scored = ~np.isnan(relevance)
+        weights = np.where(scored, relevance, 0.0)
+
+        def grouped(codes: np.ndarray, rows: np.ndarray, groups: int) -> Tuple[np.ndarray, np.ndarray]:
+            # Per-group paper counts and mean relevance over the scored papers (NaN if none are scored)
+            counts = np.bincount(codes, minlength=groups)
+            rel_sum = np.bincount(codes, weights=weights[rows], minlength=groups)
+            rel_n = np.bincount(codes, weights=scored[rows], minlength=groups)
+            return counts, np.divide(rel_sum, rel_n, out=np.full(groups, np.nan), where=rel_n > 0)
+
+        def mean(value: float) -> Any:
+            return None if np.isnan(value) else round(float(value), 4)
+
+        # Methodologies: one entry per (paper, methodology) in the flattened list column
+        if papers.has_column("methodology"):
+            method_values, method_offsets = papers.list_column("methodology")
+            method_values = method_values[method_offsets[0]:method_offsets[-1]]
+            method_rows = np.repeat(np.arange(n), np.diff(method_offsets))
+        else:
+            method_values, method_rows = np.empty(0, dtype=object), np.empty(0, dtype=np.int64)
+        method_codes, methods = factorize(method_values)
+        method_counts, method_rel = grouped(method_codes, method_rows, len(methods))
+        total_mentions = len(method_codes)
+        method_order = sorted(range(len(methods)), key=lambda m: -method_counts[m])
+
+        comparison_table = [{
+            "methodology": methods[m],
+            "count": int(method_counts[m]),
+            "percentage": float(method_counts[m] / total_mentions * 100),
+            "avg_relevance": mean(method_rel[m]),
+        } for m in method_order]
+
+        # Years: int16 column, 0 = unknown
+        years = papers.years.astype(np.int64)
+        dated = np.flatnonzero(years > 0)
+        year_values, year_codes = np.unique(years[dated], return_inverse=True)
+        year_counts = np.bincount(year_codes, minlength=len(year_values))
+        peak_year = str(year_values[np.argmax(year_counts)]) if len(year_values) else "N/A"
+
+        # Year x methodology: combined group key over the dated methodology mentions
+        year_index = np.full(n, -1, dtype=np.int64)
+        year_index[dated] = year_codes
+        mention_years = year_index[method_rows]
+        keep = mention_years >= 0
+        pair_counts = np.bincount(mention_years[keep] * len(methods) + method_codes[keep],
+                                  minlength=len(year_values) * len(methods))
+        methodology_by_year = [{
+            "year": str(year_values[k // len(methods)]),
+            "methodology": methods[k % len(methods)],
+            "paper_count": int(pair_counts[k]),
+        } for k in np.flatnonzero(pair_counts)]
+
+        # Sources: categorical codes, -1 = unknown
+        if papers.has_column("source"):
+            source_codes, sources = papers.column("source").astype(np.int64), papers.categories("source")
+            known = np.flatnonzero(source_codes >= 0)
+            source_counts, source_rel = grouped(source_codes[known], known, len(sources))
+        else:
+            sources, source_counts, source_rel = [], np.zeros(0, dtype=np.int64), np.zeros(0)
+        source_breakdown = [{
+            "source": sources[i],
+            "paper_count": int(source_counts[i]),
+            "percentage": float(source_counts[i] / n * 100),
+            "avg_relevance": mean(source_rel[i]),
+        } for i in np.argsort(-source_counts, kind="stable") if source_counts[i]]
+
+        # Authors: flattened list column, top-N by paper count (ties keep first-seen order)
+        if papers.has_column("authors"):
+            author_values, author_offsets = papers.list_column("authors")
+            author_values = author_values[author_offsets[0]:author_offsets[-1]]
+        else:
+            author_values = np.empty(0, dtype=object)
+        author_codes, authors = factorize(author_values)
+        author_counts = np.bincount(author_codes, minlength=len(authors))
+        top = np.argsort(-author_counts, kind="stable")[:top_n]
+        top_authors = [{"author": authors[i], "paper_count": int(author_counts[i])} for i in top]
+
+        return {
+            "methodology_comparison": {
+                "comparison_table": comparison_table,
+                "total_methodologies": len(methods),
+                "most_common": methods[method_order[0]] if methods else "N/A"
+            },
+            "trends_analysis": {
+                "yearly_trends": [{"year": str(y), "paper_count": int(c)} for y, c in zip(year_values, year_counts)],
+                "total_years_covered": len(year_values),
+                "peak_year": peak_year,
+                "methodology_by_year": methodology_by_year,
+            },
+            "source_analysis": {
+                "source_breakdown": source_breakdown,
+                "total_sources": len(source_breakdown),
+            },
+            "author_analysis": {
+                "top_authors": top_authors,
+                "unique_authors": len(authors),
+            },
+            "relevance_analysis": {
+                "avg_relevance": round(float(relevance[scored].mean()), 4) if scored.any() else None,
+                "median_relevance": round(float(np.median(relevance[scored])), 4) if scored.any() else None,
+                "scored_papers": int(scored.sum()),
+            },
+            "total_papers_analyzed": n
+        }
+
 class CriticAgent(Agent):
     """Identifies limitations, research gaps, and weaknesses in the body of research."""
+    depends_on = ("ContentExtractorAgent",)
     def __init__(self, memory, logger):
         super().__init__("CriticAgent", "Academic Quality Assessor", memory, logger)
 
@@ -95,6 +190,7 @@ class CriticAgent(Agent):
 
 class ValidatorAgent(Agent):
     """Verifies factual accuracy, checks for consistency, and mitigates hallucinations."""
+    depends_on = ("AnalysisAgent", "CriticAgent", "PaperRetrieverAgent")
     def __init__(self, memory, logger, fact_checker):
         super().__init__("ValidatorAgent", "Fact Validation Specialist", memory, logger)
         self.fact_checker = fact_checker
@@ -138,16 +234,14 @@ class ValidatorAgent(Agent):
 
             papers = retrieval.get("papers", []) if isinstance(retrieval, dict) else []
 
-            # Check each claim using the fact checker tool (limit sources for speed)
-            verifications = []
-            for claim in claims:
-                try:
-                    check = await self.fact_checker.check_claim(claim, papers[:3])
-                    verifications.append(check)
-                except Exception as e:
-                    # Log but continue
-                    self.logger.log_error(self.name, f"Fact check failed for claim '{claim}': {e}")
-                    verifications.append({"claim": claim, "verified": False, "confidence": 0.0, "supporting_sources": []})
+            # Check every claim in one batched call: a single evidence index over all papers
+            try:
+                verifications = await self.fact_checker.check_claims(claims, papers)
+            except Exception as e:
+                # Log but continue
+                self.logger.log_error(self.name, f"Fact check failed: {e}")
+                verifications = [{"claim": claim, "verified": False, "refuted": False, "confidence": 0.0, "supporting_sources": []}
+                                 for claim in claims]
 
             # Compute a simple quality metric based on confidences
             confidences = [v.get("confidence", 0.0) for v in verifications if isinstance(v, dict)]
@@ -157,6 +251,7 @@ class ValidatorAgent(Agent):
                 "quality_score": round(quality_score, 4),
                 "factual_accuracy": {
                     "verification_count": len([v for v in verifications if v.get("verified")]),
+                    "refuted_count": len([v for v in verifications if v.get("refuted")]),
                     "total_checked": len(verifications),
                     "details": verifications
                 },
@@ -165,6 +260,7 @@ class ValidatorAgent(Agent):
             }
 
             self.memory.store_agent_result(self.name, result)
+            tracing.annotate(claims=len(claims), sources=len(papers))
             self.logger.agent_complete(self.name, "success", f"Validation complete. Final Quality Score: {result['quality_score']:.2f}")
             return result
         except Exception as e:
@@ -173,16 +269,24 @@ class ValidatorAgent(Agent):
 
 class ReferenceManagerAgent(Agent):
     """Generates properly formatted citations (e.g., BibTeX, APA) for all retrieved papers."""
-    def __init__(self, memory, logger, citation_tool):
+    depends_on = ("PaperRetrieverAgent",)
+    def __init__(self, memory, logger, citation_tool, export_to: Optional[str] = None):
         super().__init__("ReferenceManagerAgent", "Citation Management Specialist", memory, logger)
         self.citation_tool = citation_tool
+        # Path stem for streamed citation files (`<stem>.bib`, `<stem>.apa.txt`); None keeps them in memory
+        self.export_to = export_to
+
+    def export_paths(self) -> Tuple[str, str]:
+        return f"{self.export_to}.bib", f"{self.export_to}.apa.txt"
 
     async def execute(self) -> Dict[str, Any]:
         """
         Generates BibTeX and APA citations for all retrieved papers.
         
         Returns:
-            A dictionary containing lists of BibTeX and APA citations.
+            A dictionary containing lists of BibTeX and APA citations. With
+            `export_to` set, the citations are streamed to files instead, and the
+            lists are empty; `bibtex_path` / `apa_path` name the files.
         """
         self.logger.agent_start(self.name, "Generating references and citations")
         try:
@@ -191,17 +295,26 @@ class ReferenceManagerAgent(Agent):
                 raise ValueError("No retrieved papers found in memory to generate references for.")
 
             papers = retrieval_result.get("papers", [])
+            if self.export_to:
+                bibtex_path, apa_path = self.export_paths()
+                count = await self.citation_tool.export_citations(papers, bibtex_path, apa_path)
+                return self.store_citations({"bibtex": [], "apa": [], "count": count,
+                                             "bibtex_path": bibtex_path, "apa_path": apa_path})
             citations = await self.citation_tool.generate_citations_batch(papers)
-            
-            self.memory.store_agent_result(self.name, citations)
-            self.logger.agent_complete(self.name, "success", f"Generated {citations.get('count', 0)} citations in BibTeX and APA formats.")
-            return citations
+            return self.store_citations(citations)
         except Exception as e:
             self.logger.log_error(self.name, str(e))
             return {"error": str(e)}
 
+    def store_citations(self, citations: Dict[str, Any]) -> Dict[str, Any]:
+        self.memory.store_agent_result(self.name, citations)
+        tracing.annotate(citations=citations.get("count", 0))
+        self.logger.agent_complete(self.name, "success", f"Generated {citations.get('count', 0)} citations in BibTeX and APA formats.")
+        return citations
+
 class SynthesisAgent(Agent):
     """Synthesizes all analyzed results into a comprehensive, publication-ready literature review."""
+    depends_on = ("AnalysisAgent", "CriticAgent", "ContentExtractorAgent", "ReferenceManagerAgent")
     def __init__(self, memory, logger):
         super().__init__("SynthesisAgent", "Master Academic Writer", memory, logger)
 
@@ -214,89 +327,24 @@ class SynthesisAgent(Agent):
         """
         self.logger.agent_start(self.name, "Synthesizing final literature review")
         try:
-            topic = self.memory.get_context("research_topic") or "Unspecified Topic"
-            analysis = self.memory.get_agent_result("AnalysisAgent") or {}
-            critique = self.memory.get_agent_result("CriticAgent") or {}
-            content = self.memory.get_agent_result("ContentExtractorAgent") or {}
-            references = self.memory.get_agent_result("ReferenceManagerAgent") or {}
-
-            # Build extended sections
-            most_common_method = analysis.get("methodology_comparison", {}).get("most_common", "various methods")
-            methodology_table = analysis.get("methodology_comparison", {}).get("comparison_table", [])
-            trends = analysis.get("trends_analysis", {})
-            research_gaps = critique.get("research_gaps", ["Further empirical studies needed."])
-            recommendations = critique.get("recommendations", ["Broaden datasets, standardize evaluation."])
-
-            # Per-paper summaries
-            extracted = content.get("extracted_papers", [])
-            paper_sections = ""
-            for idx, p in enumerate(extracted, start=1):
-                title = p.get("title", "Untitled")
-                authors = ", ".join(p.get("authors", [])) if p.get("authors") else "Unknown"
-                year = p.get("year", "n.d.")
-                abstract = (p.get("abstract") or "").strip()
-                abstract_snip = (abstract[:600] + "...") if len(abstract) > 600 else abstract
-                paper_sections += f"<h3>{idx}. {title} ({year})</h3>"
-                paper_sections += f"<p><em>Authors:</em> {authors}</p>"
-                if abstract_snip:
-                    paper_sections += f"<p><strong>Abstract summary:</strong> {abstract_snip}</p>"
-                paper_sections += f"<p><a href=\"{p.get('url','')}\">View Paper</a></p>"
-
-            # Methodology comparison table HTML
-            table_rows = ""
-            for row in methodology_table:
-                method = row.get("methodology", "Unknown")
-                count = row.get("count", 0)
-                pct = f"{row.get('percentage', 0):.1f}%"
-                avg_rel = row.get('avg_relevance', 0)
-                table_rows += f"<tr><td>{method}</td><td>{count}</td><td>{pct}</td><td>{avg_rel:.2f}</td></tr>"
-
-            references_html = ""
-            apa_list = references.get("apa", []) if isinstance(references, dict) else []
-            if apa_list:
-                references_html += "<h2>References</h2><ol>"
-                for cite in apa_list:
-                    references_html += f"<li>{cite}</li>"
-                references_html += "</ol>"
-
-            # Compose extended review
-            review_html = f"""
-<h1>Systematic Literature Review: {topic}</h1>
-<h2>Executive Summary</h2>
-<p>This automated literature review synthesizes findings from {len(extracted)} papers on <strong>{topic}</strong>. It includes per-paper summaries, a detailed methodology comparison, trends across years, identified research gaps, and actionable recommendations.</p>
-
-<h2>Key Findings</h2>
-<p>The analysis identified <strong>{most_common_method}</strong> as the most frequently used methodology. Trends and yearly coverage indicate {trends.get('total_years_covered', 'N/A')} years covered with peak activity in {trends.get('peak_year', 'N/A')}.</p>
-
-<h2>Methodology Comparison</h2>
-<table border="1" cellpadding="6" cellspacing="0"><thead><tr><th>Methodology</th><th>Count</th><th>Percentage</th><th>Avg Relevance</th></tr></thead><tbody>
-{table_rows}
-</tbody></table>
-
-<h2>Per-paper Summaries</h2>
-{paper_sections}
-
-<h2>Research Gaps</h2>
-<ul>
-"""
-            for gap in research_gaps:
-                review_html += f"<li>{gap}</li>"
-            review_html += "</ul>\n"
-
-            review_html += "<h2>Recommendations</h2><ol>\n"
-            for rec in recommendations:
-                review_html += f"<li>{rec}</li>"
-            review_html += "</ol>\n"
-
-            review_html += references_html
-
-            # Conclusion and metadata
-            review_html += f"<h2>Conclusion</h2><p>This review provides a synthesized snapshot of the state-of-the-art for {topic}. Use the references and per-paper summaries to dive deeper into specific works.</p>"
-
-            result = {"literature_review": review_html, "word_count": len(review_html.split())}
+            sink = ChunkSink()
+            word_count, papers = self.render(sink)
+            result = {"literature_review": sink.getvalue(), "word_count": word_count}
             self.memory.store_agent_result(self.name, result)
+            tracing.annotate(papers=papers, word_count=word_count)
             self.logger.agent_complete(self.name, "success", f"Synthesized a {result['word_count']}-word literature review.")
             return result
         except Exception as e:
             self.logger.log_error(self.name, str(e))
-            return {"error": str(e)}
\ No newline at end of file
+            return {"error": str(e)}
+
+    def render(self, sink) -> Tuple[int, int]:
+        """Stream the review for the results in memory to `sink` (e.g. an open file); returns `(word_count, papers)`."""
+        topic = self.memory.get_context("research_topic") or "Unspecified Topic"
+        analysis = self.memory.get_agent_result("AnalysisAgent") or {}
+        critique = self.memory.get_agent_result("CriticAgent") or {}
+        content = self.memory.get_agent_result("ContentExtractorAgent") or {}
+        references = self.memory.get_agent_result("ReferenceManagerAgent") or {}
+        papers = content.get("extracted_papers", [])
+        apa = references.get("apa", []) if isinstance(references, dict) else []
+        return ReviewRenderer().render(sink, topic, analysis, critique, papers, apa), len(papers)
\ No newline at end of file
@@ -1,6 +1,6 @@
 # src/agents/base.py
 
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 class Agent:
     """
@@ -8,7 +8,13 @@ class Agent:
     
     This conceptual class provides a common structure for all agents in the system.
     In a real ADK implementation, this might be provided by the framework itself.
+
+    Subclasses list the agents whose results they read from memory in
+    `depends_on`; the workflow scheduler starts an agent as soon as all of
+    those results are available.
     """
+    depends_on: Tuple[str, ...] = ()
+
     def __init__(self, name: str, role: str, memory, logger):
         """
         Initializes the base agent.
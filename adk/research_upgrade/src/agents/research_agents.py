@@ -4,10 +4,19 @@ these prompts would be used by a real LLM-powered agent system.
 """
 
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from contextlib import aclosing
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 import asyncio
+import time
+
+import numpy as np
 
 from .base import Agent
+from src.memory.paper_table import PaperTable
+from src.tools.bm25_index import BM25Index, top_k
+from src.tools.dedup_index import PaperDedupIndex
+from src.tools.rate_limiter import RateLimiter
+from src.monitoring import tracing
 
 
 @dataclass
@@ -53,73 +62,245 @@ class ResearchPlannerAgent(Agent):
         return strategy
 
 
+class _RetrievalState:
+    """Merge state for one retrieval run: dedup index, RRF scores and per-call stats."""
+
+    def __init__(self):
+        self.index = PaperDedupIndex()
+        self.scores: List[float] = []
+        self.query_stats: List[Dict[str, Any]] = []
+        self._calls: Dict[Tuple[str, str], Dict[str, int]] = {}
+
+
 class PaperRetrieverAgent(Agent):
-    """Retrieves papers using ArXiv and Semantic Scholar tools."""
-    def __init__(self, memory, logger, arxiv_tool=None, semantic_tool=None):
+    """Retrieves papers using ArXiv and Semantic Scholar tools.
+
+    Every planner query is sent to every configured source. Calls run under a
+    global concurrency limit plus an optional per-source rate limiter, and
+    papers are merged as they arrive: `PaperDedupIndex` collapses cross-source
+    duplicates, and reciprocal-rank fusion ranks papers returned by several
+    queries (or near the top of a list) first. Before truncating to
+    `max_papers`, every candidate is also scored locally with BM25 against the
+    planner's topic and subtopics, and the two rankings are fused, so the
+    survivors don't depend on which API answered first. `stream()` exposes the
+    same fan-out as an async generator of newly seen papers.
+    """
+    depends_on = ("ResearchPlannerAgent",)
+    RRF_K = 60  # standard reciprocal-rank-fusion damping constant
+
+    def __init__(self, memory, logger, arxiv_tool=None, semantic_tool=None,
+                 max_concurrency: int = 8, rate_limiters: Optional[Dict[str, RateLimiter]] = None,
+                 queue_size: int = 256):
         super().__init__("PaperRetrieverAgent", "Paper Retrieval", memory, logger)
         self.arxiv_tool = arxiv_tool
         self.semantic_tool = semantic_tool
+        self.max_concurrency = max(1, max_concurrency)
+        self.queue_size = max(1, queue_size)
+        # Per-source budgets; shared across workflows in batch mode.
+        self.rate_limiters = rate_limiters or {}
 
-    async def execute(self, max_papers: int = 10) -> Dict[str, Any]:
-        self.logger.agent_start(self.name, "Retrieving papers from external sources")
+    def _sources(self) -> Dict[str, Any]:
+        sources = {}
+        if self.arxiv_tool:
+            sources["arxiv"] = self.arxiv_tool
+        if self.semantic_tool:
+            sources["semantic_scholar"] = self.semantic_tool
+        return sources
+
+    def _queries(self) -> List[str]:
+        strategy = self.memory.get_context("search_strategy") or {}
+        return [q for q in strategy.get("queries", []) if q] or [strategy.get("topic", "")]
+
+    def _ranking_query(self) -> str:
         strategy = self.memory.get_context("search_strategy") or {}
-        query = strategy.get("queries", [""])[0] if strategy else ""
+        return " ".join([strategy.get("topic") or ""] + [s for s in strategy.get("subtopics", []) if s])
+
+    def _relevance(self, state: _RetrievalState) -> np.ndarray:
+        """Fused score per candidate: API consensus (RRF) plus local BM25 rank against the plan.
+
+        Both signals are turned into ranks and fused with the same reciprocal-rank
+        formula, so neither score scale dominates; papers with no term in common
+        with the plan get no lexical credit.
+        """
+        n = len(state.index)
+        fused = np.zeros(n)
+        if not n:
+            return fused
+        with tracing.span("bm25.rank", kind="internal", candidates=n):
+            index = BM25Index([f"{p.get('title') or ''} {p.get('abstract') or ''}" for p in state.index.papers])
+            lexical = index.score(self._ranking_query())
+        rank_credit = 1.0 / (self.RRF_K + np.arange(1, n + 1))
+        for scores in (np.asarray(state.scores), lexical):
+            order = np.argsort(-scores, kind="stable")
+            fused[order] += np.where(scores[order] > 0, rank_credit, 0.0)
+        return fused
+
+    async def _pump(self, semaphore: asyncio.Semaphore, queue: asyncio.Queue,
+                    source: str, tool, query: str, limit: int) -> None:
+        """Run one query/source call, pushing `(source, query, rank, paper)` items as papers arrive.
 
-        papers: List[Dict[str, Any]] = []
+        Tools with `iter_ranked` stream page by page, with each paper's rank in
+        the source's own order (pages can arrive out of order); the rest are
+        pushed in list order once their list returns. A
+        `(source, query, None, latency)` float marks the end of the call.
+        """
+        async with semaphore:
+            limiter = self.rate_limiters.get(source)
+            if limiter:
+                await limiter.acquire()
+            started = time.perf_counter()
+            returned = 0
+            with tracing.span(f"{source}.search", kind="tool", source=source, query=query, limit=limit) as span:
+                try:
+                    if hasattr(tool, "iter_ranked"):
+                        async for rank, paper in tool.iter_ranked(query, max_results=limit):
+                            returned += 1
+                            await queue.put((source, query, rank, paper))
+                    else:
+                        results = await tool.search(query, max_results=limit)
+                        for rank, paper in enumerate(results if isinstance(results, list) else []):
+                            returned += 1
+                            await queue.put((source, query, rank, paper))
+                except Exception as e:
+                    self.logger.warning(f"{self.name}: {source} search failed for '{query}': {e}")
+                    if span is not None:
+                        span.fail(e)
+                if span is not None:
+                    span.set(papers=returned)
+            await queue.put((source, query, None, time.perf_counter() - started))
+
+    async def _fan_out(self, state: _RetrievalState, limit: int) -> AsyncIterator[int]:
+        """Fan out every query to every source; yield the canonical id of each new paper."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [
+            asyncio.ensure_future(self._pump(semaphore, queue, source, tool, query, limit))
+            for query in self._queries()
+            for source, tool in self._sources().items()
+        ]
+        active = len(tasks)
+        try:
+            while active:
+                source, query, rank, item = await queue.get()
+                call = state._calls.setdefault((source, query), {"returned": 0, "new_unique": 0})
+                if isinstance(item, float):
+                    active -= 1
+                    state.query_stats.append({"query": query, "source": source, **call,
+                                              "latency_s": round(item, 3)})
+                    continue
+                call["returned"] += 1
+                pid, is_new = state.index.add(item)
+                if pid is None:
+                    continue
+                if is_new:
+                    state.scores.append(0.0)
+                    call["new_unique"] += 1
+                state.scores[pid] += 1.0 / (self.RRF_K + rank + 1)
+                if is_new:
+                    yield pid
+        finally:
+            # Consumer stopped early: cancel outstanding calls.
+            for task in tasks:
+                task.cancel()
+
+    async def execute(self, max_papers: int = 10) -> Dict[str, Any]:
+        self.logger.agent_start(self.name, "Retrieving papers from external sources")
         try:
-            tasks = []
-            if self.arxiv_tool:
-                tasks.append(self.arxiv_tool.search(query, max_results=min(max_papers, 10)))
-            if self.semantic_tool:
-                tasks.append(self.semantic_tool.search(query, max_results=min(max_papers, 10)))
-
-            if tasks:
-                results = await asyncio.gather(*tasks)
-                for r in results:
-                    if isinstance(r, list):
-                        papers.extend(r)
-
-            # Deduplicate by title
-            seen = set()
-            unique_papers = []
-            for p in papers:
-                title = p.get("title") or p.get("url")
-                if title and title not in seen:
-                    seen.add(title)
-                    unique_papers.append(p)
-
-            unique_papers = unique_papers[:max_papers]
-            result = {"papers": unique_papers, "count": len(unique_papers)}
-            self.memory.store_agent_result(self.name, result)
-            self.logger.agent_complete(self.name, "success", f"Retrieved {len(unique_papers)} papers.")
-            return result
+            state = _RetrievalState()
+            async for _ in self._fan_out(state, max_papers):
+                pass
+            relevance = self._relevance(state)
+            return self._store(state, top_k(relevance, max_papers).tolist(), relevance)
         except Exception as e:
             self.logger.log_error(self.name, str(e))
             return {"error": str(e)}
 
+    async def stream(self, max_papers: int = 10) -> AsyncIterator[Dict[str, Any]]:
+        """Yield up to `max_papers` unique papers in arrival order, as soon as each is deduplicated.
+
+        Outstanding calls are cancelled once enough papers have been yielded.
+        The stored result (with final relevance scores) matches `execute()`,
+        except that papers keep arrival order rather than being ranked.
+        """
+        self.logger.agent_start(self.name, "Streaming papers from external sources")
+        state = _RetrievalState()
+        emitted: List[int] = []
+        try:
+            async with aclosing(self._fan_out(state, max_papers)) as new_papers:
+                async for pid in new_papers:
+                    emitted.append(pid)
+                    yield state.index.papers[pid]
+                    if len(emitted) >= max_papers:
+                        break
+        finally:
+            self._store(state, emitted, self._relevance(state))
+
+    def _store(self, state: _RetrievalState, selected: List[int], relevance: np.ndarray) -> Dict[str, Any]:
+        top_score = max((relevance[pid] for pid in selected), default=0.0)
+        papers = []
+        for pid in selected:
+            paper = state.index.papers[pid]
+            paper["relevance"] = round(float(relevance[pid] / top_score), 4) if top_score else 0.0
+            papers.append(paper)
+
+        result = {
+            "papers": PaperTable.from_records(papers),
+            "count": len(papers),
+            "candidates": len(state.index),
+            "duplicates_merged": state.index.duplicates,
+            "query_stats": state.query_stats,
+        }
+        self.memory.store_agent_result(self.name, result)
+        tracing.annotate(papers=len(papers), candidates=len(state.index), duplicates_merged=state.index.duplicates)
+        slowest = max((s["latency_s"] for s in state.query_stats), default=0.0)
+        self.logger.agent_complete(
+            self.name, "success",
+            f"Retrieved {len(papers)} papers ({len(state.index)} unique candidates from "
+            f"{len(state.query_stats)} query/source calls, slowest {slowest:.2f}s)."
+        )
+        return result
+
 
 class ContentExtractorAgent(Agent):
     """Extracts structured information from retrieved papers."""
+    depends_on = ("PaperRetrieverAgent",)
     def __init__(self, memory, logger):
         super().__init__("ContentExtractorAgent", "Content Extraction", memory, logger)
 
+    @staticmethod
+    def extract_paper(p: Dict[str, Any]) -> Dict[str, Any]:
+        """Structured record for one paper; used per paper by the streaming pipeline."""
+        return {
+            "title": p.get("title"),
+            "authors": p.get("authors", []),
+            "abstract": p.get("abstract", ""),
+            "methodology": ["unspecified"],
+            "year": p.get("year", ""),
+            "url": p.get("url", p.get("pdf_url")),
+            "source": p.get("source"),
+            "relevance": p.get("relevance"),
+        }
+
     async def execute(self) -> Dict[str, Any]:
         self.logger.agent_start(self.name, "Extracting content from papers")
         retrieval = self.memory.get_agent_result("PaperRetrieverAgent") or {}
-        papers = retrieval.get("papers", []) if retrieval else []
-
-        extracted = []
-        for p in papers:
-            extracted.append({
-                "title": p.get("title"),
-                "authors": p.get("authors", []),
-                "abstract": p.get("abstract", ""),
-                "methodology": ["unspecified"],
-                "year": p.get("year", ""),
-                "url": p.get("url", p.get("pdf_url"))
-            })
+        papers = PaperTable.from_records(retrieval.get("papers") or [])
+        # Same fields as `extract_paper`, but as column projections over the
+        # retrieval table: no per-paper dicts, and the arrays are shared.
+        extracted = papers.select(("title", "authors", "abstract", "year", "url", "source", "relevance"))
+        if papers.has_column("pdf_url"):
+            pdf_url = papers.column("pdf_url")
+            url = papers.column("url") if papers.has_column("url") else np.full(len(papers), None, dtype=object)
+            missing = np.fromiter((u is None for u in url), dtype=bool, count=len(url))
+            if missing.any():
+                extracted = extracted.with_column("url", np.where(missing, pdf_url, url))
+        return self.store_extracted(extracted.with_constant_list("methodology", ["unspecified"]))
 
+    def store_extracted(self, extracted) -> Dict[str, Any]:
+        """Store extracted papers (a PaperTable, or dicts from the streaming pipeline)."""
+        extracted = PaperTable.from_records(extracted)
         result = {"extracted_papers": extracted, "total_papers": len(extracted)}
         self.memory.store_agent_result(self.name, result)
+        tracing.annotate(papers=len(extracted))
         self.logger.agent_complete(self.name, "success", f"Extracted content from {len(extracted)} papers.")
         return result
@@ -0,0 +1,78 @@
+"""Content-addressed checkpoint store for workflow agent results.
+
+Each completed agent's output is pickled into a blob stored under its SHA-256
+(`objects/ab/abcd...`), so identical results are stored once. A ref file maps
+a checkpoint key to the blob hash; the key is derived from the agent name,
+research topic, the settings fingerprint and the blob hashes of the agent's
+upstream results. A rerun whose inputs are unchanged therefore computes the
+same key and can load the result instead of recomputing it.
+"""
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class CheckpointStore:
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls, settings) -> "CheckpointStore":
+        return cls(settings.checkpoint_dir)
+
+    @staticmethod
+    def make_key(agent_name: str, topic: str, settings_hash: str, upstream: Dict[str, str]) -> str:
+        material = json.dumps(
+            {"agent": agent_name, "topic": topic, "settings": settings_hash, "upstream": upstream},
+            sort_keys=True,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest
+
+    def _ref_path(self, key: str) -> Path:
+        return self.root / "refs" / key[:2] / key
+
+    def put(self, key: str, payload: Any) -> str:
+        """Store `payload` under `key`; return the blob's content hash."""
+        blob = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        digest = hashlib.sha256(blob).hexdigest()
+        obj = self._object_path(digest)
+        if not obj.exists():
+            _atomic_write(obj, blob)
+        _atomic_write(self._ref_path(key), digest.encode("ascii"))
+        return digest
+
+    def get(self, key: str) -> Optional[Tuple[Any, str]]:
+        """Return `(payload, content_hash)` for `key`, or None if no usable checkpoint exists."""
+        try:
+            digest = self._ref_path(key).read_text(encoding="ascii").strip()
+            blob = self._object_path(digest).read_bytes()
+        except (FileNotFoundError, NotADirectoryError):
+            self.misses += 1
+            return None
+        if hashlib.sha256(blob).hexdigest() != digest:
+            # Corrupt or truncated blob: treat as a miss so the agent reruns.
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pickle.loads(blob), digest
@@ -0,0 +1,371 @@
+"""
+Columnar Paper Table
+
+`PaperTable` is the in-memory representation of a set of papers passed between
+agents. Every field is one NumPy column instead of one dict entry per paper:
+
+- `year` is int16 (0 = unknown) and `relevance` float64 (NaN = unset); years
+  decode as strings ("" when unknown), or as ints (None when unknown) when
+  every year present is an int;
+- `source` is categorical: int16 codes into `categories("source")`;
+- list fields (`authors`, `sources`, `methodology`, or any field holding a
+  list) are flattened into one values array plus int64 offsets, so paper i's
+  authors are `values[offsets[i]:offsets[i + 1]]`; a plain value in a list
+  field is one item (`"Solo Author"` -> `["Solo Author"]`);
+- everything else (title, abstract, url, doi, ...) is an object array that
+  references the original strings; nothing is copied.
+
+A column only some records had keeps a mask of the rows that had it, so
+`to_records()` gives back the keys each record actually held.
+
+Columns are read-only and shared: slicing a table, projecting columns or adding
+a column returns a new table over the same arrays. Agents that want dict-like
+access iterate `PaperRow` views, which read from the columns on demand and
+return the same Python types the old dicts held (year as a string, authors as
+a list), so consumers of the old `List[Dict]` schema keep working unchanged.
+"""
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+LIST_FIELDS = frozenset({"authors", "sources", "methodology"})
+CATEGORICAL_FIELDS = frozenset({"source"})
+YEAR_FIELD = "year"
+FLOAT_FIELDS = frozenset({"relevance"})
+
+
+def _parse_year(value: Any) -> int:
+    try:
+        year = int(str(value).strip()[:4])
+    except (TypeError, ValueError):
+        return 0
+    return year if 0 < year < 32768 else 0
+
+
+def factorize(values: Iterable[Any]) -> Tuple[np.ndarray, List[Any]]:
+    """Dictionary-encode `values`: int64 codes into the list of distinct values, in first-seen order.
+
+    A dict lookup per value; faster than `np.unique` on object arrays, which
+    sorts with Python comparisons. Codes feed `np.bincount` for group-by counts.
+    """
+    lookup: Dict[Any, int] = {}
+    codes = np.fromiter((lookup.setdefault(v, len(lookup)) for v in values), dtype=np.int64)
+    return codes, list(lookup)
+
+
+def _object_array(values: Sequence[Any]) -> np.ndarray:
+    # np.array() would try to broadcast nested sequences; fill an empty array instead.
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+class _ListColumn:
+    """Ragged column: row i is `values[offsets[i]:offsets[i + 1]]`."""
+    __slots__ = ("values", "offsets")
+
+    def __init__(self, values: np.ndarray, offsets: np.ndarray):
+        self.values = values
+        self.offsets = offsets
+
+    @classmethod
+    def from_lists(cls, rows: Sequence[Any]) -> "_ListColumn":
+        rows = [r if isinstance(r, (list, tuple)) else [r] if r is not None and r != "" else None for r in rows]
+        lengths = np.fromiter((len(r) if r else 0 for r in rows), dtype=np.int64, count=len(rows))
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        values = _object_array([item for r in rows if r for item in r])
+        return cls(values, offsets)
+
+    def row(self, i: int) -> List[Any]:
+        return self.values[self.offsets[i]:self.offsets[i + 1]].tolist()
+
+    def slice(self, key: slice) -> "_ListColumn":
+        start, stop, step = key.indices(len(self.offsets) - 1)
+        if step != 1:
+            return self.take(np.arange(start, stop, step))
+        # Offsets stay absolute into the shared values array: a view, no copy.
+        return _ListColumn(self.values, self.offsets[start:max(start, stop) + 1])
+
+    def take(self, indices: np.ndarray) -> "_ListColumn":
+        return _ListColumn.from_lists([self.row(int(i)) for i in indices])
+
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+
+class _IntYears(np.ndarray):
+    """int16 year column of records that held int years: decodes to ints (None where unknown).
+
+    An ndarray subclass, so slicing, `take` and arithmetic work unchanged."""
+
+
+class _Categorical:
+    """Dictionary-encoded column; code -1 means missing."""
+    __slots__ = ("codes", "categories")
+
+    def __init__(self, codes: np.ndarray, categories: List[str]):
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def from_values(cls, values: Sequence[Any]) -> "_Categorical":
+        lookup: Dict[Any, int] = {}
+        codes = np.fromiter(
+            (-1 if v is None else lookup.setdefault(v, len(lookup)) for v in values),
+            dtype=np.int16, count=len(values),
+        )
+        return cls(codes, list(lookup))
+
+    def value(self, i: int) -> Optional[str]:
+        code = self.codes[i]
+        return self.categories[code] if code >= 0 else None
+
+
+_Column = Union[np.ndarray, _ListColumn, _Categorical]
+
+
+class PaperRow(Mapping):
+    """Read-only dict-like view of one row of a `PaperTable`; missing cells are absent keys."""
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "PaperTable", index: int):
+        self._table = table
+        self._index = index
+
+    def get(self, key: str, default: Any = None) -> Any:
+        reader = self._table._reader(key)
+        value = reader(self._index) if reader is not None else None
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._table._columns:
+            if self._table._reader(key)(self._index) is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"PaperRow({self.to_dict()!r})"
+
+
+class PaperTable:
+    """Immutable column store of paper records with cheap row views."""
+
+    def __init__(self, columns: Dict[str, _Column], length: int, present: Optional[Dict[str, np.ndarray]] = None):
+        self._columns = columns
+        self._length = length
+        # Boolean row masks for columns that only some records had; other columns are in every row.
+        self._present = present or {}
+        self._readers: Dict[str, Callable[[int], Any]] = {}
+
+    # Construction
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping]) -> "PaperTable":
+        if isinstance(records, PaperTable):
+            return records
+        records = list(records)
+        keys: Dict[str, None] = {}
+        for record in records:
+            keys.update(dict.fromkeys(record))
+        columns: Dict[str, _Column] = {}
+        present: Dict[str, np.ndarray] = {}
+        for key in keys:
+            values = [r.get(key) for r in records]
+            columns[key] = cls._encode(key, values)
+            has_key = np.fromiter((key in r for r in records), dtype=bool, count=len(records))
+            if not has_key.all():
+                present[key] = has_key
+        return cls(columns, len(records), present)
+
+    @staticmethod
+    def _encode(key: str, values: Sequence[Any]) -> _Column:
+        if key in LIST_FIELDS or any(isinstance(v, (list, tuple)) for v in values):
+            return _ListColumn.from_lists(values)
+        if key in CATEGORICAL_FIELDS:
+            return _Categorical.from_values(values)
+        if key == YEAR_FIELD:
+            years = np.fromiter((_parse_year(v) for v in values), dtype=np.int16, count=len(values))
+            known = [v for v in values if v is not None]
+            if known and all(isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in known):
+                return years.view(_IntYears)
+            return years
+        if key in FLOAT_FIELDS:
+            return np.fromiter((np.nan if v is None else float(v) for v in values),
+                               dtype=np.float64, count=len(values))
+        return _object_array(values)
+
+    def with_column(self, name: str, values: Union[Sequence[Any], np.ndarray]) -> "PaperTable":
+        """New table sharing every existing column, plus (or replacing) `name`."""
+        if len(values) != self._length:
+            raise ValueError(f"Column '{name}' has {len(values)} values for {self._length} rows")
+        column = values if isinstance(values, np.ndarray) and values.dtype != object else self._encode(name, list(values))
+        present = {k: v for k, v in self._present.items() if k != name}
+        return PaperTable({**self._columns, name: column}, self._length, present)
+
+    def with_constant_list(self, name: str, items: Sequence[Any]) -> "PaperTable":
+        """Add a list column holding the same `items` for every row."""
+        n, k = self._length, len(items)
+        values = _object_array(list(items) * n)
+        offsets = np.arange(0, (n + 1) * k, k, dtype=np.int64) if k else np.zeros(n + 1, dtype=np.int64)
+        present = {k: v for k, v in self._present.items() if k != name}
+        return PaperTable({**self._columns, name: _ListColumn(values, offsets)}, n, present)
+
+    def select(self, names: Iterable[str]) -> "PaperTable":
+        """Project onto `names` (missing names are skipped); columns are shared, not copied."""
+        names = [n for n in names if n in self._columns]
+        return PaperTable({n: self._columns[n] for n in names}, self._length,
+                          {n: self._present[n] for n in names if n in self._present})
+
+    def take(self, indices: Sequence[int]) -> "PaperTable":
+        """Rows at `indices`, in that order (copies the selected rows)."""
+        idx = np.asarray(indices, dtype=np.int64)
+        columns: Dict[str, _Column] = {}
+        for name, column in self._columns.items():
+            if isinstance(column, _ListColumn):
+                columns[name] = column.take(idx)
+            elif isinstance(column, _Categorical):
+                columns[name] = _Categorical(column.codes[idx], column.categories)
+            else:
+                columns[name] = column[idx]
+        return PaperTable(columns, len(idx), {k: mask[idx] for k, mask in self._present.items()})
+
+    # Column access (zero-copy)
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    def column(self, name: str) -> np.ndarray:
+        """The backing array of a scalar column; categorical columns return their codes."""
+        column = self._columns[name]
+        if isinstance(column, _ListColumn):
+            raise TypeError(f"'{name}' is a list column; use list_column()")
+        return column.codes if isinstance(column, _Categorical) else column
+
+    def list_column(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """`(values, offsets)` of a list column."""
+        column = self._columns[name]
+        if not isinstance(column, _ListColumn):
+            raise TypeError(f"'{name}' is not a list column")
+        return column.values, column.offsets
+
+    def categories(self, name: str) -> List[str]:
+        column = self._columns[name]
+        if not isinstance(column, _Categorical):
+            raise TypeError(f"'{name}' is not a categorical column")
+        return column.categories
+
+    def has_column(self, name: str) -> bool:
+        return name in self._columns
+
+    @property
+    def years(self) -> np.ndarray:
+        """int16 publication years, 0 where unknown."""
+        column = self._columns.get(YEAR_FIELD)
+        return column if column is not None else np.zeros(self._length, dtype=np.int16)
+
+    # Row access
+    def _reader(self, key: str) -> Optional[Callable[[int], Any]]:
+        """Cached `i -> Python value` accessor for column `key`; None for an unknown column.
+
+        The first row-wise read of a column decodes it into a list once, so
+        iterating rows costs a list lookup per cell instead of a NumPy scalar
+        conversion; column-wise consumers never pay for it.
+        """
+        reader = self._readers.get(key)
+        if reader is None:
+            if key not in self._columns:
+                return None
+            reader = self._readers[key] = self._decode(key).__getitem__
+        return reader
+
+    def _decode(self, key: str) -> List[Any]:
+        """A whole column as Python values (None = missing), decoded in one pass."""
+        column = self._columns[key]
+        if isinstance(column, _ListColumn):
+            lo, hi = int(column.offsets[0]), int(column.offsets[-1])
+            values, bounds = column.values[lo:hi].tolist(), (column.offsets - lo).tolist()
+            return [values[a:b] for a, b in zip(bounds, bounds[1:])]
+        if isinstance(column, _Categorical):
+            categories = column.categories
+            return [categories[c] if c >= 0 else None for c in column.codes.tolist()]
+        if isinstance(column, _IntYears):
+            return [y or None for y in column.tolist()]
+        if key == YEAR_FIELD:
+            return [str(y) if y else "" for y in column.tolist()]
+        if column.dtype == np.float64:
+            return [None if v != v else v for v in column.tolist()]
+        return column.tolist()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step != 1:
+                return self.take(range(start, stop, step))
+            columns: Dict[str, _Column] = {}
+            for name, column in self._columns.items():
+                if isinstance(column, _ListColumn):
+                    columns[name] = column.slice(key)
+                elif isinstance(column, _Categorical):
+                    columns[name] = _Categorical(column.codes[key], column.categories)
+                else:
+                    columns[name] = column[key]
+            return PaperTable(columns, max(0, stop - start), {k: mask[key] for k, mask in self._present.items()})
+        index = int(key)
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("PaperTable index out of range")
+        return PaperRow(self, index)
+
+    def __iter__(self) -> Iterator[PaperRow]:
+        return (PaperRow(self, i) for i in range(self._length))
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Plain dicts, e.g. for JSON output; decodes column by column rather than row by row.
+
+        Each record has the keys its source record had. Values come back as
+        stored, except that list fields are lists and unknown years are
+        normalized ("" or None, see the module docstring)."""
+        names = list(self._columns)
+        if not names:
+            return [{} for _ in range(self._length)]
+        decoded = [self._decode(name) for name in names]
+        records = [dict(zip(names, values)) for values in zip(*decoded)]
+        for name, mask in self._present.items():
+            for i in np.flatnonzero(~mask).tolist():
+                del records[i][name]
+        return records
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays themselves (object columns count pointers only)."""
+        total = 0
+        for column in self._columns.values():
+            if isinstance(column, _ListColumn):
+                total += column.values.nbytes + column.offsets.nbytes
+            elif isinstance(column, _Categorical):
+                total += column.codes.nbytes
+            else:
+                total += column.nbytes
+        return total
+
+    def __repr__(self) -> str:
+        return f"PaperTable({self._length} rows, columns={self.columns})"
@@ -1,33 +1,160 @@
-"""Simple in-memory ResearchMemory used by agents to share context and results.
+"""Bounded in-memory ResearchMemory used by agents to share context and results.
 
-This lightweight implementation provides the minimal API the workflow and
-agents expect: store/get context values, store/get agent results, and retrieve
-all stored results for output generation.
+Agents use a minimal API: store/get context values, store/get agent results,
+and retrieve all stored results for output generation. Entries live in a
+single store bounded by `max_entries` (least-recently-used entries are evicted
+first) and optionally expire after `ttl` seconds, so a long-lived worker that
+runs many topics keeps a flat memory footprint.
+
+Each `ResearchMemory` is a view onto one namespace of the store. `scoped()`
+returns another view onto the same store, which lets concurrent workflows for
+different topics share one bounded store without colliding. The whole store
+can be snapshotted to disk and restored.
 """
-from typing import Any, Dict, Optional
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+_CONTEXT = "context"
+_AGENT = "agent"
+_SNAPSHOT_VERSION = 1
+
+_Key = Tuple[str, str, str]  # (namespace, kind, key)
+
+
+class _BoundedStore:
+    """Thread-safe LRU map with per-entry expiry, shared by all memory views."""
+
+    def __init__(self, max_entries: int, ttl: Optional[float]):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.evictions = 0
+        self._data: "OrderedDict[_Key, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def set(self, key: _Key, value: Any) -> None:
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, key: _Key, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def items(self, namespace: str, kind: str) -> Iterator[Tuple[str, Any]]:
+        now = time.time()
+        with self._lock:
+            snapshot = [
+                (k[2], v) for k, (exp, v) in self._data.items()
+                if k[0] == namespace and k[1] == kind and (exp is None or exp > now)
+            ]
+        return iter(snapshot)
+
+    def drop_namespace(self, namespace: str) -> None:
+        with self._lock:
+            for key in [k for k in self._data if k[0] == namespace]:
+                del self._data[key]
+
+    def __len__(self) -> int:
+        return len(self._data)
 
 
 class ResearchMemory:
-    def __init__(self):
-        # Shared key-value contexts (e.g., research_topic, search_strategy)
-        self._context: Dict[str, Any] = {}
-        # Per-agent result storage
-        self._agent_results: Dict[str, Any] = {}
+    def __init__(self, max_entries: int = 1000, ttl: Optional[float] = None,
+                 namespace: str = "default", _store: Optional[_BoundedStore] = None):
+        # All views created through `scoped()` share this bounded store.
+        self._store = _store if _store is not None else _BoundedStore(max_entries, ttl)
+        self.namespace = namespace
+
+    @classmethod
+    def from_settings(cls, settings, namespace: str = "default") -> "ResearchMemory":
+        return cls(max_entries=settings.memory_cache_size, ttl=settings.memory_ttl, namespace=namespace)
+
+    def scoped(self, namespace: str) -> "ResearchMemory":
+        """Return a view onto another namespace of the same bounded store."""
+        return ResearchMemory(namespace=namespace, _store=self._store)
 
     # Context helpers
     def store_context(self, key: str, value: Any) -> None:
-        self._context[key] = value
+        self._store.set((self.namespace, _CONTEXT, key), value)
 
     def get_context(self, key: str, default: Optional[Any] = None) -> Any:
-        return self._context.get(key, default)
+        return self._store.get((self.namespace, _CONTEXT, key), default)
+
+    def get_all_context(self) -> Dict[str, Any]:
+        return dict(self._store.items(self.namespace, _CONTEXT))
 
     # Agent result helpers
     def store_agent_result(self, agent_name: str, result: Any) -> None:
-        self._agent_results[agent_name] = result
+        self._store.set((self.namespace, _AGENT, agent_name), result)
 
     def get_agent_result(self, agent_name: str) -> Optional[Any]:
-        return self._agent_results.get(agent_name)
+        return self._store.get((self.namespace, _AGENT, agent_name))
 
     def get_all_results(self) -> Dict[str, Any]:
-        # Return a shallow copy to prevent accidental external mutation
-        return dict(self._agent_results)
+        # New top-level dict over the same result objects; values are not copied.
+        return dict(self._store.items(self.namespace, _AGENT))
+
+    def clear(self) -> None:
+        """Drop every entry in this view's namespace."""
+        self._store.drop_namespace(self.namespace)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._store), "max_entries": self._store.max_entries,
+                "evictions": self._store.evictions}
+
+    # Persistence
+    def snapshot(self, path: str) -> str:
+        """Atomically write every live entry of the shared store to `path`."""
+        now = time.time()
+        with self._store._lock:
+            entries = [(k, exp, v) for k, (exp, v) in self._store._data.items() if exp is None or exp > now]
+        payload = {"version": _SNAPSHOT_VERSION, "ttl": self._store.ttl,
+                   "max_entries": self._store.max_entries, "entries": entries}
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, target)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return str(target)
+
+    @classmethod
+    def restore(cls, path: str, namespace: str = "default") -> "ResearchMemory":
+        """Load a snapshot written by `snapshot()`; entries that expired meanwhile are skipped.
+
+        Only restore snapshots this process (or a trusted worker) wrote:
+        the file is a pickle.
+        """
+        with open(path, "rb") as f:
+            payload = pickle.load(f)
+        if payload.get("version") != _SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported memory snapshot version: {payload.get('version')}")
+        memory = cls(max_entries=payload["max_entries"], ttl=payload["ttl"], namespace=namespace)
+        now = time.time()
+        data = memory._store._data
+        for key, expires_at, value in payload["entries"]:
+            if expires_at is None or expires_at > now:
+                data[key] = (expires_at, value)
+        return memory
@@ -0,0 +1,125 @@
+"""Persistent search-result cache shared by the external search tools.
+
+Results are stored in a small SQLite database keyed by
+(source, normalized query, limit). Entries expire after `ttl` seconds and the
+least-recently-used entries are evicted once the cache holds more than
+`max_entries` rows. A cached result for a larger limit also serves smaller
+limits for the same query by truncation, so callers must store results in
+rank order (ArXivTool reorders its out-of-order pages before storing).
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+_WHITESPACE = re.compile(r"\s+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_results (
+    source      TEXT    NOT NULL,
+    query       TEXT    NOT NULL,
+    lim         INTEGER NOT NULL,
+    payload     TEXT    NOT NULL,
+    created_at  REAL    NOT NULL,
+    accessed_at REAL    NOT NULL,
+    PRIMARY KEY (source, query, lim)
+);
+CREATE INDEX IF NOT EXISTS idx_search_results_accessed ON search_results (accessed_at);
+"""
+
+
+class SearchCache:
+    def __init__(self, path: str, ttl: int = 3600, max_entries: int = 1000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_settings(cls, settings) -> "SearchCache":
+        return cls(settings.search_cache_path, ttl=settings.memory_ttl, max_entries=settings.memory_cache_size)
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return _WHITESPACE.sub(" ", (query or "").strip().lower())
+
+    def get(self, source: str, query: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """Return cached results for the query, or None on a miss or expired entry."""
+        query = self.normalize_query(query)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT lim, payload, created_at FROM search_results "
+                "WHERE source = ? AND query = ? AND lim >= ? ORDER BY lim LIMIT 1",
+                (source, query, limit),
+            ).fetchone()
+            if row is not None and now - row[2] > self.ttl:
+                self._conn.execute(
+                    "DELETE FROM search_results WHERE source = ? AND query = ? AND created_at < ?",
+                    (source, query, now - self.ttl),
+                )
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE search_results SET accessed_at = ? WHERE source = ? AND query = ? AND lim = ?",
+                (now, source, query, row[0]),
+            )
+            self.hits += 1
+        return json.loads(row[1])[:limit]
+
+    def set(self, source: str, query: str, limit: int, results: List[Dict[str, Any]]) -> None:
+        query = self.normalize_query(query)
+        now = time.time()
+        payload = json.dumps(results, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_results (source, query, lim, payload, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (source, query, limit, payload, now, now),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM search_results").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM search_results WHERE rowid IN "
+                "(SELECT rowid FROM search_results ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+            self.evictions += overflow
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM search_results").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "evictions": self.evictions,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM search_results")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,27 +1,95 @@
 """
 Logging and Monitoring System
+
+`WorkflowLogger` never touches the console or the log file on the caller's
+thread: records below the configured level are dropped immediately, the rest
+are put on an unbounded queue. A background writer thread drains the queue in
+batches, writes each batch to the log file (and the console) with one write
+and one flush, and rotates the file when it grows past `max_bytes`. Lines are
+plain text by default or one JSON object per line in `json_format` mode.
 """
+import atexit
+import json
 import logging
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+
+# (created, level, message, fields); a threading.Event instead marks a flush request.
+_Record = Tuple[float, str, str, Dict[str, Any]]
+_STOP = object()
+
 
 class WorkflowLogger:
     """Advanced logging system for tracking workflow execution."""
-    
-    def __init__(self, log_file: str = "logs/workflow.log", verbose: bool = False):
+
+    def __init__(self, log_file: str = "logs/workflow.log", verbose: bool = False, level: str = "INFO",
+                 json_format: bool = False, console: bool = True, max_bytes: int = 10 * 2**20,
+                 backup_count: int = 5, batch_size: int = 256):
         self.log_file = log_file
         Path(log_file).parent.mkdir(parents=True, exist_ok=True)
-        
-        # Using basic print for simplicity in this environment
+
+        # `verbose` lowers the threshold to DEBUG; otherwise `level` applies.
         self.verbose = verbose
+        self.levelno = logging.DEBUG if verbose else LEVELS.get(str(level).lower(), logging.INFO)
+        self.json_format = json_format
+        self.console = console
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = max(1, batch_size)
+        self.dropped = 0
+
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._file = None
+        self._size = 0
+        self._closed = False
+        # Guards `_closed` with the queue puts, so nothing is queued after _STOP.
+        self._lock = threading.Lock()
+        self._writer = threading.Thread(target=self._run, name="workflow-logger", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
         print(f"Logging to {log_file}")
 
-    def _log(self, level, message):
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        log_message = f"{timestamp} | {level.upper()} | {message}"
-        print(log_message)
-        with open(self.log_file, "a") as f:
-            f.write(log_message + "\n")
+    @classmethod
+    def from_settings(cls, settings) -> "WorkflowLogger":
+        return cls(
+            log_file=settings.log_file,
+            verbose=settings.verbose,
+            level=settings.log_level,
+            json_format=settings.log_json,
+            max_bytes=settings.log_max_bytes,
+            backup_count=settings.log_backup_count,
+        )
+
+    def is_enabled_for(self, level: str) -> bool:
+        """Whether `level` records are kept; check it before building an expensive message."""
+        return LEVELS.get(level, logging.INFO) >= self.levelno
+
+    def _log(self, level, message, **fields):
+        if not self.is_enabled_for(level):
+            return
+        with self._lock:
+            if self._closed:
+                self.dropped += 1
+                return
+            self._queue.put((time.time(), level, message, fields))
+
+    def debug(self, message: str):
+        self._log("debug", message)
 
     def info(self, message: str):
         self._log("info", message)
@@ -30,14 +98,110 @@ class WorkflowLogger:
         self._log("warning", message)
 
     def error(self, message: str, exc_info: bool = False):
-        self._log("error", message)
+        # The traceback must be captured here, on the thread that is handling the exception.
+        if exc_info and sys.exc_info()[0] is not None:
+            self._log("error", message, traceback=traceback.format_exc())
+        else:
+            self._log("error", message)
 
     def agent_start(self, agent_name: str, task: str):
-        self.info(f"🤖 Agent START: {agent_name} | Task: {task}")
+        self._log("info", f"🤖 Agent START: {agent_name} | Task: {task}", event="agent_start", agent=agent_name)
 
     def agent_complete(self, agent_name: str, status: str, summary: str):
         emoji = "✅" if status == "success" else "❌"
-        self.info(f"{emoji} Agent COMPLETE: {agent_name} | Status: {status.upper()} | Output: {summary}")
+        self._log("info", f"{emoji} Agent COMPLETE: {agent_name} | Status: {status.upper()} | Output: {summary}",
+                  event="agent_complete", agent=agent_name, status=status)
 
     def log_error(self, agent_name: str, error: str):
-        self.error(f"ERROR in {agent_name}: {error}")
\ No newline at end of file
+        self._log("error", f"ERROR in {agent_name}: {error}", event="agent_error", agent=agent_name)
+
+    # Writer side
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Block until every record queued so far is written; False on timeout."""
+        done = threading.Event()
+        with self._lock:
+            if self._closed or not self._writer.is_alive():
+                return False
+            self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Write all queued records, then stop the writer thread and close the file."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._writer.join(timeout=5.0)
+        atexit.unregister(self.close)
+
+    def _format(self, record: _Record) -> str:
+        created, level, message, fields = record
+        if self.json_format:
+            return json.dumps({"ts": datetime.fromtimestamp(created).isoformat(timespec="milliseconds"),
+                               "level": level.upper(), "message": message, **fields},
+                              ensure_ascii=False, default=str) + "\n"
+        line = f"{datetime.fromtimestamp(created).strftime('%H:%M:%S')} | {level.upper()} | {message}\n"
+        if fields.get("traceback"):
+            line += fields["traceback"]
+        return line
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[_Record] = []
+            waiters: List[threading.Event] = []
+            item = self._queue.get()
+            while True:
+                if item is _STOP:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stopping or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self._write("".join(self._format(r) for r in batch))
+                except Exception as e:  # never let a bad write kill the writer thread
+                    sys.stderr.write(f"WorkflowLogger write failed: {e}\n")
+            for waiter in waiters:
+                waiter.set()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, text: str) -> None:
+        if self.console:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        data = text.encode("utf-8")
+        if self._file is None:
+            self._open()
+        if self.max_bytes and self._size and self._size + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+
+    def _open(self) -> None:
+        self._file = open(self.log_file, "ab")
+        self._size = self._file.tell()
+
+    def _rotate(self) -> None:
+        """workflow.log -> workflow.log.1 -> ... -> workflow.log.<backup_count> (oldest dropped)."""
+        self._file.close()
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                src = f"{self.log_file}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.log_file}.{i + 1}")
+            os.replace(self.log_file, f"{self.log_file}.1")
+        else:
+            os.truncate(self.log_file, 0)
+        self._open()
@@ -0,0 +1,217 @@
+"""
+Span-based Tracing
+
+Records one span per workflow run, per agent and per outbound tool call, with
+monotonic start/end times, parent IDs, attributes and a status. The active
+tracer and the current span live in context variables, so asyncio tasks
+created inside a span (scheduler nodes, per-source calls, page fetches) become
+its children automatically and tools can open spans without a tracer being
+passed around. When no tracer is active, `span()` and `annotate()` are no-ops.
+
+Finished spans are buffered and appended to a JSONL file on `flush()`. The
+file converts to the Chrome trace format (chrome://tracing, ui.perfetto.dev):
+
+    python -m src.monitoring.tracing logs/traces.jsonl -o trace.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+_current_tracer: ContextVar[Optional["Tracer"]] = ContextVar("current_tracer", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def _new_id(nbytes: int = 8) -> str:
+    return os.urandom(nbytes).hex()
+
+
+@dataclass
+class Span:
+    name: str
+    kind: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_us: int = 0
+    end_us: Optional[int] = None
+    timestamp: str = ""
+    status: str = "ok"
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_us(self) -> int:
+        return (self.end_us - self.start_us) if self.end_us is not None else 0
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def fail(self, error: Any) -> None:
+        self.status = "error"
+        self.error = str(error)
+
+
+class Tracer:
+    """Collects finished spans and appends them to a JSONL file."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self._finished: List[Span] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["Tracer"]:
+        return cls(settings.trace_path) if settings.enable_tracing else None
+
+    @contextmanager
+    def activate(self) -> Iterator["Tracer"]:
+        """Make this the tracer used by `span()` in the current context."""
+        token = _current_tracer.set(self)
+        try:
+            yield self
+        finally:
+            _current_tracer.reset(token)
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self._finished.append(span)
+
+    def flush(self) -> int:
+        """Append buffered spans to `path`; return how many were written."""
+        with self._lock:
+            spans, self._finished = self._finished, []
+        if not spans or self.path is None:
+            return 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(asdict(s), default=str) + "\n" for s in spans)
+        return len(spans)
+
+    @property
+    def pending(self) -> List[Span]:
+        with self._lock:
+            return list(self._finished)
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes: Any) -> Iterator[Optional[Span]]:
+    """Open a child of the current span (a new trace at the top level); yields None when tracing is off.
+
+    An exception escaping the block marks the span as failed and is re-raised.
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield None
+        return
+    parent = _current_span.get()
+    current = Span(
+        name=name,
+        kind=kind,
+        trace_id=parent.trace_id if parent else _new_id(16),
+        span_id=_new_id(),
+        parent_id=parent.span_id if parent else None,
+        start_us=time.perf_counter_ns() // 1000,
+        timestamp=datetime.now().isoformat(timespec="microseconds"),
+        attributes=attributes,
+    )
+    token = _current_span.set(current)
+    try:
+        yield current
+    except asyncio.CancelledError:
+        current.status = "cancelled"
+        raise
+    except BaseException as e:
+        current.fail(e if str(e) else type(e).__name__)
+        raise
+    finally:
+        current.end_us = time.perf_counter_ns() // 1000
+        _current_span.reset(token)
+        tracer._finish(current)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def annotate(**attributes: Any) -> None:
+    """Add attributes to the current span, if there is one."""
+    current = _current_span.get()
+    if current is not None:
+        current.set(**attributes)
+
+
+# Chrome trace export
+def read_spans(path: str, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    spans = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                if trace_id is None or record["trace_id"] == trace_id:
+                    spans.append(record)
+    return spans
+
+
+def to_chrome_trace(spans: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Convert span records to Chrome trace "complete" events.
+
+    Each trace (workflow run) becomes a process. Spans are packed into thread
+    lanes such that every lane is properly nested, so overlapping agents and
+    tool calls end up on separate lanes and concurrency is visible at a glance.
+    """
+    events: List[Dict[str, Any]] = []
+    by_trace: Dict[str, List[Dict[str, Any]]] = {}
+    for record in spans:
+        if record.get("end_us") is not None:
+            by_trace.setdefault(record["trace_id"], []).append(record)
+
+    for pid, (trace_id, records) in enumerate(by_trace.items(), start=1):
+        records.sort(key=lambda r: (r["start_us"], -r["end_us"]))
+        root = records[0]
+        events.append({"ph": "M", "name": "process_name", "pid": pid,
+                       "args": {"name": f"{root['name']} {root['attributes'].get('topic', '')} [{trace_id[:8]}]"}})
+        lanes: List[List[int]] = []  # per lane: stack of end times of open spans
+        for record in records:
+            start, end = record["start_us"], record["end_us"]
+            for tid, stack in enumerate(lanes):
+                while stack and stack[-1] <= start:
+                    stack.pop()
+                if not stack or end <= stack[-1]:
+                    stack.append(end)
+                    break
+            else:
+                lanes.append([end])
+                tid = len(lanes) - 1
+            events.append({
+                "ph": "X", "name": record["name"], "cat": record["kind"], "pid": pid, "tid": tid,
+                "ts": start, "dur": end - start,
+                "args": {**record["attributes"], "status": record["status"], "error": record.get("error"),
+                         "span_id": record["span_id"], "parent_id": record.get("parent_id")},
+            })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert JSONL spans to a Chrome / Perfetto trace")
+    parser.add_argument("spans", help="JSONL file written by Tracer.flush")
+    parser.add_argument("-o", "--output", default="trace.json", help="Chrome trace JSON to write")
+    parser.add_argument("--trace-id", default=None, help="Only export this trace (one workflow run)")
+    args = parser.parse_args()
+
+    trace = to_chrome_trace(read_spans(args.spans, args.trace_id))
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(trace, f)
+    print(f"Wrote {sum(1 for e in trace['traceEvents'] if e['ph'] == 'X')} spans to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
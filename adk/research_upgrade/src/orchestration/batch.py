@@ -0,0 +1,106 @@
+"""
+Multi-topic Batch Runner
+
+Runs many research workflows concurrently in one event loop. All workflows
+share a single `WorkflowResources` (HTTP pool, search cache, rate limiters,
+checkpoint store and a bounded ResearchMemory store, one namespace per topic),
+so the per-process cold start is paid once per batch instead of once per topic.
+"""
+import asyncio
+import math
+import re
+import time
+from typing import Any, Dict, Iterable, List
+
+from src.orchestration.resources import WorkflowResources
+from src.orchestration.workflow import ResearchWorkflow
+
+_SLUG = re.compile(r"[^0-9a-zA-Z]+")
+
+
+def read_topics(lines: Iterable[str]) -> List[str]:
+    """One topic per line; blank lines and `#` comments are ignored, duplicates dropped."""
+    topics: List[str] = []
+    seen = set()
+    for line in lines:
+        topic = line.strip()
+        if topic and not topic.startswith("#") and topic not in seen:
+            seen.add(topic)
+            topics.append(topic)
+    return topics
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class BatchRunner:
+    """Runs a list of topics with at most `concurrency` workflows in flight."""
+
+    def __init__(self, settings, logger, concurrency: int = 4):
+        self.settings = settings
+        self.logger = logger
+        self.concurrency = max(1, concurrency)
+
+    async def run(self, topics: List[str]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        runs: List[Dict[str, Any]] = []
+
+        async with WorkflowResources(self.settings) as resources:
+            async def run_topic(topic: str) -> None:
+                async with semaphore:
+                    workflow = ResearchWorkflow(
+                        self.settings, self.logger,
+                        memory=resources.memory.scoped(topic),
+                        resources=resources,
+                        output_prefix=_SLUG.sub("_", topic).strip("_").lower()[:60],
+                    )
+                    try:
+                        result = await workflow.execute(topic)
+                        runs.append({"topic": topic, **result})
+                    except Exception as e:
+                        runs.append({"topic": topic, "status": "failed", "error": str(e)})
+                    finally:
+                        # Keep the shared store flat: drop this topic's entries once outputs are written.
+                        workflow.run_memory.clear()
+
+            self.logger.info(f"BATCH START: {len(topics)} topics, concurrency {self.concurrency}")
+            await asyncio.gather(*(run_topic(topic) for topic in topics))
+            cache_stats = resources.search_cache.stats() if resources.search_cache is not None else None
+
+        summary = self.summarize(runs, time.perf_counter() - started)
+        if cache_stats is not None:
+            summary["search_cache"] = cache_stats
+        self.logger.info(
+            f"BATCH COMPLETED: {summary['succeeded']}/{summary['topics']} topics in {summary['wall_time_s']:.2f}s "
+            f"({summary['topics_per_min']:.1f} topics/min, {summary['papers_per_sec']:.2f} papers/s)"
+        )
+        return summary
+
+    @staticmethod
+    def summarize(runs: List[Dict[str, Any]], wall_time: float) -> Dict[str, Any]:
+        succeeded = [r for r in runs if r.get("status") == "success"]
+        papers = sum(r.get("papers_analyzed", 0) or 0 for r in succeeded)
+        phases: Dict[str, List[float]] = {}
+        for r in succeeded:
+            for phase, seconds in (r.get("agent_timings") or {}).items():
+                phases.setdefault(phase, []).append(seconds)
+        return {
+            "topics": len(runs),
+            "succeeded": len(succeeded),
+            "failed": [{"topic": r["topic"], "error": r.get("error")} for r in runs if r.get("status") != "success"],
+            "wall_time_s": round(wall_time, 3),
+            "topics_per_min": round(len(succeeded) / wall_time * 60, 3) if wall_time else 0.0,
+            "papers_per_sec": round(papers / wall_time, 3) if wall_time else 0.0,
+            "phase_latency_s": {
+                phase: {"p50": round(percentile(v, 50), 4), "p95": round(percentile(v, 95), 4), "n": len(v)}
+                for phase, v in sorted(phases.items())
+            },
+            "runs": runs,
+        }
@@ -0,0 +1,98 @@
+"""
+Streaming Paper Pipeline
+
+Opt-in alternative to running retrieval, extraction and citation as three
+batch agents. Papers flow retrieve -> extract -> cite through bounded queues:
+each paper is extracted and cited as soon as it has been retrieved and
+deduplicated, and a slow stage applies backpressure to the ones before it.
+When the stream ends, the three agents' results are stored in memory with the
+same schema as batch mode, so the downstream agents are unaffected.
+"""
+import asyncio
+from contextlib import aclosing
+from typing import Any, Dict, List
+
+from src.monitoring import tracing
+from src.tools.citation_generator import CitationKeys, CitationWriter
+
+# End-of-stream marker passed between stages.
+_DONE = object()
+
+
+class StreamingPaperPipeline:
+    """Runs PaperRetriever, ContentExtractor and ReferenceManager as one streaming stage chain."""
+    name = "StreamingPaperPipeline"
+
+    def __init__(self, retriever, extractor, reference_manager, queue_size: int = 32):
+        self.retriever = retriever
+        self.extractor = extractor
+        self.reference_manager = reference_manager
+        self.queue_size = max(1, queue_size)
+
+    @property
+    def provides(self):
+        """Agent results this pipeline stores, for dependency resolution."""
+        return (self.retriever.name, self.extractor.name, self.reference_manager.name)
+
+    @property
+    def depends_on(self):
+        return self.retriever.depends_on
+
+    async def execute(self, max_papers: int = 10) -> Dict[str, Any]:
+        to_extract: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        to_cite: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        extracted: List[Dict[str, Any]] = []
+        bibtex: List[str] = []
+        apa: List[str] = []
+
+        # Each stage gets its own span so the trace shows how far the stages overlap.
+        async def retrieve() -> None:
+            with tracing.span(self.retriever.name, kind="agent", streamed=True):
+                async with aclosing(self.retriever.stream(max_papers)) as papers:
+                    async for paper in papers:
+                        await to_extract.put(paper)
+            await to_extract.put(_DONE)
+
+        async def extract() -> None:
+            with tracing.span(self.extractor.name, kind="agent", streamed=True):
+                self.extractor.logger.agent_start(self.extractor.name, "Extracting content from streamed papers")
+                streamed: List[Dict[str, Any]] = []
+                while (paper := await to_extract.get()) is not _DONE:
+                    extracted.append(self.extractor.extract_paper(paper))
+                    streamed.append(paper)
+                    await to_cite.put(paper)
+                await to_cite.put(_DONE)
+                # Relevance scores are final only once retrieval has finished, i.e. now.
+                for record, paper in zip(extracted, streamed):
+                    record["relevance"] = paper.get("relevance")
+                self.extractor.store_extracted(extracted)
+
+        async def cite() -> None:
+            with tracing.span(self.reference_manager.name, kind="agent", streamed=True):
+                self.reference_manager.logger.agent_start(self.reference_manager.name, "Generating citations for streamed papers")
+                tool = self.reference_manager.citation_tool
+                keys = CitationKeys()
+                if self.reference_manager.export_to:
+                    # Streamed to files as papers arrive; nothing accumulates in memory.
+                    bibtex_path, apa_path = self.reference_manager.export_paths()
+                    with CitationWriter(bibtex_path, apa_path) as writer:
+                        while (paper := await to_cite.get()) is not _DONE:
+                            writer.write(*await tool.generate_citation(paper, keys))
+                    self.reference_manager.store_citations({"bibtex": [], "apa": [], "count": writer.written,
+                                                            "bibtex_path": bibtex_path, "apa_path": apa_path})
+                    return
+                while (paper := await to_cite.get()) is not _DONE:
+                    entry, reference = await tool.generate_citation(paper, keys)
+                    bibtex.append(entry)
+                    apa.append(reference)
+                self.reference_manager.store_citations({"bibtex": bibtex, "apa": apa, "count": len(apa)})
+
+        stages = [asyncio.ensure_future(stage()) for stage in (retrieve, extract, cite)]
+        try:
+            await asyncio.gather(*stages)
+        finally:
+            # A failed stage would leave its neighbours blocked on a queue.
+            for stage in stages:
+                stage.cancel()
+        citations = self.reference_manager.memory.get_agent_result(self.reference_manager.name) or {}
+        return {"papers": len(extracted), "citations": citations.get("count", len(apa))}
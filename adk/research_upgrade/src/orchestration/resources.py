@@ -0,0 +1,69 @@
+"""
+Shared Workflow Resources
+
+Everything that is expensive to build or must be shared to be effective lives
+here: the pooled HTTP client, the search cache, per-source rate limiters, the
+tools built on them, the checkpoint store, the tracer and the root
+ResearchMemory store.
+A single-topic run creates its own instance; batch mode creates one and hands
+it to every workflow so connection pools, caches and rate limits are shared.
+"""
+from src.tools.arxiv_tool import ArXivTool
+from src.tools.semantic_scholar_tool import SemanticScholarTool
+from src.tools.citation_generator import CitationGeneratorTool
+from src.tools.fact_checker_tool import FactCheckerTool
+from src.tools.http_client import AsyncHTTPClient
+from src.tools.rate_limiter import RateLimiter
+from src.memory.research_memory import ResearchMemory
+from src.memory.search_cache import SearchCache
+from src.memory.checkpoint_store import CheckpointStore
+from src.monitoring.tracing import Tracer
+
+
+class WorkflowResources:
+    """Long-lived tools and stores shared by every workflow in a process."""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.memory = ResearchMemory.from_settings(settings)
+
+        # Network tools share one pooled HTTP client and one search cache
+        self.http_client = AsyncHTTPClient.from_settings(settings)
+        self.search_cache = SearchCache.from_settings(settings) if settings.enable_search_cache else None
+        self.rate_limiters = {
+            source: RateLimiter(rate) for source, rate in settings.source_rate_limits.items() if rate
+        }
+        self.arxiv_tool = ArXivTool(
+            max_results=settings.arxiv_max_results,
+            http_client=self.http_client,
+            page_size=settings.arxiv_page_size,
+            page_concurrency=settings.arxiv_page_concurrency,
+            request_interval=settings.arxiv_request_interval,
+            cache=self.search_cache,
+            base_url=settings.arxiv_base_url
+        )
+        self.semantic_scholar_tool = SemanticScholarTool(
+            api_key=settings.semantic_scholar_api_key,
+            max_results=settings.semantic_scholar_max_results,
+            http_client=self.http_client,
+            cache=self.search_cache,
+            base_url=settings.semantic_scholar_base_url
+        )
+        self.citation_tool = CitationGeneratorTool()
+        self.fact_checker = FactCheckerTool.from_settings(settings)
+        self.checkpoints = CheckpointStore.from_settings(settings) if settings.enable_checkpoints else None
+        self.tracer = Tracer.from_settings(settings)
+
+    async def aclose(self) -> None:
+        """Release pooled HTTP connections and the cache handle; write any unflushed spans."""
+        if self.tracer is not None:
+            self.tracer.flush()
+        await self.http_client.aclose()
+        if self.search_cache is not None:
+            self.search_cache.close()
+
+    async def __aenter__(self) -> "WorkflowResources":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
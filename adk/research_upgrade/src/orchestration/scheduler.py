@@ -0,0 +1,164 @@
+"""
+Dependency-driven Task Scheduler
+
+Each node names the results it consumes. A node is started the moment all of
+its dependencies have completed (agents store their result in ResearchMemory
+before returning, so completion means the inputs are available). A node may
+also `provide` extra result names, e.g. a pipeline that stores the results of
+several agents. Independent nodes overlap as far as the dependency graph allows.
+After a run, per-node timings and the critical path are available for logging.
+Each node also runs inside a tracing span (see `src.monitoring.tracing`).
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from src.monitoring import tracing
+
+
+@dataclass
+class TaskNode:
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+    provides: Tuple[str, ...] = ()
+
+
+@dataclass
+class TaskTiming:
+    start: float
+    end: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end - self.start) if self.end is not None else 0.0
+
+
+@dataclass
+class CriticalPath:
+    nodes: List[str] = field(default_factory=list)
+    duration: float = 0.0
+
+
+class DAGScheduler:
+    """Runs a DAG of coroutine factories, starting each node when its inputs are ready."""
+
+    def __init__(self, logger, max_concurrency: Optional[int] = None):
+        self.logger = logger
+        self.max_concurrency = max_concurrency
+        self.nodes: Dict[str, TaskNode] = {}
+        self.timings: Dict[str, TaskTiming] = {}
+        self._origin = 0.0
+        self._providers: Dict[str, str] = {}
+
+    def add(self, name: str, run: Callable[[], Awaitable[Any]], depends_on=(), provides=()) -> None:
+        for result_name in (name, *provides):
+            if result_name in self._providers:
+                raise ValueError(f"Duplicate task node or result: {result_name}")
+            self._providers[result_name] = name
+        self.nodes[name] = TaskNode(name, run, tuple(depends_on), tuple(provides))
+
+    def _upstream(self, node: TaskNode) -> Set[str]:
+        """Names of the nodes that produce `node`'s dependencies."""
+        return {self._providers[d] for d in node.depends_on}
+
+    def _validate(self) -> None:
+        for node in self.nodes.values():
+            missing = [d for d in node.depends_on if d not in self._providers]
+            if missing:
+                raise ValueError(f"Task '{node.name}' depends on unknown task(s): {', '.join(missing)}")
+        # Kahn's algorithm: every node must be reachable in topological order.
+        upstream = {name: self._upstream(node) for name, node in self.nodes.items()}
+        indegree = {name: len(deps) for name, deps in upstream.items()}
+        ready = [name for name, deg in indegree.items() if deg == 0]
+        visited = 0
+        while ready:
+            current = ready.pop()
+            visited += 1
+            for name, deps in upstream.items():
+                if current in deps:
+                    indegree[name] -= 1
+                    if indegree[name] == 0:
+                        ready.append(name)
+        if visited != len(self.nodes):
+            raise ValueError("Task graph contains a dependency cycle")
+
+    async def run(self) -> Dict[str, Any]:
+        """Execute every node; return results by node name. The first exception cancels the rest."""
+        self._validate()
+        self.timings = {}
+        self._origin = time.monotonic()
+        semaphore = asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        remaining = {name: self._upstream(node) for name, node in self.nodes.items()}
+        dependents: Dict[str, List[str]] = {name: [] for name in self.nodes}
+        for name, deps in remaining.items():
+            for dep in deps:
+                dependents[dep].append(name)
+
+        results: Dict[str, Any] = {}
+        pending: Dict[asyncio.Task, str] = {}
+
+        async def run_node(node: TaskNode) -> Any:
+            if semaphore is not None:
+                async with semaphore:
+                    return await self._timed(node)
+            return await self._timed(node)
+
+        def launch(name: str) -> None:
+            pending[asyncio.ensure_future(run_node(self.nodes[name]))] = name
+
+        for name, deps in remaining.items():
+            if not deps:
+                launch(name)
+
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = pending.pop(task)
+                    results[name] = task.result()
+                    for child in dependents[name]:
+                        remaining[child].discard(name)
+                        if not remaining[child]:
+                            launch(child)
+        finally:
+            for task in pending:
+                task.cancel()
+        return results
+
+    async def _timed(self, node: TaskNode) -> Any:
+        timing = TaskTiming(start=time.monotonic() - self._origin)
+        self.timings[node.name] = timing
+        try:
+            with tracing.span(node.name, kind="agent", depends_on=list(node.depends_on)) as span:
+                result = await node.run()
+                # Agents report failure by returning {"error": ...} rather than raising.
+                if span is not None and isinstance(result, dict) and result.get("error"):
+                    span.fail(result["error"])
+                return result
+        finally:
+            timing.end = time.monotonic() - self._origin
+
+    def critical_path(self) -> CriticalPath:
+        """Walk back from the last node to finish through the latest-finishing dependency."""
+        finished = {name: t for name, t in self.timings.items() if t.end is not None}
+        if not finished:
+            return CriticalPath()
+        current = max(finished, key=lambda name: finished[name].end)
+        path = [current]
+        while True:
+            deps = [d for d in self._upstream(self.nodes[current]) if d in finished]
+            if not deps:
+                break
+            current = max(deps, key=lambda name: finished[name].end)
+            path.append(current)
+        path.reverse()
+        return CriticalPath(nodes=path, duration=finished[path[-1]].end)
+
+    def log_critical_path(self) -> CriticalPath:
+        critical = self.critical_path()
+        if critical.nodes and self.logger.is_enabled_for("info"):
+            steps = " -> ".join(f"{name} ({self.timings[name].duration:.2f}s)" for name in critical.nodes)
+            self.logger.info(f"CRITICAL PATH: {steps} | total {critical.duration:.2f}s")
+        return critical
@@ -3,84 +3,119 @@ Complete Workflow Orchestration
 """
 import asyncio
 import time
-from typing import Dict, Any, List
+import uuid
+from typing import Dict, Any, List, Optional
 
 from src.agents.research_agents import ResearchPlannerAgent, PaperRetrieverAgent, ContentExtractorAgent
 from src.agents.analysis_agents import AnalysisAgent, CriticAgent, ValidatorAgent, ReferenceManagerAgent, SynthesisAgent
-from src.tools.arxiv_tool import ArXivTool
-from src.tools.semantic_scholar_tool import SemanticScholarTool
-from src.tools.citation_generator import CitationGeneratorTool
-from src.tools.fact_checker_tool import FactCheckerTool
+from src.orchestration.scheduler import DAGScheduler
+from src.orchestration.pipeline import StreamingPaperPipeline
+from src.orchestration.resources import WorkflowResources
 from src.memory.research_memory import ResearchMemory
+from src.memory.checkpoint_store import CheckpointStore
 from src.output.formatters import OutputFormatter
+from src.monitoring import tracing
 
 class ResearchWorkflow:
     """Main workflow orchestrator."""
     
-    def __init__(self, settings, logger):
+    def __init__(self, settings, logger, memory: Optional[ResearchMemory] = None,
+                 resources: Optional[WorkflowResources] = None, output_prefix: Optional[str] = None):
         self.settings = settings
         self.logger = logger
-        self.memory = ResearchMemory()
-        
-        # Initialize tools
-        self.arxiv_tool = ArXivTool(max_results=settings.arxiv_max_results)
-        self.semantic_scholar_tool = SemanticScholarTool(
-            api_key=settings.semantic_scholar_api_key,
-            max_results=settings.semantic_scholar_max_results
-        )
-        self.citation_tool = CitationGeneratorTool()
-        self.fact_checker = FactCheckerTool()
+        # Batch mode passes shared resources; a standalone workflow owns its own.
+        self._owns_resources = resources is None
+        self.resources = resources if resources is not None else WorkflowResources(settings)
+        # Pass a view of a shared ResearchMemory (see `ResearchMemory.scoped`) to
+        # run several workflows against one bounded store. It is never modified;
+        # each run works in its own view of the same store, `run_memory`.
+        self.memory = memory if memory is not None else self.resources.memory
+        self.run_memory = self.memory
+        self.output_prefix = output_prefix
+
+        self.http_client = self.resources.http_client
+        self.search_cache = self.resources.search_cache
+        self.arxiv_tool = self.resources.arxiv_tool
+        self.semantic_scholar_tool = self.resources.semantic_scholar_tool
+        self.citation_tool = self.resources.citation_tool
+        self.fact_checker = self.resources.fact_checker
+        self.checkpoints = self.resources.checkpoints
+        self.tracer = self.resources.tracer
+        self._result_hashes: Dict[str, str] = {}
         
         # Initialize agents
         self.research_planner = ResearchPlannerAgent(self.memory, self.logger)
-        self.paper_retriever = PaperRetrieverAgent(self.memory, self.logger, self.arxiv_tool, self.semantic_scholar_tool)
+        self.paper_retriever = PaperRetrieverAgent(
+            self.memory, self.logger, self.arxiv_tool, self.semantic_scholar_tool,
+            max_concurrency=settings.retrieval_concurrency,
+            rate_limiters=self.resources.rate_limiters
+        )
         self.content_extractor = ContentExtractorAgent(self.memory, self.logger)
         self.analysis_agent = AnalysisAgent(self.memory, self.logger)
         self.critic_agent = CriticAgent(self.memory, self.logger)
         self.validator_agent = ValidatorAgent(self.memory, self.logger, self.fact_checker)
         self.reference_manager = ReferenceManagerAgent(self.memory, self.logger, self.citation_tool)
         self.synthesis_agent = SynthesisAgent(self.memory, self.logger)
+        self.paper_pipeline = StreamingPaperPipeline(
+            self.paper_retriever, self.content_extractor, self.reference_manager,
+            queue_size=settings.stream_queue_size
+        )
         
         self.output_formatter = OutputFormatter(settings)
     
     async def execute(self, research_topic: str) -> Dict[str, Any]:
+        if self.tracer is None:
+            return await self._execute(research_topic)
+        try:
+            with self.tracer.activate(), tracing.span("ResearchWorkflow", kind="workflow", topic=research_topic):
+                return await self._execute(research_topic)
+        finally:
+            self.tracer.flush()
+
+    async def _execute(self, research_topic: str) -> Dict[str, Any]:
         start_time = time.time()
         self.logger.info(f"WORKFLOW START: {research_topic}")
+        # Each topic gets its own namespace; stale results from an earlier run
+        # of the same topic must not leak into this one.
+        self.run_memory = self.memory.scoped(research_topic)
+        self.run_memory.clear()
+        for agent in self._agents():
+            agent.memory = self.run_memory
+        self._result_hashes = {}
+        # One stem for every output of this run; batch runs add a per-topic prefix
+        # so concurrent workflows finishing in the same second don't collide.
+        self._stem = self.output_formatter.default_stem(self.output_prefix)
+        if self.settings.stream_citations:
+            self.reference_manager.export_to = str(self.output_formatter.output_dir / self._stem)
         try:
-            # Sequential Phases
-            await self.research_planner.execute(topic=research_topic)
-            await self.paper_retriever.execute(max_papers=self.settings.max_papers)
-            await self.content_extractor.execute()
-            
-            # Parallel Phase
+            scheduler = self._build_scheduler(research_topic)
             if self.settings.enable_parallel:
-                self.logger.info("PARALLEL EXECUTION START: Analysis, Critique, References")
-                await asyncio.gather(
-                    self.analysis_agent.execute(),
-                    self.critic_agent.execute(),
-                    self.reference_manager.execute()
-                )
-            else:
-                await self.analysis_agent.execute()
-                await self.critic_agent.execute()
-                await self.reference_manager.execute()
+                self.logger.info("DAG EXECUTION START: agents run as soon as their inputs are ready")
+            results = await scheduler.run()
+            critical = scheduler.log_critical_path()
+            synthesis = results.get(self.synthesis_agent.name) or {}
 
-            # Validation and Synthesis
-            if self.settings.enable_validation:
-                await self.validator_agent.execute()
-            
-            synthesis = await self.synthesis_agent.execute()
-            
-            output_files = await self._generate_outputs(synthesis)
+            with tracing.span("OutputFormatter", kind="output", formats=list(self.settings.output_formats)):
+                output_files = await self._generate_outputs(synthesis)
 
             execution_time = time.time() - start_time
             final_results = {
                 "status": "success",
                 "execution_time": execution_time,
                 "output_files": output_files,
-                "papers_analyzed": (self.memory.get_agent_result("ContentExtractorAgent") or {}).get("total_papers", 0),
-                "quality_score": (self.memory.get_agent_result("ValidatorAgent") or {}).get("quality_score", "N/A"),
+                "papers_analyzed": (self.run_memory.get_agent_result("ContentExtractorAgent") or {}).get("total_papers", 0),
+                "quality_score": (self.run_memory.get_agent_result("ValidatorAgent") or {}).get("quality_score", "N/A"),
+                "agent_timings": {name: round(t.duration, 4) for name, t in scheduler.timings.items()},
+                "critical_path": critical.nodes,
             }
+            if self.search_cache is not None:
+                cache_stats = self.search_cache.stats()
+                final_results["search_cache"] = cache_stats
+                self.logger.info(f"Search cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['entries']} entries")
+            root = tracing.current_span()
+            if root is not None:
+                root.set(papers=final_results["papers_analyzed"], critical_path=critical.nodes)
+                final_results["trace_id"] = root.trace_id
             self.logger.info(f"WORKFLOW COMPLETED in {execution_time:.2f}s")
             return final_results
             
@@ -88,23 +123,109 @@ class ResearchWorkflow:
             self.logger.error(f"WORKFLOW FAILED: {str(e)}", exc_info=True)
             raise
 
+    def _agents(self) -> List[Any]:
+        return [self.research_planner, self.paper_retriever, self.content_extractor, self.analysis_agent,
+                self.critic_agent, self.validator_agent, self.reference_manager, self.synthesis_agent]
+
+    def _build_scheduler(self, research_topic: str) -> DAGScheduler:
+        """Wire agents into a DAG using each agent's declared `depends_on`.
+
+        With `enable_parallel` off, the same graph runs one agent at a time in
+        dependency order. The validator is left out entirely when validation
+        is disabled; nothing downstream waits on it. With `enable_streaming`
+        on, retrieval, extraction and citation run as one streaming pipeline
+        node that provides all three agents' results.
+        """
+        max_papers = self.settings.max_papers
+        agents = [(self.research_planner, lambda: self.research_planner.execute(topic=research_topic))]
+        if self.settings.enable_streaming:
+            agents.append((self.paper_pipeline, lambda: self.paper_pipeline.execute(max_papers=max_papers)))
+        else:
+            agents += [
+                (self.paper_retriever, lambda: self.paper_retriever.execute(max_papers=max_papers)),
+                (self.content_extractor, self.content_extractor.execute),
+                (self.reference_manager, self.reference_manager.execute),
+            ]
+        agents += [
+            (self.analysis_agent, self.analysis_agent.execute),
+            (self.critic_agent, self.critic_agent.execute),
+        ]
+        if self.settings.enable_validation:
+            agents.append((self.validator_agent, self.validator_agent.execute))
+        agents.append((self.synthesis_agent, self.synthesis_agent.execute))
+
+        scheduler = DAGScheduler(self.logger, max_concurrency=None if self.settings.enable_parallel else 1)
+        settings_hash = self.settings.fingerprint()
+        for agent, run in agents:
+            if self.checkpoints is not None:
+                run = self._checkpointed(agent, run, research_topic, settings_hash)
+            scheduler.add(agent.name, run, agent.depends_on, getattr(agent, "provides", ()))
+        return scheduler
+
+    def _checkpointed(self, agent, run, research_topic: str, settings_hash: str):
+        """Wrap an agent so its results are checkpointed, and reused on `resume` if inputs are unchanged.
+
+        The key covers the topic, settings fingerprint and the content hashes
+        of the agent's upstream results, so any upstream change cascades.
+        """
+        result_names = tuple(getattr(agent, "provides", ())) or (agent.name,)
+
+        async def run_with_checkpoint():
+            upstream = {dep: self._result_hashes.get(dep, "") for dep in agent.depends_on}
+            key = CheckpointStore.make_key(agent.name, research_topic, settings_hash, upstream)
+
+            if self.settings.resume:
+                hit = await asyncio.to_thread(self.checkpoints.get, key)
+                if hit is not None:
+                    payload, digest = hit
+                    for name, value in payload["context"].items():
+                        self.run_memory.store_context(name, value)
+                    for name, value in payload["results"].items():
+                        self.run_memory.store_agent_result(name, value)
+                        self._result_hashes[name] = digest
+                    self.logger.info(f"RESUMED {agent.name} from checkpoint {digest[:12]}")
+                    tracing.annotate(checkpoint="resumed", checkpoint_digest=digest[:12])
+                    return payload["node_result"]
+
+            node_result = await run()
+            results = {name: self.run_memory.get_agent_result(name) for name in result_names}
+            failed = any(r is None or (isinstance(r, dict) and "error" in r) for r in results.values())
+            if failed:
+                # Never checkpoint failures; a fresh hash keeps dependents from resuming stale results.
+                digest = uuid.uuid4().hex
+            else:
+                payload = {"node_result": node_result, "results": results, "context": self.run_memory.get_all_context()}
+                digest = await asyncio.to_thread(self.checkpoints.put, key, payload)
+                tracing.annotate(checkpoint="stored", checkpoint_digest=digest[:12])
+            for name in result_names:
+                self._result_hashes[name] = digest
+            return node_result
+
+        return run_with_checkpoint
+
+    async def aclose(self) -> None:
+        """Release resources this workflow created; shared resources are left to their owner."""
+        if self._owns_resources:
+            await self.resources.aclose()
+
     async def _generate_outputs(self, synthesis: Dict) -> List[str]:
         output_files = []
         data_package = {
             "literature_review": synthesis.get("literature_review", ""),
-            **self.memory.get_all_results()
+            **self.run_memory.get_all_results()
         }
-        for fmt in self.settings.output_formats:
-            try:
-                if fmt == "json":
-                    fp = await self.output_formatter.generate_json(data_package)
-                    output_files.append(fp)
-                elif fmt == "markdown":
-                    fp = await self.output_formatter.generate_markdown(data_package)
-                    output_files.append(fp)
-                elif fmt == "html":
-                    fp = await self.output_formatter.generate_html(data_package)
-                    output_files.append(fp)
-            except Exception as e:
-                self.logger.error(f"Failed to generate '{fmt}' output: {e}")
-        return output_files
\ No newline at end of file
+        stem = self._stem
+        # Formats are independent; each one is written in its own worker thread.
+        formats = list(self.settings.output_formats)
+        results = await asyncio.gather(
+            *(self.output_formatter.generate(fmt, data_package, stem=stem) for fmt in formats),
+            return_exceptions=True,
+        )
+        for fmt, result in zip(formats, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Failed to generate '{fmt}' output: {result}")
+            else:
+                output_files.append(result)
+        citations = self.run_memory.get_agent_result(self.reference_manager.name) or {}
+        output_files.extend(citations[key] for key in ("bibtex_path", "apa_path") if citations.get(key))
+        return output_files
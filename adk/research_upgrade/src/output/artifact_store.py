@@ -0,0 +1,24 @@
+"""
+Content-Addressed Artifact Store
+
+The store is the top-level `artifact_store` package at the repository root,
+shared with the crewAI app. This module puts the repository root on the path
+and runs its CLI with this app's default output directory:
+
+    python -m src.output.artifact_store ls
+    python -m src.output.artifact_store cat review_20250101_120000.md
+"""
+import sys
+from pathlib import Path
+
+_REPO_ROOT = str(Path(__file__).resolve().parents[4])
+if _REPO_ROOT not in sys.path:
+    # Appended, so `src` and `config` still resolve to this app's packages.
+    sys.path.append(_REPO_ROOT)
+
+from artifact_store import CODECS, RUN_FILE, ArtifactStore, main, run_of  # noqa: E402
+
+__all__ = ["ArtifactStore", "CODECS", "RUN_FILE", "run_of"]
+
+if __name__ == "__main__":
+    main("./output")
@@ -1,10 +1,44 @@
 """
 Output Formatters for Structured Output Generation
+
+Every format is written by a synchronous `write_*` method that the async
+`generate_*` wrappers run in a worker thread, so formats can be generated
+concurrently without blocking the event loop. Files are written to a temporary
+name in the output directory and renamed into place, so a partially written
+output never appears under its final name. JSON is encoded with orjson when it
+is installed (and `settings.fast_json` is on), otherwise streamed to the file
+chunk by chunk with `JSONEncoder.iterencode`. Markdown is converted from the
+review HTML in one streaming pass (see `src.output.markdown`). With
+`settings.artifact_store` on, files go to the compressed, content-addressed
+store instead (see `src.output.artifact_store`) and the returned paths are views.
 """
+import asyncio
 import json
+import os
+import uuid
+from collections.abc import Mapping
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, IO, Iterator, Optional
+
+from src.output.artifact_store import ArtifactStore
+from src.output.markdown import html_to_markdown
+
+try:
+    import orjson
+except ImportError:  # optional fast path
+    orjson = None
+
+_BUFFER_SIZE = 1 << 20
+_HTML_HEAD = (
+    '<!DOCTYPE html>'
+    '<html><head><title>Literature Review</title>'
+    '<style>body{font-family:sans-serif;max-width:900px;margin:auto;padding:20px;line-height:1.5} '
+    'table{border-collapse:collapse;width:100%} table,th,td{border:1px solid #ddd;padding:8px} th{background:#f4f4f4}'
+    '</style></head><body>'
+)
+_HTML_TAIL = '</body></html>'
 
 
 class OutputFormatter:
@@ -13,50 +47,111 @@ class OutputFormatter:
     def __init__(self, settings):
         self.output_dir = Path(settings.output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.fast_json = getattr(settings, "fast_json", True) and orjson is not None
+        self.store = ArtifactStore(settings.output_dir) if getattr(settings, "artifact_store", False) else None
 
-    async def _write_file(self, filename: str, content: str) -> str:
+    @staticmethod
+    def default_stem(prefix: Optional[str] = None) -> str:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return f"review_{prefix}_{timestamp}" if prefix else f"review_{timestamp}"
+
+    @contextmanager
+    def _open_atomic(self, filename: str, binary: bool = False) -> Iterator[IO]:
+        """Open a temporary file next to `filename`; it replaces `filename` only if the block succeeds.
+
+        With the artifact store enabled, the stream writes a blob instead and
+        `filename` becomes a view of it.
+        """
+        if self.store is not None:
+            with self.store.open_blob(filename, binary=binary) as f:
+                yield f
+            return
         filepath = self.output_dir / filename
-        with open(filepath, 'w', encoding='utf-8') as f:
+        tmp = self.output_dir / f".{filename}.{uuid.uuid4().hex}.tmp"
+        try:
+            if binary:
+                f = open(tmp, "xb", buffering=_BUFFER_SIZE)
+            else:
+                f = open(tmp, "x", encoding="utf-8", buffering=_BUFFER_SIZE)
+            with f:
+                yield f
+            os.replace(tmp, filepath)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    async def _write_file(self, filename: str, content: str) -> str:
+        return await asyncio.to_thread(self.write_file, filename, content)
+
+    def write_file(self, filename: str, content: str) -> str:
+        with self._open_atomic(filename) as f:
             f.write(content)
-        return str(filepath)
+        return str(self.output_dir / filename)
 
-    async def generate_json(self, data: Dict[str, Any]) -> str:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        content = json.dumps(data, indent=2, default=str)
-        return await self._write_file(f"review_{timestamp}.json", content)
+    # Synchronous writers (run in worker threads by the async generators below)
+    def write_json(self, data: Dict[str, Any], stem: str) -> str:
+        filename = f"{stem}.json"
+        if self.fast_json:
+            content = orjson.dumps(data, default=_json_default,
+                                   option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+            with self._open_atomic(filename, binary=True) as f:
+                f.write(content)
+        else:
+            with self._open_atomic(filename) as f:
+                f.writelines(json.JSONEncoder(indent=2, default=_json_default).iterencode(data))
+        return str(self.output_dir / filename)
 
-    async def generate_markdown(self, data: Dict[str, Any]) -> str:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    def write_markdown(self, data: Dict[str, Any], stem: str) -> str:
         review_html = data.get("literature_review", "<p>No review generated.</p>")
 
-        # Very small HTML -> markdown conversion for our generated review_html
-        markdown = review_html.replace("<h1>", "# ").replace("</h1>", "\n\n")
-        markdown = markdown.replace("<h2>", "## ").replace("</h2>", "\n\n")
-        markdown = markdown.replace("<p>", "").replace("</p>", "\n\n")
-
-        # Include citations if available in the data package (ReferenceManagerAgent result)
+        # Include citations if available in the data package (ReferenceManagerAgent result),
+        # unless the review already has its own references section
         ref_data = data.get("ReferenceManagerAgent") or {}
         apa_list = ref_data.get("apa", []) if isinstance(ref_data, dict) else []
+        if "<h2>References</h2>" in review_html:
+            apa_list = []
 
-        if apa_list:
-            markdown += "\n## References\n\n"
-            for i, cite in enumerate(apa_list, start=1):
-                markdown += f"{i}. {cite}\n\n"
+        filename = f"{stem}.md"
+        with self._open_atomic(filename) as f:
+            # Add metadata header
+            f.write(f"# Literature Review\nGenerated: {datetime.now().isoformat()}\n\n")
+            html_to_markdown(review_html, f)
+            if apa_list:
+                f.write("\n## References\n\n")
+                f.writelines(f"{i}. {cite}\n\n" for i, cite in enumerate(apa_list, start=1))
+        return str(self.output_dir / filename)
 
-        # Add metadata header
-        header = f"# Literature Review\nGenerated: {datetime.now().isoformat()}\n\n"
-        content = header + markdown
-        return await self._write_file(f"review_{timestamp}.md", content)
+    def write_html(self, data: Dict[str, Any], stem: str) -> str:
+        filename = f"{stem}.html"
+        with self._open_atomic(filename) as f:
+            f.write(_HTML_HEAD)
+            f.write(data.get("literature_review", "<p>No review generated.</p>"))
+            f.write(_HTML_TAIL)
+        return str(self.output_dir / filename)
 
-    async def generate_html(self, data: Dict[str, Any]) -> str:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        html_content = data.get("literature_review", "<p>No review generated.</p>")
-        html_head = (
-            '<!DOCTYPE html>'
-            '<html><head><title>Literature Review</title>'
-            '<style>body{font-family:sans-serif;max-width:900px;margin:auto;padding:20px;line-height:1.5} '
-            'table{border-collapse:collapse;width:100%} table,th,td{border:1px solid #ddd;padding:8px} th{background:#f4f4f4}'
-            '</style></head><body>'
-        )
-        html = html_head + html_content + '</body></html>'
-        return await self._write_file(f"review_{timestamp}.html", html)
+    async def generate_json(self, data: Dict[str, Any], stem: Optional[str] = None) -> str:
+        return await asyncio.to_thread(self.write_json, data, stem or self.default_stem())
+
+    async def generate_markdown(self, data: Dict[str, Any], stem: Optional[str] = None) -> str:
+        return await asyncio.to_thread(self.write_markdown, data, stem or self.default_stem())
+
+    async def generate_html(self, data: Dict[str, Any], stem: Optional[str] = None) -> str:
+        return await asyncio.to_thread(self.write_html, data, stem or self.default_stem())
+
+    async def generate(self, fmt: str, data: Dict[str, Any], stem: Optional[str] = None) -> str:
+        """Generate one format by name ("json", "markdown" or "html")."""
+        generators = {"json": self.generate_json, "markdown": self.generate_markdown, "html": self.generate_html}
+        if fmt not in generators:
+            raise ValueError(f"Unknown output format: {fmt}")
+        return await generators[fmt](data, stem=stem)
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize PaperTables (as records), row views and NumPy scalars; str() for anything else."""
+    if hasattr(value, "to_records"):
+        return value.to_records()
+    if isinstance(value, Mapping):
+        return dict(value)
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
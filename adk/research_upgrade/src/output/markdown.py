@@ -0,0 +1,176 @@
+"""
+HTML to Markdown Conversion
+
+`MarkdownConverter` turns the review HTML into Markdown in one pass over a
+start-tag / end-tag / text event stream, the same events `html.parser`
+produces. The events come from a single regex scan instead: `HTMLParser`
+spends most of its time on per-tag bookkeeping (positions, attribute parsing)
+that the review markup does not need, and the scan is several times faster.
+Each block (heading, paragraph, list item, table
+row) is written to the sink as soon as it closes, so memory is bounded by the
+largest block. Supported markup is what the review uses: h1-h6, p, ul/ol/li
+(nested), table rows with th/td, a, strong/b, em/i and br; other tags are
+dropped and their text kept. Text is whitespace-collapsed and Markdown
+metacharacters in it are backslash-escaped.
+"""
+import re
+from html import unescape
+from typing import Any, List, Optional, Protocol
+
+_HEADINGS = {f"h{n}": "#" * n + " " for n in range(1, 7)}
+_EMPHASIS = {"strong": "**", "b": "**", "em": "*", "i": "*"}
+_BLOCKS = {"p", "div", "blockquote", "li", "table", "thead", "tbody", "tr", *_HEADINGS}
+_SKIPPED = {"script", "style", "head", "title"}
+_MARKDOWN_SPECIAL = re.compile(r"[\\`*_\[\]<>|]")
+CHUNK_SIZE = 1 << 16
+# A comment, a declaration (<!DOCTYPE>), an end tag, a start tag, text, or a stray "<".
+_TOKEN = re.compile(r"<!--.*?-->|<![^>]*>|</([a-zA-Z][a-zA-Z0-9]*)\s*>|<([a-zA-Z][a-zA-Z0-9]*)([^>]*)>|([^<]+)|<", re.S)
+_HREF = re.compile(r"""\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.I)
+
+
+class Sink(Protocol):
+    def write(self, chunk: str) -> Any: ...
+
+
+class MarkdownConverter:
+    """Streaming HTML -> Markdown; feed HTML with `feed()`, then call `close()`."""
+
+    def __init__(self, sink: Sink):
+        self.sink = sink
+        self._pending = ""             # unscanned tail of the fed HTML
+        self._inline: List[str] = []   # text of the block being built
+        self._prefix = ""              # heading / list marker of that block
+        self._lists: List[List[Any]] = []  # [tag, items so far] per open list
+        self._links: List[str] = []
+        self._row: Optional[List[str]] = None
+        self._table_rows = 0
+        self._skip = 0
+
+    def feed(self, data: str) -> None:
+        """Scan `data`; a trailing incomplete tag, comment or text run waits for the next call."""
+        data = self._pending + data
+        cut = data.rfind(">") + 1
+        comment = data.rfind("<!--", 0, cut)
+        if comment != -1 and data.find("-->", comment) == -1:
+            cut = comment
+        self._pending = data[cut:]
+        self._scan(data[:cut])
+
+    def close(self) -> None:
+        self._scan(self._pending)
+        self._pending = ""
+        self._end_row()
+        self._flush()
+
+    def _scan(self, data: str) -> None:
+        for end_tag, start_tag, attrs, text in _TOKEN.findall(data):
+            if text:
+                self.handle_data(unescape(text) if "&" in text else text)
+            elif start_tag:
+                self.handle_starttag(start_tag.lower(), attrs)
+                if attrs.endswith("/"):
+                    self.handle_endtag(start_tag.lower())
+            elif end_tag:
+                self.handle_endtag(end_tag.lower())
+
+    def handle_starttag(self, tag: str, attrs: str) -> None:
+        if tag in _SKIPPED:
+            self._skip += 1
+        elif self._skip:
+            return  # markup inside a script/style string, e.g. "<b>"
+        elif tag in _HEADINGS:
+            self._flush()
+            self._prefix = _HEADINGS[tag]
+        elif tag in ("p", "div", "blockquote"):
+            self._flush()
+        elif tag in ("ul", "ol"):
+            self._flush()
+            self._lists.append([tag, 0])
+        elif tag == "li":
+            self._flush()
+            if self._lists:
+                self._lists[-1][1] += 1
+                kind, n = self._lists[-1]
+                marker = f"{n}. " if kind == "ol" else "- "
+            else:
+                marker = "- "
+            self._prefix = "  " * max(len(self._lists) - 1, 0) + marker
+        elif tag == "table":
+            self._flush()
+            self._table_rows = 0
+        elif tag == "tr":
+            self._row = []
+        elif tag in ("th", "td"):
+            self._inline = []
+        elif tag in _EMPHASIS:
+            self._inline.append(_EMPHASIS[tag])
+        elif tag == "a":
+            href = _HREF.search(attrs)
+            self._links.append(unescape(next(filter(None, href.groups()), "")) if href else "")
+            self._inline.append("[")
+        elif tag == "br":
+            self._inline.append(" ")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIPPED:
+            self._skip = max(self._skip - 1, 0)
+        elif self._skip:
+            return
+        elif tag in ("th", "td"):
+            if self._row is not None:
+                self._row.append(self._text())
+            self._inline = []
+        elif tag == "tr":
+            self._end_row()
+        elif tag == "table":
+            self._end_row()
+            self.sink.write("\n")
+        elif tag in ("ul", "ol"):
+            self._flush()
+            if self._lists:
+                self._lists.pop()
+            if not self._lists:
+                self.sink.write("\n")
+        elif tag in _EMPHASIS:
+            self._inline.append(_EMPHASIS[tag])
+        elif tag == "a":
+            href = self._links.pop() if self._links else ""
+            self._inline.append(f"]({href.replace(' ', '%20').replace(')', '%29')})")
+        elif tag in _BLOCKS:
+            self._flush()
+
+    def handle_data(self, data: str) -> None:
+        if self._skip or (self._row is not None and not self._inline and not data.strip()):
+            return
+        self._inline.append(_MARKDOWN_SPECIAL.sub(r"\\\g<0>", data))
+
+    def _text(self) -> str:
+        text = " ".join("".join(self._inline).split())
+        self._inline = []
+        return text
+
+    def _flush(self) -> None:
+        """Write the pending block, if it has any text."""
+        text = self._text()
+        prefix, self._prefix = self._prefix, ""
+        if text:
+            # List items are single-spaced; every other block is a paragraph.
+            self.sink.write(f"{prefix}{text}\n" if self._lists else f"{prefix}{text}\n\n")
+
+    def _end_row(self) -> None:
+        if not self._row:
+            self._row = None
+            return
+        self.sink.write(f"| {' | '.join(self._row)} |\n")
+        if self._table_rows == 0:
+            self.sink.write(f"|{' --- |' * len(self._row)}\n")
+        self._table_rows += 1
+        self._row = None
+
+
+def html_to_markdown(html: str, sink: Sink, chunk_size: int = CHUNK_SIZE) -> None:
+    """Convert `html` into `sink`, feeding the parser `chunk_size` characters at a time."""
+    converter = MarkdownConverter(sink)
+    for start in range(0, len(html), chunk_size):
+        converter.feed(html[start:start + chunk_size])
+    converter.close()
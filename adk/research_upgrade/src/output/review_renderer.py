@@ -0,0 +1,161 @@
+"""
+Streaming Literature Review Renderer
+
+`ReviewRenderer` fills the review templates section by section and writes each
+finished chunk straight to a sink: an open file, or a `ChunkSink` that joins
+its chunks once at the end. Nothing is built with repeated string
+concatenation, so rendering is linear in the number of papers, and with a file
+sink memory is bounded by the largest section (or a 64 KiB write block). All interpolated text is HTML
+escaped, and the word count is kept incrementally as chunks are written.
+"""
+from html import escape
+from typing import Any, Iterable, List, Mapping, Optional, Protocol, Sequence
+
+_HEADER = """
+<h1>Systematic Literature Review: {topic}</h1>
+<h2>Executive Summary</h2>
+<p>This automated literature review synthesizes findings from {paper_count} papers on <strong>{topic}</strong>. It includes per-paper summaries, a detailed methodology comparison, trends across years, identified research gaps, and actionable recommendations.</p>
+
+<h2>Key Findings</h2>
+<p>The analysis identified <strong>{most_common_method}</strong> as the most frequently used methodology. Trends and yearly coverage indicate {years_covered} years covered with peak activity in {peak_year}.</p>
+
+<h2>Methodology Comparison</h2>
+<table border="1" cellpadding="6" cellspacing="0"><thead><tr><th>Methodology</th><th>Count</th><th>Percentage</th><th>Avg Relevance</th></tr></thead><tbody>
+"""
+_TABLE_ROW = "<tr><td>{method}</td><td>{count}</td><td>{percentage:.1f}%</td><td>{avg_relevance}</td></tr>"
+_PAPERS_START = "\n</tbody></table>\n\n<h2>Per-paper Summaries</h2>\n"
+_PAPER_HEADING = "<h3>{index}. {title} ({year})</h3><p><em>Authors:</em> {authors}</p>"
+_PAPER_ABSTRACT = "<p><strong>Abstract summary:</strong> {abstract}</p>"
+_PAPER_LINK = "<p><a href=\"{url}\">View Paper</a></p>"
+_CONCLUSION = ("<h2>Conclusion</h2><p>This review provides a synthesized snapshot of the state-of-the-art for {topic}. "
+               "Use the references and per-paper summaries to dive deeper into specific works.</p>")
+ABSTRACT_CHARS = 600
+_FIELD_SEPARATOR = "\x00"
+_BATCH = 1024
+
+
+class Sink(Protocol):
+    def write(self, chunk: str) -> Any: ...
+
+
+class ChunkSink:
+    """In-memory sink: collects chunks and joins them once."""
+
+    def __init__(self):
+        self.chunks: List[str] = []
+
+    def write(self, chunk: str) -> int:
+        self.chunks.append(chunk)
+        return len(chunk)
+
+    def getvalue(self) -> str:
+        return "".join(self.chunks)
+
+
+class _CountingWriter:
+    """Buffers chunks into blocks of about `block_size` characters, counting
+    whitespace-separated words per block before passing it on to the sink."""
+
+    def __init__(self, sink: Sink, block_size: int = 1 << 16):
+        self.sink = sink
+        self.block_size = block_size
+        self.words = 0
+        self._in_word = False
+        self._buffer: List[str] = []
+        self._buffered = 0
+
+    def write(self, chunk: str) -> None:
+        self._buffer.append(chunk)
+        self._buffered += len(chunk)
+        if self._buffered >= self.block_size:
+            self.flush()
+
+    def flush(self) -> None:
+        block = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffered = 0
+        if not block:
+            return
+        words = len(block.split())
+        # A word split across two blocks was counted in both.
+        if words and self._in_word and not block[0].isspace():
+            words -= 1
+        self.words += words
+        self._in_word = not block[-1].isspace()
+        self.sink.write(block)
+
+
+def _escape_all(texts: Sequence[str]) -> List[str]:
+    """HTML-escape several strings with one `escape` call (five replaces) instead of one call each."""
+    joined = _FIELD_SEPARATOR.join(texts)
+    if not texts or joined.count(_FIELD_SEPARATOR) != len(texts) - 1:
+        return [escape(text) for text in texts]
+    return escape(joined).split(_FIELD_SEPARATOR)
+
+
+class ReviewRenderer:
+    """Renders the HTML literature review from the agents' results."""
+
+    def __init__(self, abstract_chars: int = ABSTRACT_CHARS):
+        self.abstract_chars = abstract_chars
+
+    def render(self, sink: Sink, topic: str, analysis: Mapping[str, Any], critique: Mapping[str, Any],
+               papers: Sequence[Mapping[str, Any]], references: Optional[Sequence[str]] = None) -> int:
+        """Write the whole review to `sink`, one section per chunk; returns its word count."""
+        out = _CountingWriter(sink)
+        comparison = analysis.get("methodology_comparison", {})
+        trends = analysis.get("trends_analysis", {})
+        topic = escape(str(topic))
+
+        out.write(_HEADER.format(
+            topic=topic,
+            paper_count=len(papers),
+            most_common_method=escape(str(comparison.get("most_common", "various methods"))),
+            years_covered=escape(str(trends.get("total_years_covered", "N/A"))),
+            peak_year=escape(str(trends.get("peak_year", "N/A"))),
+        ))
+        out.write("".join(_TABLE_ROW.format(
+            method=escape(str(row.get("methodology", "Unknown"))),
+            count=row.get("count", 0),
+            percentage=row.get("percentage", 0),
+            avg_relevance="n/a" if row.get("avg_relevance") is None else f"{row['avg_relevance']:.2f}",
+        ) for row in comparison.get("comparison_table", [])))
+
+        out.write(_PAPERS_START)
+        for index, paper in enumerate(papers, start=1):
+            out.write(self._paper_section(index, paper))
+
+        out.write(self._list("Research Gaps", "ul", critique.get("research_gaps", ["Further empirical studies needed."])))
+        out.write(self._list("Recommendations", "ol",
+                             critique.get("recommendations", ["Broaden datasets, standardize evaluation."])))
+        if references:
+            out.write("<h2>References</h2><ol>")
+            for start in range(0, len(references), _BATCH):
+                batch = _escape_all([str(r) for r in references[start:start + _BATCH]])
+                out.write("".join(f"<li>{reference}</li>" for reference in batch))
+            out.write("</ol>")
+        out.write(_CONCLUSION.format(topic=topic))
+        out.flush()
+        return out.words
+
+    def _paper_section(self, index: int, paper: Mapping[str, Any]) -> str:
+        authors = paper.get("authors")
+        abstract = (paper.get("abstract") or "").strip()
+        if len(abstract) > self.abstract_chars:
+            abstract = abstract[:self.abstract_chars] + "..."
+        title, year, authors, abstract, url = _escape_all([
+            str(paper.get("title") or "Untitled"),
+            str(paper.get("year") or "n.d."),
+            ", ".join(authors) if authors else "Unknown",
+            abstract,
+            paper.get("url") or "",
+        ])
+        section = _PAPER_HEADING.format(index=index, title=title, year=year, authors=authors)
+        if abstract:
+            section += _PAPER_ABSTRACT.format(abstract=abstract)
+        return section + _PAPER_LINK.format(url=url)
+
+    @staticmethod
+    def _list(heading: str, tag: str, items: Iterable[Any]) -> str:
+        entries = "".join(f"<li>{item}</li>" for item in _escape_all([str(item) for item in items]))
+        return f"<h2>{heading}</h2><{tag}>\n{entries}</{tag}>\n"
@@ -1,107 +1,161 @@
 """
-External Tool: ArXiv API (lazy import and graceful degradation)
+External Tool: ArXiv API (async, paginated)
 
-This module defers importing the external `arxiv` package so the project can be
-imported even if `feedparser`/`arxiv` aren't available in the environment
-(common for Python 3.13 where some stdlib modules were removed). When the
-dependency is missing the tool returns an empty list and logs a warning.
+Queries the public export API (export.arxiv.org) through the workflow's shared
+async HTTP client. Result pages are requested concurrently, but request starts
+are spaced by a rate limiter to respect arXiv's politeness policy (one request
+every three seconds by default). Papers are exposed as an async generator so
+callers can consume the first page while later pages are still in flight;
+`iter_ranked` pairs each paper with its position in arXiv's relevance order,
+since pages can arrive out of order.
+
+The `arxiv` client library is no longer used here: its `results()` iterator is
+blocking and would stall the event loop.
 """
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+import asyncio
 import logging
+import xml.etree.ElementTree as ET
+
+from .http_client import AsyncHTTPClient, HTTPError
+from .rate_limiter import RateLimiter
+from src.monitoring import tracing
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BASE_URL = "https://export.arxiv.org/api/query"
+
+ATOM_NS = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'opensearch': 'http://a9.com/-/spec/opensearch/1.1/',
+    'arxiv': 'http://arxiv.org/schemas/atom',
+}
+
+
 class ArXivTool:
-    """Tool for searching ArXiv research papers with graceful fallback."""
+    """Tool for searching ArXiv research papers without blocking the event loop."""
 
-    def __init__(self, max_results: int = 100):
+    def __init__(self, max_results: int = 100, http_client: Optional[AsyncHTTPClient] = None,
+                 page_size: int = 100, page_concurrency: int = 3, request_interval: float = 3.0,
+                 cache=None, base_url: str = DEFAULT_BASE_URL):
         self.max_results = max_results
-        self._available = False
-        self._client = None
-        # Do NOT attempt to import the `arxiv` package at module import time.
-        # Some environments (e.g., Python 3.13) remove stdlib modules used by
-        # `feedparser` and others, causing import-time failures. We will attempt
-        # to import `arxiv` only when a search is requested and otherwise use
-        # the HTTP fallback implementation.
-        self._arxiv = None
+        self.cache = cache
+        self.base_url = base_url
+        self.page_size = max(1, page_size)
+        self.page_concurrency = max(1, page_concurrency)
+        self.http_client = http_client or AsyncHTTPClient()
+        self.rate_limiter = RateLimiter.from_interval(request_interval)
 
     async def search(self, query: str, max_results: Optional[int] = None) -> List[Dict[str, Any]]:
+        """All results, in relevance order."""
+        ranked = [item async for item in self.iter_ranked(query, max_results)]
+        return [paper for _, paper in sorted(ranked, key=lambda item: item[0])]
+
+    async def iter_search(self, query: str, max_results: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield papers as their result pages arrive (not necessarily in page order)."""
+        async for _, paper in self.iter_ranked(query, max_results):
+            yield paper
+
+    async def iter_ranked(self, query: str, max_results: Optional[int] = None) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Yield `(rank, paper)` as result pages arrive; `rank` is the paper's 0-based
+        position in arXiv's relevance order.
+
+        Served from the search cache when warm. Otherwise the first page is
+        fetched alone to learn `totalResults`; the remaining pages are then
+        fetched concurrently (bounded by `page_concurrency` and the rate
+        limiter). Failed pages are logged and skipped, and a result set with
+        failed pages is not cached. The cache gets results in rank order, so a
+        cached larger limit can answer a smaller one with the true top results.
+        """
         max_results = max_results or self.max_results
-        # On first search attempt, try to import the `arxiv` client. If the
-        # import fails (environment incompatibility or missing package), fall
-        # back to the HTTP API.
-        if not self._available and self._arxiv is None:
-            try:
-                import arxiv as _arxiv
-                self._arxiv = _arxiv
-                self._client = _arxiv.Client()
-                self._available = True
-            except Exception as e:
-                # Import failed; use HTTP fallback for this and subsequent calls.
-                # Log a concise debug message when the fallback is activated so
-                # normal INFO logs stay clean for users who don't want to see
-                # this compatibility detail.
-                logger.debug(f"ArXiv library import failed; using HTTP fallback ({e})")
-                self._available = False
-
-        if not self._available:
-            # Fallback: use the public arXiv HTTP API (export.arxiv.org) to fetch results
-            try:
-                return await self._http_fallback_search(query, max_results)
-            except Exception as e:
-                logger.debug(f"ArXiv fallback search failed: {e}")
-                return []
+        if self.cache is not None:
+            cached = self.cache.get("arxiv", query, max_results)
+            tracing.annotate(cache_hit=cached is not None)
+            if cached is not None:
+                for item in enumerate(cached):
+                    yield item
+                return
+
+        collected: Dict[int, Dict[str, Any]] = {}
+        status = {"complete": True}
+        async for rank, paper in self._iter_pages(query, max_results, status):
+            collected[rank] = paper
+            yield rank, paper
+        if self.cache is not None and status["complete"]:
+            self.cache.set("arxiv", query, max_results, [collected[rank] for rank in sorted(collected)])
 
+    async def _iter_pages(self, query: str, max_results: int,
+                          status: Dict[str, bool]) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        first_size = min(self.page_size, max_results)
+        first = await self._fetch_page(query, 0, first_size)
+        if first is None:
+            status["complete"] = False
+            return
+        entries, total = first
+        for item in enumerate(entries):
+            yield item
+
+        limit = min(max_results, total) if total is not None else max_results
+        if len(entries) < first_size or limit <= first_size:
+            return
+
+        starts = range(first_size, limit, self.page_size)
+        semaphore = asyncio.Semaphore(self.page_concurrency)
+
+        async def bounded(start: int):
+            async with semaphore:
+                return start, await self._fetch_page(query, start, min(self.page_size, limit - start))
+
+        pending = [asyncio.ensure_future(bounded(start)) for start in starts]
         try:
-            search = self._arxiv.Search(
-                query=query,
-                max_results=max_results,
-                sort_by=self._arxiv.SortCriterion.Relevance
-            )
-            papers = []
-            if self._client is None:
-                return []
-            for result in self._client.results(search):
-                paper = {
-                    "title": getattr(result, 'title', None),
-                    "authors": [getattr(author, 'name', None) for author in getattr(result, 'authors', [])],
-                    "abstract": getattr(result, 'summary', ''),
-                    "year": str(getattr(getattr(result, 'published', ''), 'year', '')),
-                    "url": getattr(result, 'entry_id', ''),
-                    "pdf_url": getattr(result, 'pdf_url', None),
-                    "source": "arxiv"
-                }
-                papers.append(paper)
-            return papers
-        except Exception as e:
-            logger.debug(f"ArXiv search error: {str(e)}")
-            return []
-
-    async def _http_fallback_search(self, query: str, max_results: int) -> List[Dict[str, Any]]:
-        """Query arXiv via the export API and parse XML using the stdlib.
-
-        Example API: http://export.arxiv.org/api/query?search_query=all:quantum+computing&start=0&max_results=5
-        """
-        import requests
-        import xml.etree.ElementTree as ET
-        from urllib.parse import quote_plus
-
-        base = "http://export.arxiv.org/api/query"
-        q = quote_plus(query)
-        url = f"{base}?search_query=all:{q}&start=0&max_results={max_results}"
-        resp = requests.get(url, timeout=15)
-        resp.raise_for_status()
-        text = resp.text
-
-        # Parse minimal XML to extract entries
+            for next_done in asyncio.as_completed(pending):
+                start, page = await next_done
+                if page is None:
+                    status["complete"] = False
+                    continue
+                for offset, paper in enumerate(page[0]):
+                    yield start + offset, paper
+        finally:
+            # Consumer stopped early (or failed): don't leave page fetches running.
+            for task in pending:
+                task.cancel()
+
+    async def _fetch_page(self, query: str, start: int, max_results: int):
+        """Return `(papers, total_results)` for one page, or None if the page failed."""
+        params = {
+            'search_query': f"all:{query}",
+            'start': start,
+            'max_results': max_results,
+            'sortBy': 'relevance',
+        }
+        await self.rate_limiter.acquire()
+        try:
+            response = await self.http_client.get(self.base_url, params=params)
+            response.raise_for_status()
+            # XML parsing of large pages is CPU-bound; keep it off the event loop.
+            return await asyncio.to_thread(self._parse_feed, response.text)
+        except (HTTPError, ET.ParseError) as e:
+            logger.debug(f"ArXiv page start={start} failed: {e}")
+            return None
+
+    @staticmethod
+    def _parse_feed(text: str):
+        """Parse an Atom feed from the export API using the stdlib."""
         root = ET.fromstring(text)
-        ns = {'atom': 'http://www.w3.org/2005/Atom'}
+        ns = ATOM_NS
+        total_el = root.find('opensearch:totalResults', ns)
+        try:
+            total = int(total_el.text) if total_el is not None and total_el.text else None
+        except ValueError:
+            total = None
+
         entries = []
         for entry in root.findall('atom:entry', ns):
             title_el = entry.find('atom:title', ns)
             summary_el = entry.find('atom:summary', ns)
             published_el = entry.find('atom:published', ns)
             idn = entry.find('atom:id', ns)
+            doi_el = entry.find('arxiv:doi', ns)
             authors = []
             for a in entry.findall('atom:author', ns):
                 name_el = a.find('atom:name', ns)
@@ -115,6 +169,7 @@ class ArXivTool:
             title_text = (title_el.text or '').strip() if title_el is not None else None
             summary_text = (summary_el.text or '').strip() if summary_el is not None else ''
             year_text = (published_el.text or '')[:4] if published_el is not None and published_el.text else ''
+            doi_text = (doi_el.text or '').strip() if doi_el is not None else ''
             entries.append({
                 'title': title_text,
                 'authors': authors,
@@ -122,6 +177,7 @@ class ArXivTool:
                 'year': year_text,
                 'url': idn.text if idn is not None and idn.text else '',
                 'pdf_url': pdf_url,
+                'doi': doi_text or None,
                 'source': 'arxiv'
             })
-        return entries
\ No newline at end of file
+        return entries, total
@@ -0,0 +1,142 @@
+"""
+Hashed BM25 index
+
+`BM25Index` scores documents (paper titles and abstracts) against free-text
+queries entirely offline. Terms are lowercased alphanumeric tokens, hashed
+with CRC32 into a fixed number of buckets (sized from the corpus vocabulary
+unless given), so the index keeps no vocabulary and queries hash their own
+terms.
+
+Building tokenizes a few thousand documents at a time as one string (one
+`translate`, one `split`), filters stopwords per distinct term rather than per
+token, and sorts the combined (bucket, document) keys once in place; runs of
+equal keys give the term frequencies. The result is an inverted index in CSR
+form: postings for bucket `b` are `docs[indptr[b]:indptr[b + 1]]`. A query
+only touches the postings of its own buckets, and `np.bincount` accumulates
+the BM25 contributions per document. The cost is O(query postings), not O(corpus).
+"""
+import string
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_DOC_SEPARATOR = "\x00"
+# ASCII punctuation and control characters become spaces; letters, digits and the separator survive.
+_SEPARATORS = str.maketrans({c: " " for c in map(chr, range(128))
+                             if c not in string.ascii_lowercase + string.digits + _DOC_SEPARATOR})
+_QUERY_SEPARATORS = {**_SEPARATORS, ord(_DOC_SEPARATOR): " "}
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were "
+    "which with we our their these those using based via into than then also can".split()
+)
+# Never stopwords: dropping them would make "X does not use Y" match "X uses Y".
+NEGATIONS = frozenset({"not", "no", "never", "without", "nor", "cannot"})
+
+
+def _is_term(token: str) -> bool:
+    return len(token) > 1 and token not in STOPWORDS
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return [t for t in text.lower().translate(_QUERY_SEPARATORS).split() if _is_term(t)] if text else []
+
+
+class BM25Index:
+    """Immutable inverted index over hashed terms, with Okapi BM25 scoring."""
+
+    def __init__(self, documents: Sequence[Optional[str]], n_features: Optional[int] = None,
+                 k1: float = 1.2, b: float = 0.75, chunk_size: int = 2048):
+        self.k1 = k1
+        self.b = b
+        self.n_docs = len(documents)
+
+        # Tokenize in chunks of documents, one string per chunk: every document is
+        # preceded by a separator token, each distinct token gets an int id (the
+        # separator is id 0), and the separators' running count gives every token
+        # its document. Chunking bounds the number of live token strings.
+        term_ids: Dict[str, int] = {_DOC_SEPARATOR: 0}
+        chunks: List[np.ndarray] = []
+        for start in range(0, self.n_docs, chunk_size):
+            text = "".join(_DOC_SEPARATOR + (d or "").replace(_DOC_SEPARATOR, " ")
+                           for d in documents[start:start + chunk_size])
+            tokens = text.lower().translate(_SEPARATORS).replace(_DOC_SEPARATOR, f" {_DOC_SEPARATOR} ").split()
+            for term in dict.fromkeys(tokens):
+                term_ids.setdefault(term, len(term_ids))
+            chunks.append(np.fromiter(map(term_ids.__getitem__, tokens), dtype=np.int32, count=len(tokens)))
+        ids = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int32)
+        del chunks
+        doc_of_token = np.cumsum(ids == 0, dtype=np.int32) - 1
+        keep = np.fromiter((_is_term(t) for t in term_ids), dtype=bool, count=len(term_ids))[ids]
+        ids, doc_of_token = ids[keep], doc_of_token[keep]
+        lengths = np.bincount(doc_of_token, minlength=self.n_docs)
+
+        # Without an explicit size, ~4 buckets per distinct term keeps collisions rare.
+        self.n_features = n_features or min(2 ** 20, 1 << max(10, (4 * len(term_ids) - 1).bit_length()))
+        term_buckets = np.fromiter((self._bucket(t) for t in term_ids), dtype=np.int64, count=len(term_ids))
+
+        # Postings sorted by (bucket, doc); the run length of each key is the term
+        # frequency. Built in place rather than with np.unique, which copies twice.
+        keys = term_buckets[ids]
+        del ids
+        keys *= max(self.n_docs, 1)
+        keys += doc_of_token
+        del doc_of_token
+        keys.sort()
+        run_starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1]))) if len(keys) else np.empty(0, dtype=np.int64)
+        tf = np.diff(np.append(run_starts, len(keys)))
+        keys = keys[run_starts]
+        self.docs = (keys % max(self.n_docs, 1)).astype(np.int32)
+        df = np.bincount(keys // max(self.n_docs, 1), minlength=self.n_features)
+        self.indptr = np.zeros(self.n_features + 1, dtype=np.int64)
+        np.cumsum(df, out=self.indptr[1:])
+        self.idf = np.log1p((self.n_docs - df + 0.5) / (df + 0.5))
+
+        self.doc_lengths = lengths
+        avgdl = lengths.mean() if self.n_docs and lengths.any() else 1.0
+        # Per-posting BM25 denominator term, precomputed so a query is a gather plus a bincount.
+        norm = self.k1 * (1.0 - self.b + self.b * lengths / avgdl)
+        self._weights = tf * (self.k1 + 1.0) / (tf + norm[self.docs])
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+    def _bucket(self, term: str) -> int:
+        return zlib.crc32(term.encode("utf-8")) % self.n_features
+
+    def query_buckets(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """`(buckets, counts)` of the query's terms; repeated terms weigh more."""
+        buckets = np.fromiter((self._bucket(t) for t in tokenize(query)), dtype=np.int64)
+        return np.unique(buckets, return_counts=True)
+
+    def score(self, query: str) -> np.ndarray:
+        """BM25 score of every document against `query` (float64, length `n_docs`)."""
+        return self.match(query)[0]
+
+    def match(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """`(scores, coverage)` per document: BM25 score, and the fraction of the
+        query's distinct term buckets that occur in the document. Buckets can
+        collide, so coverage is an upper bound on the fraction of terms."""
+        buckets, counts = self.query_buckets(query)
+        if not len(buckets) or not self.n_docs:
+            return np.zeros(self.n_docs), np.zeros(self.n_docs)
+        # Each bucket's postings are a contiguous slice: concatenating slices beats a fancy-index gather.
+        bounds = list(zip(self.indptr[buckets].tolist(), self.indptr[buckets + 1].tolist()))
+        query_weights = (self.idf[buckets] * counts).tolist()
+        docs = np.concatenate([self.docs[a:b] for a, b in bounds])
+        contributions = np.concatenate([self._weights[a:b] * w for (a, b), w in zip(bounds, query_weights)])
+        # Each (bucket, doc) posting is unique, so counting postings per doc counts distinct terms.
+        coverage = np.bincount(docs, minlength=self.n_docs) / len(buckets)
+        return np.bincount(docs, weights=contributions, minlength=self.n_docs), coverage
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the `k` highest scores, best first; ties keep index order."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    # Partition finds the k-th best score in O(n); ties at that score are resolved by index.
+    kth = -np.partition(-scores, k - 1)[k - 1]
+    above = np.flatnonzero(scores > kth)
+    selected = np.concatenate([above, np.flatnonzero(scores == kth)[:k - len(above)]])
+    return selected[np.lexsort((selected, -scores[selected]))]
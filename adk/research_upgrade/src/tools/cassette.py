@@ -0,0 +1,122 @@
+"""
+HTTP Record/Replay Cassettes
+
+A cassette is a JSON file of recorded GET interactions (request path and query
+parameters, response status, selected headers and body). In `record` mode the
+shared `AsyncHTTPClient` performs real requests and saves every final response;
+in `replay` mode it answers from the cassette without touching the network, so
+retrieval can be benchmarked and regression-tested offline and reproducibly.
+
+Requests are matched on method, URL path and sorted query parameters only. The
+host is ignored, so one cassette replays against the real base URLs, a local
+stand-in server or any mirror. Request headers (API keys) are never stored.
+"""
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .http_client import HTTPError, HTTPResponse
+
+CASSETTE_VERSION = 1
+MODES = ("off", "record", "replay")
+
+# Response headers worth keeping; everything else is connection noise.
+_KEPT_HEADERS = ("content-type", "retry-after")
+
+_Key = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+def request_key(method: str, url: str, params: Optional[Dict[str, Any]] = None) -> _Key:
+    """Match key for a request: method, URL path and sorted stringified params."""
+    path = urlsplit(url).path or "/"
+    return method.upper(), path, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+
+
+class Cassette:
+    """In-memory set of recorded interactions, loaded from and saved to one JSON file."""
+
+    def __init__(self, path: str, mode: str = "replay"):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}; expected one of {MODES}")
+        self.path = Path(path)
+        self.mode = mode
+        self.plays = 0
+        self.records = 0
+        self._interactions: Dict[_Key, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.path.exists():
+            self.load()
+        elif mode == "replay":
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["Cassette"]:
+        if settings.http_cassette_mode == "off" or not settings.http_cassette_path:
+            return None
+        return cls(settings.http_cassette_path, mode=settings.http_cassette_mode)
+
+    def load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        if payload.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version: {payload.get('version')}")
+        for item in payload.get("interactions", []):
+            request = item["request"]
+            key = request_key(request["method"], request["path"], request.get("params"))
+            self._interactions[key] = item["response"]
+
+    def save(self) -> str:
+        """Atomically write all interactions, sorted so re-recording gives stable diffs."""
+        with self._lock:
+            interactions = [
+                {"request": {"method": method, "path": path, "params": dict(params)}, "response": response}
+                for (method, path, params), response in sorted(self._interactions.items())
+            ]
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": CASSETTE_VERSION, "interactions": interactions}, f, indent=1)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return str(self.path)
+
+    def record(self, method: str, url: str, params: Optional[Dict[str, Any]], response: HTTPResponse) -> None:
+        headers = {k.lower(): v for k, v in response.headers.items() if k.lower() in _KEPT_HEADERS}
+        with self._lock:
+            self._interactions[request_key(method, url, params)] = {
+                "status": response.status, "headers": headers, "body": response.text,
+            }
+            self.records += 1
+            self._dirty = True
+
+    def play(self, method: str, url: str, params: Optional[Dict[str, Any]] = None) -> HTTPResponse:
+        """Return the recorded response; an unrecorded request raises `HTTPError`."""
+        recorded = self._interactions.get(request_key(method, url, params))
+        if recorded is None:
+            raise HTTPError(f"No recorded interaction for {method} {url} {params or {}}", url=url)
+        self.plays += 1
+        return HTTPResponse(status=recorded["status"], text=recorded["body"], url=url,
+                            headers=dict(recorded.get("headers") or {}))
+
+    def find(self, method: str, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        return self._interactions.get(request_key(method, path, params))
+
+    def responses(self, path_suffix: str = "") -> List[Dict[str, Any]]:
+        """Recorded responses whose request path ends with `path_suffix`."""
+        return [resp for (_, path, _), resp in self._interactions.items() if path.endswith(path_suffix)]
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def __len__(self) -> int:
+        return len(self._interactions)
@@ -1,36 +1,155 @@
 """
 Custom Tool: Citation Generator
+
+Formats BibTeX and APA citations in one pass per paper. Citation keys are
+`<first author's last name><year><first title word>`, built with precompiled
+patterns; a `CitationKeys` allocator makes them unique in arrival order (the
+second `smith2024deep` becomes `smith2024deepa`, then `smith2024deepb`, ...),
+so the same paper list always yields the same keys. `write_citations` /
+`export_citations` (and `CitationWriter`, for papers that arrive one at a
+time) stream entries straight to .bib / APA files for bibliographies too large
+to hold as strings; `Settings.stream_citations` turns this on for a workflow.
 """
+import asyncio
 import re
-from typing import Dict, List
+from contextlib import ExitStack
+from string import ascii_lowercase
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+_NON_ALPHA = re.compile(r"[^a-z]+")
+_FIRST_WORD = re.compile(r"\w+", re.UNICODE)
+_DIGITS = re.compile(r"\d+")
+
+
+def _suffix(n: int) -> str:
+    """1 -> a, 26 -> z, 27 -> aa, ... (bijective base 26)."""
+    letters = []
+    while n:
+        n, r = divmod(n - 1, 26)
+        letters.append(ascii_lowercase[r])
+    return "".join(reversed(letters))
+
+
+class CitationKeys:
+    """Hands out unique citation keys in arrival order."""
+
+    def __init__(self):
+        self._used: Set[str] = set()
+        self._next: Dict[str, int] = {}
+
+    def allocate(self, base: str) -> str:
+        if base not in self._used:
+            self._used.add(base)
+            return base
+        # Resume from the base's last suffix, so n duplicates cost O(n), not O(n^2).
+        # A suffixed key can itself be another paper's base key, so skip used ones.
+        n = self._next.get(base, 1)
+        key = base + _suffix(n)
+        while key in self._used:
+            n += 1
+            key = base + _suffix(n)
+        self._next[base] = n + 1
+        self._used.add(key)
+        return key
+
+
+class CitationWriter:
+    """Appends citations to a .bib and/or an APA file as they are produced."""
+
+    def __init__(self, bibtex_path: Optional[str] = None, apa_path: Optional[str] = None):
+        self._stack = ExitStack()
+        self.bib = self._stack.enter_context(open(bibtex_path, "w", encoding="utf-8")) if bibtex_path else None
+        self.refs = self._stack.enter_context(open(apa_path, "w", encoding="utf-8")) if apa_path else None
+        self.written = 0
+
+    def write(self, entry: str, reference: str) -> None:
+        if self.bib:
+            self.bib.write(entry)
+            self.bib.write("\n\n")
+        if self.refs:
+            self.refs.write(reference)
+            self.refs.write("\n")
+        self.written += 1
+
+    def close(self) -> None:
+        self._stack.close()
+
+    def __enter__(self) -> "CitationWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
 
 class CitationGeneratorTool:
     """Generates academic citations in BibTeX and APA formats."""
-    
-    def _generate_citation_key(self, authors: List[str], year: str, title: str) -> str:
-        if not authors:
-            author_part = "unknown"
-        else:
-            first_author_last_name = authors[0].split()[-1]
-            author_part = re.sub(r'[^a-zA-Z]', '', first_author_last_name).lower()
-        
-        title_first_word = re.sub(r'[^a-zA-Z]', '', title.split()[0]).lower()
-        return f"{author_part}{year}{title_first_word}"
+
+    @staticmethod
+    def _generate_citation_key(authors: List[str], year: Any, title: Optional[str]) -> str:
+        last_name = authors[0].split()[-1] if authors and authors[0].strip() else ""
+        author_part = _NON_ALPHA.sub("", last_name.lower()) or "unknown"
+        year_part = "".join(_DIGITS.findall(str(year or "")))
+        title_word = _FIRST_WORD.search(title or "")
+        title_part = _NON_ALPHA.sub("", title_word.group().lower()) if title_word else ""
+        return f"{author_part}{year_part}{title_part}"
+
+    def format_paper(self, paper: Mapping[str, Any], keys: Optional[CitationKeys] = None) -> Tuple[str, str]:
+        """`(bibtex, apa)` for one paper; `keys` de-duplicates keys across calls."""
+        authors = paper.get("authors") or []
+        year = paper.get("year") or "N/A"
+        title = paper.get("title") or "No Title"
+        cite_key = self._generate_citation_key(authors, paper.get("year"), paper.get("title"))
+        if keys is not None:
+            cite_key = keys.allocate(cite_key)
+        bibtex = (f"@article{{{cite_key},\n"
+                  f"  author = {{{' and '.join(authors)}}},\n"
+                  f"  title = {{{title}}},\n"
+                  f"  year = {{{year}}}\n"
+                  f"}}")
+        apa = f"{', '.join(authors)} ({year}). {title}."
+        return bibtex, apa
+
+    def iter_citations(self, papers: Iterable[Mapping[str, Any]],
+                       keys: Optional[CitationKeys] = None) -> Iterator[Tuple[str, str]]:
+        keys = keys if keys is not None else CitationKeys()
+        for paper in papers:
+            yield self.format_paper(paper, keys)
+
+    def cite_all(self, papers: Iterable[Mapping[str, Any]]) -> Dict[str, Any]:
+        """Synchronous batch: one pass over `papers`, keys unique within the batch."""
+        bibtex: List[str] = []
+        apa: List[str] = []
+        for entry, reference in self.iter_citations(papers):
+            bibtex.append(entry)
+            apa.append(reference)
+        return {"bibtex": bibtex, "apa": apa, "count": len(apa)}
+
+    def write_citations(self, papers: Iterable[Mapping[str, Any]], bibtex_path: Optional[str] = None,
+                        apa_path: Optional[str] = None) -> int:
+        """Stream every citation to `bibtex_path` and/or `apa_path`; returns the number written.
+
+        Only one paper's strings are alive at a time, so memory stays flat however
+        long `papers` (which may be a generator) is.
+        """
+        with CitationWriter(bibtex_path, apa_path) as writer:
+            for entry, reference in self.iter_citations(papers):
+                writer.write(entry, reference)
+        return writer.written
 
     async def generate_bibtex(self, paper: Dict) -> str:
-        cite_key = self._generate_citation_key(paper.get('authors', []), paper.get('year', '2024'), paper.get('title', ''))
-        authors = ' and '.join(paper.get('authors', []))
-        return f"""@article{{{cite_key},
-  author = {{{authors}}},
-  title = {{{paper.get('title', 'No Title')}}},
-  year = {{{paper.get('year', 'N/A')}}}
-}}"""
+        return self.format_paper(paper)[0]
 
     async def generate_apa(self, paper: Dict) -> str:
-        authors = ', '.join(paper.get('authors', []))
-        return f"{authors} ({paper.get('year', 'N/A')}). {paper.get('title', 'No Title')}."
-    
+        return self.format_paper(paper)[1]
+
+    async def generate_citation(self, paper: Dict, keys: Optional[CitationKeys] = None) -> Tuple[str, str]:
+        """BibTeX and APA strings for a single paper (used by the streaming pipeline)."""
+        return self.format_paper(paper, keys)
+
     async def generate_citations_batch(self, papers: List[Dict]) -> Dict:
-        bibtex = [await self.generate_bibtex(p) for p in papers]
-        apa = [await self.generate_apa(p) for p in papers]
-        return {"bibtex": bibtex, "apa": apa, "count": len(papers)}
\ No newline at end of file
+        """Citations for every paper; the formatting runs off the event loop."""
+        return await asyncio.to_thread(self.cite_all, papers)
+
+    async def export_citations(self, papers: Iterable[Mapping[str, Any]], bibtex_path: Optional[str] = None,
+                               apa_path: Optional[str] = None) -> int:
+        return await asyncio.to_thread(self.write_citations, papers, bibtex_path, apa_path)
@@ -0,0 +1,171 @@
+"""
+Cross-source paper deduplication index
+
+The same paper often comes back from both arXiv and Semantic Scholar with small
+differences in case, whitespace, punctuation or a trailing version marker.
+`PaperDedupIndex` collapses those into one canonical record:
+
+1. Exact keys: normalized DOI, arXiv ID (version stripped) and normalized title.
+2. Near-duplicates: MinHash signatures over character shingles of the title,
+   bucketed with LSH banding; candidates are confirmed by exact Jaccard.
+
+Metadata from duplicates is merged into the canonical record by filling fields
+the canonical copy is missing (e.g. the DOI from Semantic Scholar and the
+`pdf_url` from arXiv). Each `add` costs O(shingles x permutations) plus a few
+dict lookups, so indexing stays roughly linear in the number of papers.
+"""
+import re
+import unicodedata
+import zlib
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+_ARXIV_ID = re.compile(r"arxiv\.org/(?:abs|pdf)/([^\s?#]+?)(?:v\d+)?(?:\.pdf)?$", re.IGNORECASE)
+_VERSION_SUFFIX = re.compile(r"v\d+$")
+_DOI_PREFIX = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:)", re.IGNORECASE)
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_TRAILING_VERSION = re.compile(r"(?:\s+v(?:ersion)?\s*\d+)+$")
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+
+def normalize_title(title: Optional[str]) -> str:
+    """Lowercase, strip accents/punctuation, collapse whitespace, drop a trailing version."""
+    if not title:
+        return ""
+    text = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode("ascii").lower()
+    text = _NON_ALNUM.sub(" ", text).strip()
+    return _TRAILING_VERSION.sub("", text)
+
+
+def normalize_doi(doi: Optional[str]) -> str:
+    return _DOI_PREFIX.sub("", doi.strip()).lower() if doi else ""
+
+
+def extract_arxiv_id(paper: Dict[str, Any]) -> str:
+    """Return the version-less arXiv ID from an explicit field or an arxiv.org URL."""
+    explicit = paper.get("arxiv_id")
+    if explicit:
+        return _VERSION_SUFFIX.sub("", str(explicit).strip().lower())
+    for field in ("url", "pdf_url"):
+        match = _ARXIV_ID.search(paper.get(field) or "")
+        if match:
+            return match.group(1).lower()
+    return ""
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+class PaperDedupIndex:
+    """Incremental index that maps every added paper to a canonical merged record."""
+
+    # 16 bands of 8 rows put the LSH threshold near 0.7, just under
+    # `similarity_threshold`. Wider bands flag topic-alike titles (Jaccard
+    # 0.3-0.5) as candidates and make indexing a coherent corpus quadratic.
+    def __init__(self, similarity_threshold: float = 0.8, num_perm: int = 128, bands: int = 16,
+                 shingle_size: int = 3, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.similarity_threshold = similarity_threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hash family: ((a * x + b) mod 2^64) >> 32 with odd `a`.
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+        self.papers: List[Dict[str, Any]] = []
+        self.duplicates = 0
+        self._keys: Dict[str, int] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self._shingles: List[Set[int]] = []
+
+    def __len__(self) -> int:
+        return len(self.papers)
+
+    def _exact_keys(self, paper: Dict[str, Any], title: str) -> List[str]:
+        keys = []
+        doi = normalize_doi(paper.get("doi"))
+        if doi:
+            keys.append(f"doi:{doi}")
+        arxiv_id = extract_arxiv_id(paper)
+        if arxiv_id:
+            keys.append(f"arxiv:{arxiv_id}")
+        if title:
+            keys.append(f"title:{title}")
+        elif paper.get("url"):
+            keys.append(f"url:{paper['url']}")
+        return keys
+
+    def _shingle(self, title: str) -> Set[int]:
+        text = title.replace(" ", "")
+        k = self.shingle_size
+        if len(text) <= k:
+            return {zlib.crc32(text.encode())} if text else set()
+        return {zlib.crc32(text[i:i + k].encode()) for i in range(len(text) - k + 1)}
+
+    def _band_keys(self, shingles: Set[int]) -> List[Tuple[int, bytes]]:
+        x = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        hashed = ((x[:, None] * self._a[None, :] + self._b[None, :]) >> np.uint64(32)) & _MASK32
+        signature = hashed.min(axis=0).astype(np.uint32)
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def _merge(self, target: Dict[str, Any], paper: Dict[str, Any]) -> None:
+        for field, value in paper.items():
+            if _is_empty(target.get(field)) and not _is_empty(value):
+                target[field] = value
+        source = paper.get("source")
+        sources = target.setdefault("sources", [target.get("source")] if target.get("source") else [])
+        if source and source not in sources:
+            sources.append(source)
+
+    def _fuzzy_match(self, shingles: Set[int], band_keys: List[Tuple[int, bytes]]) -> Optional[int]:
+        seen: Set[int] = set()
+        for band_key in band_keys:
+            for candidate in self._buckets.get(band_key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                other = self._shingles[candidate]
+                if other and len(shingles & other) / len(shingles | other) >= self.similarity_threshold:
+                    return candidate
+        return None
+
+    def add(self, paper: Dict[str, Any]) -> Tuple[Optional[int], bool]:
+        """Index `paper`; return `(canonical_id, is_new)`, or `(None, False)` if it has no identity."""
+        title = normalize_title(paper.get("title"))
+        keys = self._exact_keys(paper, title)
+        if not keys:
+            return None, False
+
+        match = next((self._keys[k] for k in keys if k in self._keys), None)
+        shingles: Set[int] = set()
+        band_keys: List[Tuple[int, bytes]] = []
+        if match is None and title:
+            # Shingles and band keys are only needed to fuzzy-match or index a new paper.
+            shingles = self._shingle(title)
+            band_keys = self._band_keys(shingles) if shingles else []
+            match = self._fuzzy_match(shingles, band_keys)
+
+        if match is not None:
+            self._merge(self.papers[match], paper)
+            for key in keys:
+                self._keys.setdefault(key, match)
+            self.duplicates += 1
+            return match, False
+
+        pid = len(self.papers)
+        record = dict(paper)
+        if record.get("source"):
+            record["sources"] = [record["source"]]
+        self.papers.append(record)
+        self._shingles.append(shingles)
+        for key in keys:
+            self._keys[key] = pid
+        for band_key in band_keys:
+            self._buckets.setdefault(band_key, []).append(pid)
+        return pid, True
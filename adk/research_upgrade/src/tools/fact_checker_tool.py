@@ -1,17 +1,99 @@
 """
 Custom Tool: Fact Checker
+
+Verifies claims offline against the retrieved papers. Every abstract is split
+into sentence passages, and one `BM25Index` is built over all of them per
+`check_claims` call. Each claim is then a single index lookup: the top-scoring
+passages are its evidence, and its confidence is the best fraction of the
+claim's content terms that one evidence passage actually contains (checked on
+the tokens, not the index's hash buckets; negations and auxiliaries like "do"
+are not content terms). A passage whose negation differs from the claim's
+("do not use" vs "use") contradicts it: it never counts towards confidence, and
+one that covers the claim at least as well as any supporting passage, and at
+least up to the threshold, refutes the claim.
 """
-from typing import Dict, List, Any
+import asyncio
+import re
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+from src.tools.bm25_index import NEGATIONS, BM25Index, tokenize, top_k
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+# "doesn't" tokenizes to "doesn" "t"; catch contractions on the raw text.
+_NEGATED_CONTRACTION = re.compile(r"n['’]t\b", re.I)
+# Auxiliaries carry the negation, not the subject; with the negations they are
+# left out of coverage, so "X do not use Y" is not matched by "Z do not use Y".
+_FUNCTION_WORDS = frozenset({"do", "does", "did", "don", "doesn", "didn", "isn", "aren", "wasn", "weren",
+                             "been", "being", "will", "would", "should", "could", "may", "might", "must"})
+
+
+def _negated(text: str, terms: Sequence[str]) -> bool:
+    return any(t in NEGATIONS for t in terms) or bool(_NEGATED_CONTRACTION.search(text))
+
 
 class FactCheckerTool:
     """Validates factual claims against source documents."""
-    
+
+    def __init__(self, threshold: float = 0.8, evidence_per_claim: int = 3):
+        self.threshold = threshold
+        self.evidence_per_claim = evidence_per_claim
+
+    @classmethod
+    def from_settings(cls, settings) -> "FactCheckerTool":
+        return cls(threshold=settings.fact_check_threshold)
+
+    @staticmethod
+    def passages(sources: Sequence[Mapping[str, Any]]) -> Tuple[List[str], List[int]]:
+        """Sentences of every abstract (the title when there is none), with the source each came from."""
+        texts: List[str] = []
+        owners: List[int] = []
+        for i, source in enumerate(sources):
+            abstract = (source.get("abstract") or "").strip()
+            sentences = [s for s in _SENTENCE_END.split(abstract) if s] if abstract else [source.get("title") or ""]
+            texts.extend(sentences)
+            owners.extend([i] * len(sentences))
+        return texts, owners
+
+    def verify(self, claims: Sequence[str], sources: Sequence[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """Synchronous batch check: one index build, then one lookup per claim."""
+        texts, owners = self.passages(sources)
+        index = BM25Index(texts)
+        results = []
+        for claim in claims:
+            terms = tokenize(claim)
+            distinct = set(terms) - NEGATIONS - _FUNCTION_WORDS
+            negated = _negated(claim, terms)
+            scores = index.score(claim)
+            evidence = []
+            for p in top_k(scores, self.evidence_per_claim):
+                if scores[p] <= 0:
+                    continue
+                passage_terms = tokenize(texts[p])
+                evidence.append({
+                    "source": sources[owners[p]].get("title"),
+                    "passage": texts[p],
+                    "score": round(float(scores[p]), 4),
+                    "coverage": round(len(distinct.intersection(passage_terms)) / max(len(distinct), 1), 4),
+                    "contradicts": _negated(texts[p], passage_terms) != negated,
+                })
+            confidence = max((e["coverage"] for e in evidence if not e["contradicts"]), default=0.0)
+            against = max((e["coverage"] for e in evidence if e["contradicts"]), default=0.0)
+            refuted = against >= self.threshold and against >= confidence
+            if refuted:
+                confidence = round(min(confidence, 1.0 - against), 4)
+            results.append({
+                "claim": claim,
+                "verified": confidence >= self.threshold,
+                "refuted": refuted,
+                "confidence": confidence,
+                "supporting_sources": list(dict.fromkeys(e["source"] for e in evidence)),
+                "evidence": evidence,
+            })
+        return results
+
+    async def check_claims(self, claims: Sequence[str], sources: Sequence[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """Check every claim against every source; the CPU-bound work runs off the event loop."""
+        return await asyncio.to_thread(self.verify, list(claims), sources)
+
     async def check_claim(self, claim: str, sources: List[Dict]) -> Dict[str, Any]:
-        """A mock fact-checking method."""
-        # In a real system, this would use semantic search or an LLM to verify the claim.
-        return {
-            "claim": claim,
-            "verified": True,
-            "confidence": 0.95,
-            "supporting_sources": [sources[0].get('title')] if sources else []
-        }
\ No newline at end of file
+        return (await self.check_claims([claim], sources))[0]
@@ -0,0 +1,194 @@
+"""
+Shared Async HTTP Transport
+
+A single pooled client is created per workflow and handed to every network
+tool, so TCP/TLS connections are reused across calls and retries never block
+the event loop. `aiohttp` is imported lazily on the first request, mirroring
+the deferred-import approach used by the ArXiv tool.
+
+An optional `Cassette` (see `cassette.py`) records final responses to disk or
+replays them instead of going to the network.
+"""
+import asyncio
+import json
+import logging
+import random
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from src.monitoring import tracing
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limits and transient upstream failures.
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class HTTPError(Exception):
+    """Raised for transport failures and, via `raise_for_status`, HTTP errors."""
+
+    def __init__(self, message: str, status: Optional[int] = None, url: str = ""):
+        super().__init__(message)
+        self.status = status
+        self.url = url
+
+
+@dataclass
+class HTTPResponse:
+    """Fully-read response; the body is consumed before the connection is released."""
+    status: int
+    text: str
+    url: str = ""
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise HTTPError(f"HTTP {self.status} for {self.url}", status=self.status, url=self.url)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as delta-seconds or an HTTP-date."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class AsyncHTTPClient:
+    """Pooled, non-blocking HTTP client with Retry-After aware backoff."""
+
+    def __init__(
+        self,
+        timeout: float = 15,
+        max_connections: int = 100,
+        max_connections_per_host: int = 10,
+        max_retries: int = 4,
+        backoff_base: float = 1.0,
+        max_backoff: float = 60.0,
+        cassette=None,
+    ):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.max_retries = max(1, max_retries)
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.cassette = cassette
+        self._session = None
+        self._aiohttp = None
+
+    @classmethod
+    def from_settings(cls, settings) -> "AsyncHTTPClient":
+        from .cassette import Cassette
+        return cls(
+            timeout=settings.http_timeout,
+            max_connections=settings.http_max_connections,
+            max_connections_per_host=settings.http_max_connections_per_host,
+            max_retries=settings.http_max_retries,
+            cassette=Cassette.from_settings(settings),
+        )
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            if self._aiohttp is None:
+                import aiohttp
+                self._aiohttp = aiohttp
+            connector = self._aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+            )
+            self._session = self._aiohttp.ClientSession(
+                connector=connector,
+                timeout=self._aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    def _backoff(self, attempt: int) -> float:
+        # Exponential backoff with jitter, capped so a bad header can't stall a run.
+        return min(self.max_backoff, self.backoff_base * (2 ** attempt) + random.uniform(0, 1))
+
+    async def _send(self, method: str, url: str, params: Optional[Dict[str, Any]],
+                    headers: Optional[Dict[str, str]]) -> HTTPResponse:
+        session = await self._get_session()
+        query = {k: str(v) for k, v in (params or {}).items()}
+        try:
+            async with session.request(method, url, params=query, headers=headers) as resp:
+                text = await resp.text()
+                return HTTPResponse(status=resp.status, text=text, url=str(resp.url), headers=dict(resp.headers))
+        except (self._aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise HTTPError(f"{method} {url} failed: {e!r}", url=url) from e
+
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+                  headers: Optional[Dict[str, str]] = None) -> HTTPResponse:
+        """GET with retries. Backoff uses `asyncio.sleep`, so other coroutines keep running.
+
+        Returns the last response even if it is still an error status; callers
+        decide via `raise_for_status`. Raises `HTTPError` only when the
+        transport itself fails on the final attempt. In replay mode the
+        recorded response is returned directly, with no network or backoff.
+        """
+        with tracing.span("HTTP GET", kind="http", url=url, params=dict(params or {})) as span:
+            if self.cassette is not None and self.cassette.mode == "replay":
+                response = self.cassette.play("GET", url, params)
+                tracing.annotate(replayed=True)
+            else:
+                response = await self._get_with_retries(url, params, headers)
+            if span is not None:
+                span.set(status=response.status, bytes=len(response.text))
+            return response
+
+    async def _get_with_retries(self, url: str, params: Optional[Dict[str, Any]],
+                                headers: Optional[Dict[str, str]]) -> HTTPResponse:
+        for attempt in range(1, self.max_retries + 1):
+            tracing.annotate(attempts=attempt)
+            try:
+                response = await self._send("GET", url, params, headers)
+            except HTTPError as e:
+                if attempt == self.max_retries:
+                    raise
+                wait = self._backoff(attempt)
+                logger.debug(f"{e}; attempt {attempt}/{self.max_retries}, retrying in {wait:.1f}s")
+                await asyncio.sleep(wait)
+                continue
+
+            if response.status in RETRYABLE_STATUSES and attempt < self.max_retries:
+                wait = parse_retry_after(response.headers.get("Retry-After"))
+                if wait is None:
+                    wait = self._backoff(attempt)
+                wait = min(wait, self.max_backoff)
+                logger.debug(f"HTTP {response.status} from {url}; attempt {attempt}/{self.max_retries}, sleeping {wait:.1f}s")
+                await asyncio.sleep(wait)
+                continue
+            if self.cassette is not None and self.cassette.mode == "record":
+                self.cassette.record("GET", url, params, response)
+            return response
+        raise HTTPError(f"GET {url} exhausted {self.max_retries} attempts", url=url)
+
+    async def aclose(self) -> None:
+        if self.cassette is not None and self.cassette.dirty:
+            path = self.cassette.save()
+            logger.info(f"Recorded {self.cassette.records} HTTP interactions to {path}")
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> "AsyncHTTPClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
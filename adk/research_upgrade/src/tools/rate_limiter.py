@@ -0,0 +1,44 @@
+"""
+Async Rate Limiter
+
+Spaces out outbound requests so the tools stay within each API's politeness
+limits. Callers `await limiter.acquire()` before issuing a request; waiting is
+done with `asyncio.sleep`, so other coroutines keep running.
+"""
+import asyncio
+import time
+
+
+class RateLimiter:
+    """Token-bucket style limiter (GCRA): `rate` requests/second with bursts of `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._interval = 1.0 / rate
+        self._tolerance = (self.burst - 1) * self._interval
+        self._tat = 0.0  # theoretical arrival time of the next request
+
+    @classmethod
+    def from_interval(cls, seconds: float, burst: int = 1) -> "RateLimiter":
+        """Build a limiter that allows one request every `seconds` seconds."""
+        return cls(rate=1.0 / seconds if seconds > 0 else float("inf"), burst=burst)
+
+    async def acquire(self) -> None:
+        if self.rate == float("inf"):
+            return
+        # Reserve a slot synchronously (no await in between), then sleep until it.
+        now = time.monotonic()
+        start = max(now, self._tat - self._tolerance)
+        self._tat = max(self._tat, now) + self._interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def __aenter__(self) -> "RateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
@@ -0,0 +1,288 @@
+"""
+Local Stand-in Server for arXiv and Semantic Scholar
+
+A small stdlib HTTP server that speaks just enough of both APIs for the tools:
+`GET <prefix>/api/query` returns an arXiv Atom feed and
+`GET <prefix>/graph/v1/paper/search` returns Semantic Scholar JSON. Requests
+recorded in a cassette (see `cassette.py`) are served verbatim. Any other query
+is answered from a pool of the recorded entries topped up with deterministic
+synthetic papers, so benchmarks can ask for arbitrary corpus sizes.
+
+Latency, jitter, the share of requests answered with 429 and the maximum page
+size are configurable, and all randomness is seeded, so retrieval changes can
+be measured offline and reproducibly. Run it standalone with
+
+    python -m src.tools.standin_server --cassette fixtures.json --port 8765
+
+and point `Settings.arxiv_base_url` / `Settings.semantic_scholar_base_url` (or
+the ARXIV_BASE_URL / SEMANTIC_SCHOLAR_BASE_URL variables) at the printed URLs,
+or use `StandInServer(...)` as a context manager and call `configure(settings)`.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import xml.etree.ElementTree as ET
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+from xml.sax.saxutils import escape
+
+from .arxiv_tool import ATOM_NS
+from .cassette import Cassette
+
+ARXIV_PATH = "/api/query"
+SEMANTIC_SCHOLAR_BASE_PATH = "/graph/v1"
+SEMANTIC_SCHOLAR_PATH = SEMANTIC_SCHOLAR_BASE_PATH + "/paper/search"
+
+_WORDS = (
+    "adaptive attention bayesian benchmark causal clinical contrastive deep diffusion "
+    "distributed efficient embedding federated graph hierarchical inference kernel "
+    "language latent learning medical model multimodal network neural optimization "
+    "prediction privacy probabilistic reinforcement representation retrieval robust "
+    "scalable segmentation self-supervised sparse spectral stochastic structured "
+    "temporal transformer uncertainty unsupervised variational vision"
+).split()
+_NAMES = ("Ana Costa", "Wei Zhang", "Priya Nair", "Tom Becker", "Lena Novak", "Omar Haddad",
+          "Sara Lindqvist", "Kenji Sato", "Maria Rossi", "David Okafor", "Yuki Tanaka", "Ivan Petrov")
+
+for _prefix, _uri in ATOM_NS.items():
+    ET.register_namespace("" if _prefix == "atom" else _prefix, _uri)
+
+
+def synthetic_paper(query: str, index: int) -> Dict[str, Any]:
+    """Deterministic fake paper number `index` for `query`; distinct indexes give distinct titles."""
+    rng = random.Random(zlib.crc32(f"{query}\x00{index}".encode("utf-8")))
+    title = " ".join(rng.sample(_WORDS, 7)).capitalize() + f" for {query}"
+    return {
+        "id": f"{2000 + index % 25:04d}.{index:05d}",
+        "title": title,
+        "abstract": " ".join(rng.choices(_WORDS, k=60)) + ".",
+        "year": 2000 + index % 25,
+        "authors": rng.sample(_NAMES, rng.randint(1, 4)),
+    }
+
+
+def _arxiv_entry_xml(paper: Dict[str, Any]) -> str:
+    authors = "".join(f"<author><name>{escape(name)}</name></author>" for name in paper["authors"])
+    return (
+        f"<entry><id>http://arxiv.org/abs/{paper['id']}v1</id>"
+        f"<published>{paper['year']}-01-01T00:00:00Z</published>"
+        f"<title>{escape(paper['title'])}</title><summary>{escape(paper['abstract'])}</summary>{authors}"
+        f"<link title=\"pdf\" href=\"http://arxiv.org/pdf/{paper['id']}v1\" rel=\"related\" type=\"application/pdf\"/>"
+        f"</entry>"
+    )
+
+
+def _semantic_scholar_item(paper: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "paperId": f"synthetic{zlib.crc32(paper['title'].encode('utf-8')):08x}",
+        "title": paper["title"],
+        "abstract": paper["abstract"],
+        "year": paper["year"],
+        "authors": [{"name": name} for name in paper["authors"]],
+        "url": f"https://www.semanticscholar.org/paper/{paper['id']}",
+        "externalIds": {"ArXiv": paper["id"]},
+    }
+
+
+class StandInServer:
+    """Threaded local server; `base_url` is only known after `start()` when `port=0`."""
+
+    def __init__(self, cassette_path: Optional[str] = None, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, rate_429: float = 0.0, retry_after: float = 1.0,
+                 page_size: int = 100, total_results: int = 1000, overlap: float = 0.5, seed: int = 0):
+        self.cassette = Cassette(cassette_path, mode="replay") if cassette_path else None
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.page_size = max(1, page_size)
+        self.total_results = total_results
+        # Share of Semantic Scholar results that are also in the arXiv results for a query.
+        self.overlap = overlap
+        self.requests = 0
+        self.throttled = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._arxiv_pool, self._s2_pool = self._load_pools()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # Lifecycle
+    def start(self) -> "StandInServer":
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, content_type, body, headers = server.handle(self.path)
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="standin-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def arxiv_url(self) -> str:
+        return self.base_url + ARXIV_PATH
+
+    @property
+    def semantic_scholar_url(self) -> str:
+        return self.base_url + SEMANTIC_SCHOLAR_BASE_PATH
+
+    def configure(self, settings) -> None:
+        """Point both tools at this server and turn off real-API pacing."""
+        settings.arxiv_base_url = self.arxiv_url
+        settings.semantic_scholar_base_url = self.semantic_scholar_url
+        settings.arxiv_request_interval = 0.0
+        settings.http_cassette_mode = "off"
+
+    # Request handling
+    def handle(self, raw_path: str):
+        """Return `(status, content_type, body, headers)` for a GET request path."""
+        url = urlsplit(raw_path)
+        params = dict(parse_qsl(url.query, keep_blank_values=True))
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            throttle = self.rate_429 > 0 and self._rng.random() < self.rate_429
+            if throttle:
+                self.throttled += 1
+        if delay:
+            time.sleep(delay)
+        if throttle:
+            return 429, "text/plain", "Too Many Requests", {"Retry-After": f"{self.retry_after:g}"}
+
+        if self.cassette is not None:
+            recorded = self.cassette.find("GET", url.path, params)
+            if recorded is not None:
+                content_type = (recorded.get("headers") or {}).get("content-type", "text/plain")
+                return recorded["status"], content_type, recorded["body"], {}
+
+        if url.path.endswith(ARXIV_PATH):
+            return 200, "application/atom+xml", self._arxiv_feed(params), {}
+        if url.path.endswith(SEMANTIC_SCHOLAR_PATH):
+            return 200, "application/json", self._semantic_scholar_page(params), {}
+        return 404, "text/plain", f"Unknown path {url.path}", {}
+
+    def _load_pools(self):
+        """Collect recorded entries so synthesized pages start with real data."""
+        arxiv_pool: List[str] = []
+        s2_pool: List[Dict[str, Any]] = []
+        if self.cassette is None:
+            return arxiv_pool, s2_pool
+        for response in self.cassette.responses(ARXIV_PATH):
+            try:
+                root = ET.fromstring(response["body"])
+            except ET.ParseError:
+                continue
+            arxiv_pool.extend(ET.tostring(entry, encoding="unicode") for entry in root.findall("atom:entry", ATOM_NS))
+        for response in self.cassette.responses(SEMANTIC_SCHOLAR_PATH):
+            try:
+                s2_pool.extend(json.loads(response["body"]).get("data") or [])
+            except ValueError:
+                continue
+        return arxiv_pool, s2_pool
+
+    def _page_bounds(self, start: int, requested: int):
+        count = max(0, min(requested, self.page_size, self.total_results - start))
+        return range(start, start + count)
+
+    def _arxiv_feed(self, params: Dict[str, str]) -> str:
+        query = params.get("search_query", "").split(":", 1)[-1]
+        start = int(params.get("start", 0))
+        entries = []
+        for index in self._page_bounds(start, int(params.get("max_results", 10))):
+            if index < len(self._arxiv_pool):
+                entries.append(self._arxiv_pool[index])
+            else:
+                entries.append(_arxiv_entry_xml(synthetic_paper(query, index)))
+        return (
+            f'<?xml version="1.0" encoding="UTF-8"?>'
+            f'<feed xmlns="{ATOM_NS["atom"]}" xmlns:opensearch="{ATOM_NS["opensearch"]}" xmlns:arxiv="{ATOM_NS["arxiv"]}">'
+            f'<title>arXiv Query: {escape(query)}</title>'
+            f'<opensearch:totalResults>{self.total_results}</opensearch:totalResults>'
+            f'<opensearch:startIndex>{start}</opensearch:startIndex>'
+            f'<opensearch:itemsPerPage>{len(entries)}</opensearch:itemsPerPage>'
+            + "".join(entries) + "</feed>"
+        )
+
+    def _semantic_scholar_page(self, params: Dict[str, str]) -> str:
+        query = params.get("query", "")
+        offset = int(params.get("offset", 0))
+        data = []
+        for index in self._page_bounds(offset, int(params.get("limit", 10))):
+            if index < len(self._s2_pool):
+                data.append(self._s2_pool[index])
+                continue
+            # Either the same paper arXiv returns at this rank, or one arXiv never returns.
+            shared = zlib.crc32(f"{query}\x00{index}".encode("utf-8")) % 1000 < self.overlap * 1000
+            data.append(_semantic_scholar_item(synthetic_paper(query, index if shared else self.total_results + index)))
+        return json.dumps({"total": self.total_results, "offset": offset, "data": data})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve recorded or synthetic arXiv / Semantic Scholar responses")
+    parser.add_argument("--cassette", type=str, default=None, help="Cassette recorded with HTTP_CASSETTE_MODE=record")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra uniformly random latency, in seconds")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After sent with each 429")
+    parser.add_argument("--page-size", type=int, default=100, help="Maximum results returned per request")
+    parser.add_argument("--total-results", type=int, default=1000, help="Corpus size reported for every query")
+    parser.add_argument("--overlap", type=float, default=0.5, help="Share of Semantic Scholar results also on arXiv")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = StandInServer(
+        cassette_path=args.cassette, host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+        rate_429=args.rate_429, retry_after=args.retry_after, page_size=args.page_size,
+        total_results=args.total_results, overlap=args.overlap, seed=args.seed,
+    ).start()
+    print(f"ARXIV_BASE_URL={server.arxiv_url}")
+    print(f"SEMANTIC_SCHOLAR_BASE_URL={server.semantic_scholar_url}")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
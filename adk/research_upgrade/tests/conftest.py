@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+# Tests import the app the way main.py runs it: `config` and `src` from the app root.
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+class NullLogger:
+    """Accepts every WorkflowLogger call and prints nothing."""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def offline_settings(tmp_path, **overrides):
+    """Settings for an offline run that writes only under `tmp_path`."""
+    from config.settings import Settings
+    values = dict(
+        google_api_key="test",
+        output_dir=str(tmp_path / "output"),
+        source_rate_limits={},
+        enable_search_cache=False,
+        enable_tracing=False,
+        checkpoint_dir=str(tmp_path / "checkpoints"),
+    )
+    values.update(overrides)
+    return Settings(**values)
+
+
+def offline_workflow(settings, size: int = 10, **kwargs):
+    """A ResearchWorkflow whose search tools answer from the benchmark corpus."""
+    from benchmarks.corpus import CorpusSearchTool, make_source_corpora
+    from src.orchestration.workflow import ResearchWorkflow
+    workflow = ResearchWorkflow(settings, NullLogger(), **kwargs)
+    arxiv, semantic_scholar = make_source_corpora(size)
+    workflow.paper_retriever.arxiv_tool = CorpusSearchTool(arxiv)
+    workflow.paper_retriever.semantic_tool = CorpusSearchTool(semantic_scholar)
+    return workflow
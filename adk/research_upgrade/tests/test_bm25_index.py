@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from src.tools.bm25_index import BM25Index, tokenize, top_k
+
+DOCS = [
+    "Deep learning for medical image segmentation",
+    "Graph neural networks for molecule property prediction",
+    "A survey of deep reinforcement learning",
+    None,
+    "Medical imaging with transformers: segmentation and registration",
+]
+
+
+def test_tokenize_drops_stopwords_and_keeps_negations():
+    assert tokenize("The model does NOT use attention, and it's fast.") == \
+        ["model", "does", "not", "use", "attention", "fast"]
+    assert tokenize(None) == []
+
+
+def test_query_ranks_matching_documents_first():
+    index = BM25Index(DOCS)
+    scores = index.score("medical segmentation")
+    assert len(scores) == len(DOCS)
+    assert set(top_k(scores, 2).tolist()) == {0, 4}
+    assert scores[1] == 0 and scores[3] == 0
+
+
+def test_rare_terms_weigh_more():
+    index = BM25Index(DOCS)
+    # "graph" occurs in one document, "learning" in two.
+    assert index.score("graph")[1] > index.score("learning")[0]
+
+
+def test_coverage_counts_distinct_query_terms():
+    index = BM25Index(DOCS)
+    _, coverage = index.match("deep learning survey")
+    assert coverage[2] == pytest.approx(1.0)
+    assert coverage[0] == pytest.approx(2 / 3)
+    assert coverage[1] == 0
+
+
+def test_chunked_build_matches_single_chunk():
+    docs = [f"paper {i} about topic{i % 7} and method{i % 5}" for i in range(50)]
+    whole = BM25Index(docs, n_features=4096)
+    chunked = BM25Index(docs, n_features=4096, chunk_size=7)
+    np.testing.assert_allclose(whole.score("topic3 method2"), chunked.score("topic3 method2"))
+
+
+def test_empty_index_and_query():
+    assert BM25Index([]).score("anything").shape == (0,)
+    assert not BM25Index(DOCS).score("the of and").any()
+
+
+def test_top_k_orders_by_score_then_index():
+    scores = np.array([0.5, 2.0, 0.5, 3.0, 0.5])
+    assert top_k(scores, 3).tolist() == [3, 1, 0]
+    assert top_k(scores, 4).tolist() == [3, 1, 0, 2]
+    assert top_k(scores, 10).tolist() == [3, 1, 0, 2, 4]
+    assert top_k(scores, 0).tolist() == []
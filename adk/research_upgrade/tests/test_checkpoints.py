@@ -0,0 +1,62 @@
+import asyncio
+
+from conftest import offline_settings, offline_workflow
+from src.memory.checkpoint_store import CheckpointStore
+
+
+def test_put_get_and_shared_blobs(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    digest = store.put("k1", {"papers": [1, 2]})
+    assert store.put("k2", {"papers": [1, 2]}) == digest
+    assert store.get("k1") == ({"papers": [1, 2]}, digest)
+    assert store.get("missing") is None
+    assert (store.hits, store.misses) == (1, 1)
+    assert len(list((tmp_path / "objects").rglob("*"))) == 2  # one fan-out directory, one blob
+
+
+def test_corrupt_blob_is_a_miss(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    digest = store.put("k", [1, 2, 3])
+    (tmp_path / "objects" / digest[:2] / digest).write_bytes(b"truncated")
+    assert store.get("k") is None
+
+
+def test_key_covers_every_input():
+    base = CheckpointStore.make_key("Agent", "topic", "s", {"Up": "h1"})
+    assert base == CheckpointStore.make_key("Agent", "topic", "s", {"Up": "h1"})
+    assert base != CheckpointStore.make_key("Agent", "topic", "s", {"Up": "h2"})
+    assert base != CheckpointStore.make_key("Agent", "other", "s", {"Up": "h1"})
+    assert base != CheckpointStore.make_key("Agent", "topic", "t", {"Up": "h1"})
+
+
+def test_fingerprint_ignores_output_and_transport_settings(tmp_path):
+    settings = offline_settings(tmp_path)
+    fingerprint = settings.fingerprint()
+    for field, value in [("output_dir", "elsewhere"), ("enable_parallel", False), ("resume", True),
+                         ("log_level", "DEBUG"), ("artifact_store", True)]:
+        setattr(settings, field, value)
+    assert settings.fingerprint() == fingerprint
+    settings.max_papers += 1
+    assert settings.fingerprint() != fingerprint
+
+
+def run(settings):
+    workflow = offline_workflow(settings)
+
+    async def main():
+        try:
+            return await workflow.execute("checkpointed topic"), workflow.checkpoints
+        finally:
+            await workflow.aclose()
+    return asyncio.run(main())
+
+
+def test_resume_reuses_every_unchanged_agent(tmp_path):
+    first, store = run(offline_settings(tmp_path, max_papers=10))
+    assert store.hits == 0
+    resumed, store = run(offline_settings(tmp_path, max_papers=10, resume=True))
+    assert store.hits == len(resumed["agent_timings"]) and store.misses == 0
+    assert resumed["papers_analyzed"] == first["papers_analyzed"]
+    # A semantic setting change invalidates every checkpoint.
+    _, store = run(offline_settings(tmp_path, max_papers=8, resume=True))
+    assert store.hits == 0
@@ -0,0 +1,60 @@
+import asyncio
+
+from src.tools.citation_generator import CitationGeneratorTool, CitationKeys, _suffix
+
+PAPER = {"authors": ["Ada Lovelace", "Bob Smith"], "year": "2024", "title": "Deep nets, revisited"}
+
+
+def test_suffix_is_bijective_base_26():
+    assert [_suffix(n) for n in (1, 2, 26, 27, 52, 53, 702, 703)] == \
+        ["a", "b", "z", "aa", "az", "ba", "zz", "aaa"]
+
+
+def test_key_from_author_year_and_title():
+    key = CitationGeneratorTool._generate_citation_key
+    assert key(["Ada Lovelace"], "2024", "Deep nets") == "lovelace2024deep"
+    assert key([], None, None) == "unknown"
+    assert key(["  "], "c. 2019", "'Quoted' title") == "unknown2019quoted"
+    assert key(["José Núñez"], 2020, "Über alles") == "nez2020ber"
+
+
+def test_colliding_keys_get_suffixes_in_arrival_order():
+    keys = CitationKeys()
+    assert [keys.allocate("smith2024deep") for _ in range(3)] == \
+        ["smith2024deep", "smith2024deepa", "smith2024deepb"]
+
+
+def test_suffixed_key_that_is_another_base_is_skipped():
+    keys = CitationKeys()
+    assert keys.allocate("smith2024deepa") == "smith2024deepa"
+    assert keys.allocate("smith2024deep") == "smith2024deep"
+    assert keys.allocate("smith2024deep") == "smith2024deepb"
+    assert keys.allocate("smith2024deepa") == "smith2024deepaa"
+
+
+def test_many_collisions_stay_unique():
+    keys = CitationKeys()
+    allocated = [keys.allocate("k") for _ in range(1000)]
+    assert len(set(allocated)) == 1000
+
+
+def test_cite_all_is_deterministic():
+    tool = CitationGeneratorTool()
+    first = tool.cite_all([PAPER, PAPER, {}])
+    assert first == tool.cite_all([PAPER, PAPER, {}])
+    assert first["count"] == 3
+    assert first["bibtex"][0].startswith("@article{lovelace2024deep,\n  author = {Ada Lovelace and Bob Smith},")
+    assert first["bibtex"][1].startswith("@article{lovelace2024deepa,")
+    assert first["apa"][0] == "Ada Lovelace, Bob Smith (2024). Deep nets, revisited."
+    assert first["apa"][2] == " (N/A). No Title."
+
+
+def test_export_streams_the_same_citations(tmp_path):
+    tool = CitationGeneratorTool()
+    papers = [dict(PAPER, title=f"Paper {i}") for i in range(5)] + [PAPER, PAPER]
+    bib, apa = tmp_path / "refs.bib", tmp_path / "refs.apa.txt"
+    written = asyncio.run(tool.export_citations(iter(papers), str(bib), str(apa)))
+    batch = tool.cite_all(papers)
+    assert written == 7
+    assert bib.read_text(encoding="utf-8") == "".join(entry + "\n\n" for entry in batch["bibtex"])
+    assert apa.read_text(encoding="utf-8").splitlines() == batch["apa"]
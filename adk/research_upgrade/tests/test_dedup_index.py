@@ -0,0 +1,55 @@
+from benchmarks.corpus import make_source_corpora
+from src.tools.dedup_index import PaperDedupIndex, extract_arxiv_id, normalize_doi, normalize_title
+
+
+def test_normalizers():
+    assert normalize_title("  Déjà   Vu: A Study, v2") == "deja vu a study"
+    assert normalize_title(None) == ""
+    assert normalize_doi("https://doi.org/10.1000/ABC") == "10.1000/abc"
+    assert normalize_doi("doi:10.1/X") == "10.1/x"
+    assert extract_arxiv_id({"url": "http://arxiv.org/abs/2101.00001v3"}) == "2101.00001"
+    assert extract_arxiv_id({"pdf_url": "https://arxiv.org/pdf/2101.00001v1.pdf"}) == "2101.00001"
+    assert extract_arxiv_id({"arxiv_id": "2101.00001V2"}) == "2101.00001"
+
+
+def test_exact_keys_merge_and_fill_missing_fields():
+    index = PaperDedupIndex()
+    assert index.add({"title": "Graph Networks", "url": "https://arxiv.org/abs/1806.01261v2",
+                      "pdf_url": "https://arxiv.org/pdf/1806.01261v2", "source": "arxiv"}) == (0, True)
+    # Different title spelling, same arXiv ID.
+    assert index.add({"title": "Relational inductive biases", "url": "https://arxiv.org/abs/1806.01261",
+                      "doi": "10.1/GN", "source": "semantic_scholar"}) == (0, False)
+    # Matched by the DOI the merge just learned.
+    assert index.add({"title": "Something else", "doi": "https://doi.org/10.1/gn"}) == (0, False)
+    paper = index.papers[0]
+    assert paper["title"] == "Graph Networks" and paper["doi"] == "10.1/GN"
+    assert paper["sources"] == ["arxiv", "semantic_scholar"]
+    assert len(index) == 1 and index.duplicates == 2
+
+
+def test_near_duplicate_titles_merge():
+    index = PaperDedupIndex()
+    index.add({"title": "Attention Is All You Need for Neural Machine Translation"})
+    assert index.add({"title": "Attention is all you need for neural machine translaton"}) == (0, False)
+
+
+def test_topic_alike_titles_stay_apart():
+    index = PaperDedupIndex()
+    index.add({"title": "Deep learning for medical image segmentation"})
+    assert index.add({"title": "Deep learning for medical image registration"}) == (1, True)
+
+
+def test_paper_without_identity_is_skipped():
+    index = PaperDedupIndex()
+    assert index.add({"abstract": "no title, url, doi"}) == (None, False)
+    assert len(index) == 0
+
+
+def test_corpus_shared_papers_merge_by_doi():
+    arxiv, semantic_scholar = make_source_corpora(200)
+    index = PaperDedupIndex()
+    for paper in arxiv + semantic_scholar:
+        index.add(paper)
+    assert len(index) == 300
+    assert index.duplicates == 100
+    assert sum(p["sources"] == ["arxiv", "semantic_scholar"] for p in index.papers) == 100
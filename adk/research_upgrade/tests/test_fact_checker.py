@@ -0,0 +1,60 @@
+import asyncio
+
+from src.tools.fact_checker_tool import FactCheckerTool
+
+SOURCES = [
+    {"title": "Transformers", "abstract": "We show transformers use attention for translation."},
+    {"title": "CNNs", "abstract": "Convolutional nets do not use attention."},
+]
+
+
+def verify(claim, sources=SOURCES, **kwargs):
+    return FactCheckerTool(**kwargs).verify([claim], sources)[0]
+
+
+def test_supported_claim_is_verified():
+    result = verify("Transformers use attention")
+    assert result["verified"] and not result["refuted"]
+    assert result["confidence"] == 1.0
+    assert result["supporting_sources"][0] == "Transformers"
+
+
+def test_negated_claim_about_another_subject_is_not_verified():
+    # The CNN passage shares "do not use attention", but negations and "do" are
+    # not content terms; the transformer passage says the opposite.
+    result = verify("Transformers do not use attention")
+    assert not result["verified"]
+    assert result["refuted"]
+    assert result["confidence"] == 0.0
+    cnn = next(e for e in result["evidence"] if e["source"] == "CNNs")
+    assert not cnn["contradicts"] and cnn["coverage"] < 0.8
+    transformers = next(e for e in result["evidence"] if e["source"] == "Transformers")
+    assert transformers["contradicts"] and transformers["coverage"] == 1.0
+
+
+def test_contraction_counts_as_negation():
+    result = verify("Transformers don't use attention")
+    assert result["refuted"] and not result["verified"]
+
+
+def test_weak_contradiction_does_not_refute():
+    result = verify("Transformers do not use recurrence for translation")
+    assert not result["refuted"]
+
+
+def test_no_sources():
+    result = verify("Transformers use attention", sources=[])
+    assert result == {"claim": "Transformers use attention", "verified": False, "refuted": False,
+                      "confidence": 0.0, "supporting_sources": [], "evidence": []}
+
+
+def test_check_claims_matches_verify():
+    tool = FactCheckerTool()
+    claims = ["Transformers use attention", "Transformers do not use attention"]
+    assert asyncio.run(tool.check_claims(claims, SOURCES)) == tool.verify(claims, SOURCES)
+
+
+def test_title_is_used_without_abstract():
+    texts, owners = FactCheckerTool.passages([{"title": "Only a title"}, {"abstract": "One. Two!"}])
+    assert texts == ["Only a title", "One.", "Two!"]
+    assert owners == [0, 1, 1]
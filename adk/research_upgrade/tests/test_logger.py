@@ -0,0 +1,55 @@
+import threading
+
+from src.monitoring.logger import WorkflowLogger
+
+
+def make_logger(tmp_path, **kwargs):
+    return WorkflowLogger(log_file=str(tmp_path / "workflow.log"), console=False, **kwargs)
+
+
+def test_records_below_level_are_skipped(tmp_path):
+    logger = make_logger(tmp_path, level="WARNING")
+    assert not logger.is_enabled_for("info") and logger.is_enabled_for("error")
+    logger.info("quiet")
+    logger.warning("loud")
+    logger.close()
+    text = (tmp_path / "workflow.log").read_text(encoding="utf-8")
+    assert "loud" in text and "quiet" not in text
+
+
+def test_record_logged_during_close_is_written(tmp_path):
+    logger = make_logger(tmp_path)
+    closer = threading.Thread(target=logger.close)
+
+    class RacingQueue:
+        """Closes the logger from another thread between _log's closed check and its put."""
+
+        def __init__(self, inner):
+            self.inner = inner
+
+        def put(self, item):
+            if isinstance(item, tuple) and closer.ident is None:
+                closer.start()
+                closer.join(timeout=0.2)
+            self.inner.put(item)
+
+        def __getattr__(self, name):
+            return getattr(self.inner, name)
+
+    logger._queue = RacingQueue(logger._queue)
+    logger.info("last words")
+    closer.join()
+    assert logger.dropped == 0
+    assert "last words" in (tmp_path / "workflow.log").read_text(encoding="utf-8")
+    logger.info("after close")
+    assert logger.dropped == 1
+    assert not logger.flush()
+
+
+def test_rotation_keeps_backups(tmp_path):
+    logger = make_logger(tmp_path, max_bytes=200, backup_count=2, batch_size=1)
+    for i in range(50):
+        logger.info(f"line {i:04d} " + "x" * 20)
+    logger.close()
+    assert (tmp_path / "workflow.log.1").exists() and (tmp_path / "workflow.log.2").exists()
+    assert not (tmp_path / "workflow.log.3").exists()
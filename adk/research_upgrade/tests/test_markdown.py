@@ -0,0 +1,57 @@
+import io
+
+import pytest
+
+from src.output.markdown import MarkdownConverter, html_to_markdown
+
+HTML = """<!DOCTYPE html><html><head><title>Review</title><style>p { color: red; }</style></head>
+<body><!-- generated <p>not text</p> -->
+<h1>Literature   Review</h1>
+<p>AT&amp;T &gt; IBM, see <a href="https://example.org/a b">the <em>paper</em></a>.<br/>Next line_1</p>
+<ul><li>First</li><li>Second<ol><li>Nested</li></ol></li></ul>
+<table><tr><th>Title</th><th>Year</th></tr>
+<tr><td>A | B</td><td>2020</td></tr></table>
+<script>var x = "<b>";</script><p>Done &copy; 2024</p></body></html>"""
+
+EXPECTED = (
+    "# Literature Review\n\n"
+    "AT&T \\> IBM, see [the *paper*](https://example.org/a%20b). Next line\\_1\n\n"
+    "- First\n"
+    "- Second\n"
+    "  1. Nested\n"
+    "\n"
+    "| Title | Year |\n"
+    "| --- | --- |\n"
+    "| A \\| B | 2020 |\n"
+    "\n"
+    "Done © 2024\n\n"
+)
+
+
+def convert(html, chunk_size):
+    sink = io.StringIO()
+    html_to_markdown(html, sink, chunk_size=chunk_size)
+    return sink.getvalue()
+
+
+def test_review_markup():
+    assert convert(HTML, len(HTML)) == EXPECTED
+
+
+@pytest.mark.parametrize("chunk_size", range(1, 40))
+def test_every_chunk_boundary_gives_the_same_markdown(chunk_size):
+    assert convert(HTML, chunk_size) == EXPECTED
+
+
+def test_blocks_are_written_as_they_close():
+    sink = io.StringIO()
+    converter = MarkdownConverter(sink)
+    converter.feed("<h2>Intro</h2><p>still open")
+    assert sink.getvalue() == "## Intro\n\n"
+    converter.feed(" text</p>")
+    assert sink.getvalue() == "## Intro\n\nstill open text\n\n"
+    converter.close()
+
+
+def test_unterminated_input_is_flushed_on_close():
+    assert convert("<p>tail &amp; more", 3) == "tail & more\n\n"
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from src.memory.paper_table import PaperTable, factorize
+
+RECORDS = [
+    {"title": "A", "year": 2020, "authors": ["Ada", "Bob"], "source": "arxiv", "citations": 3, "relevance": 0.5},
+    {"title": "B"},
+    {"title": "C", "year": 2018, "authors": "Solo Author", "source": "semantic_scholar", "doi": None},
+]
+
+
+def test_round_trip_keeps_missing_keys_absent_and_int_years():
+    records = PaperTable.from_records(RECORDS).to_records()
+    assert records[0] == RECORDS[0]
+    assert records[1] == {"title": "B"}
+    assert records[2] == {"title": "C", "year": 2018, "authors": ["Solo Author"],
+                          "source": "semantic_scholar", "doi": None}
+    assert records[1].get("citations", 0) == 0
+    assert PaperTable.from_records(records).to_records() == records
+
+
+def test_string_years_stay_strings():
+    table = PaperTable.from_records([{"year": "2021"}, {"year": 2019}, {"year": None}, {}])
+    assert table.to_records() == [{"year": "2021"}, {"year": "2019"}, {"year": ""}, {}]
+    assert table.years.tolist() == [2021, 2019, 0, 0]
+
+
+def test_numpy_int_years_decode_as_ints():
+    table = PaperTable.from_records([{"year": np.int64(2001)}, {"year": None}])
+    assert table.to_records() == [{"year": 2001}, {"year": None}]
+
+
+def test_slices_takes_and_projections_keep_presence():
+    table = PaperTable.from_records(RECORDS)
+    assert table[1:].to_records() == PaperTable.from_records(RECORDS[1:]).to_records()
+    assert table.take([2, 1]).to_records()[1] == {"title": "B"}
+    assert table.select(["citations", "missing"]).to_records() == [{"citations": 3}, {}, {}]
+    assert table.with_column("citations", [1, 2, 3]).to_records()[1] == {"title": "B", "citations": 2}
+
+
+def test_rows_read_like_dicts():
+    table = PaperTable.from_records(RECORDS)
+    row = table[-1]
+    assert row["authors"] == ["Solo Author"]
+    assert row.get("citations", 0) == 0
+    assert "doi" not in row
+    with pytest.raises(KeyError):
+        row["citations"]
+    with pytest.raises(IndexError):
+        table[3]
+
+
+def test_list_column_views():
+    table = PaperTable.from_records(RECORDS)
+    values, offsets = table.list_column("authors")
+    assert values.tolist() == ["Ada", "Bob", "Solo Author"]
+    assert offsets.tolist() == [0, 2, 2, 3]
+    assert table[1:].list_column("authors")[0] is values
+    with pytest.raises(TypeError):
+        table.column("authors")
+
+
+def test_with_column_length_mismatch():
+    with pytest.raises(ValueError):
+        PaperTable.from_records(RECORDS).with_column("x", [1])
+
+
+def test_factorize_first_seen_order():
+    codes, uniques = factorize(["b", "a", "b", "c"])
+    assert codes.tolist() == [0, 1, 0, 2]
+    assert uniques == ["b", "a", "c"]
@@ -0,0 +1,64 @@
+import pytest
+
+from src.memory import research_memory
+from src.memory.research_memory import ResearchMemory
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(research_memory.time, "time", lambda: now[0])
+    return now
+
+
+def test_least_recently_used_entry_is_evicted():
+    memory = ResearchMemory(max_entries=2)
+    memory.store_context("a", 1)
+    memory.store_context("b", 2)
+    assert memory.get_context("a") == 1  # a is now more recent than b
+    memory.store_agent_result("Agent", {"ok": True})
+    assert memory.get_context("b") is None
+    assert memory.get_context("a") == 1 and memory.get_agent_result("Agent") == {"ok": True}
+    assert memory.stats() == {"entries": 2, "max_entries": 2, "evictions": 1}
+
+
+def test_entries_expire(clock):
+    memory = ResearchMemory(ttl=10)
+    memory.store_context("a", 1)
+    clock[0] += 9
+    assert memory.get_all_context() == {"a": 1}
+    clock[0] += 2
+    assert memory.get_context("a", "gone") == "gone"
+    assert memory.get_all_context() == {}
+
+
+def test_scoped_views_share_the_store_but_not_keys():
+    memory = ResearchMemory(max_entries=10)
+    a, b = memory.scoped("a"), memory.scoped("b")
+    a.store_agent_result("Agent", 1)
+    b.store_agent_result("Agent", 2)
+    assert a.get_agent_result("Agent") == 1 and b.get_agent_result("Agent") == 2
+    a.clear()
+    assert a.get_all_results() == {} and b.get_all_results() == {"Agent": 2}
+    assert memory.stats()["entries"] == 1
+
+
+def test_snapshot_and_restore(tmp_path, clock):
+    memory = ResearchMemory(max_entries=5, ttl=100)
+    memory.store_context("topic", "x")
+    memory.scoped("other").store_agent_result("Agent", {"papers": [1, 2]})
+    path = memory.snapshot(str(tmp_path / "snap" / "memory.pkl"))
+    clock[0] += 50
+    restored = ResearchMemory.restore(path)
+    assert restored.get_context("topic") == "x"
+    assert restored.scoped("other").get_agent_result("Agent") == {"papers": [1, 2]}
+    assert restored.stats()["max_entries"] == 5
+    clock[0] += 100
+    assert ResearchMemory.restore(path).stats()["entries"] == 0
+
+
+def test_restore_rejects_other_versions(tmp_path, monkeypatch):
+    path = ResearchMemory().snapshot(str(tmp_path / "memory.pkl"))
+    monkeypatch.setattr(research_memory, "_SNAPSHOT_VERSION", 99)
+    with pytest.raises(ValueError):
+        ResearchMemory.restore(path)
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from conftest import NullLogger
+from src.orchestration.scheduler import DAGScheduler
+
+
+def node(log, name, delay=0.0, result=None):
+    async def run():
+        log.append(f"start {name}")
+        await asyncio.sleep(delay)
+        log.append(f"end {name}")
+        return result if result is not None else name
+    return run
+
+
+def test_nodes_start_when_inputs_are_ready():
+    log = []
+    scheduler = DAGScheduler(NullLogger())
+    scheduler.add("plan", node(log, "plan"))
+    scheduler.add("slow", node(log, "slow", 0.05), depends_on=["plan"])
+    scheduler.add("fast", node(log, "fast", 0.01), depends_on=["plan"])
+    scheduler.add("join", node(log, "join"), depends_on=["slow", "fast"])
+    results = asyncio.run(scheduler.run())
+    assert results == {"plan": "plan", "slow": "slow", "fast": "fast", "join": "join"}
+    # slow and fast overlap; join waits for both.
+    assert log.index("start fast") < log.index("end slow")
+    assert log.index("start join") > log.index("end slow")
+    critical = scheduler.critical_path()
+    assert critical.nodes == ["plan", "slow", "join"]
+    assert critical.duration == pytest.approx(scheduler.timings["join"].end)
+
+
+def test_max_concurrency_one_runs_in_dependency_order():
+    log = []
+    scheduler = DAGScheduler(NullLogger(), max_concurrency=1)
+    scheduler.add("a", node(log, "a", 0.01))
+    scheduler.add("b", node(log, "b", 0.01))
+    scheduler.add("c", node(log, "c"), depends_on=["a", "b"])
+    asyncio.run(scheduler.run())
+    starts_and_ends = [entry.split()[0] for entry in log]
+    assert starts_and_ends == ["start", "end"] * 3
+    assert log[-1] == "end c"
+
+
+def test_provided_results_satisfy_dependencies():
+    log = []
+    scheduler = DAGScheduler(NullLogger())
+    scheduler.add("pipeline", node(log, "pipeline"), provides=["Retriever", "Extractor"])
+    scheduler.add("analysis", node(log, "analysis"), depends_on=["Extractor"])
+    asyncio.run(scheduler.run())
+    assert log.index("start analysis") > log.index("end pipeline")
+
+
+def test_unknown_dependency_is_rejected():
+    scheduler = DAGScheduler(NullLogger())
+    scheduler.add("a", node([], "a"), depends_on=["missing"])
+    with pytest.raises(ValueError, match="unknown task.*missing"):
+        asyncio.run(scheduler.run())
+
+
+def test_cycle_is_rejected():
+    scheduler = DAGScheduler(NullLogger())
+    scheduler.add("a", node([], "a"), depends_on=["c"])
+    scheduler.add("b", node([], "b"), depends_on=["a"])
+    scheduler.add("c", node([], "c"), depends_on=["b"])
+    scheduler.add("free", node([], "free"))
+    with pytest.raises(ValueError, match="cycle"):
+        asyncio.run(scheduler.run())
+
+
+def test_duplicate_names_are_rejected():
+    scheduler = DAGScheduler(NullLogger())
+    scheduler.add("a", node([], "a"), provides=["x"])
+    with pytest.raises(ValueError, match="Duplicate"):
+        scheduler.add("x", node([], "x"))
+
+
+def test_failure_cancels_pending_nodes():
+    log = []
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    scheduler = DAGScheduler(NullLogger())
+    scheduler.add("boom", boom)
+    scheduler.add("slow", node(log, "slow", 1.0))
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(scheduler.run())
+    assert "end slow" not in log
+
+
+def test_empty_critical_path():
+    assert DAGScheduler(NullLogger()).critical_path().nodes == []
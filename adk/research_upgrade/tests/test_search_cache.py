@@ -0,0 +1,78 @@
+import pytest
+
+from src.memory import search_cache
+from src.memory.search_cache import SearchCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(search_cache.time, "time", clock)
+    return clock
+
+
+def results(n):
+    return [{"title": f"paper {i}", "rank": i} for i in range(n)]
+
+
+def test_hit_miss_and_normalized_query(clock):
+    cache = SearchCache(":memory:")
+    assert cache.get("arxiv", "Deep  Learning", 5) is None
+    cache.set("arxiv", "deep learning", 5, results(5))
+    assert cache.get("arxiv", "  DEEP learning ", 5) == results(5)
+    assert cache.get("semantic_scholar", "deep learning", 5) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_larger_limit_serves_smaller_in_rank_order(clock):
+    cache = SearchCache(":memory:")
+    cache.set("arxiv", "q", 10, results(10))
+    assert cache.get("arxiv", "q", 3) == results(3)
+    assert cache.get("arxiv", "q", 11) is None
+
+
+def test_smallest_sufficient_entry_wins(clock):
+    cache = SearchCache(":memory:")
+    cache.set("arxiv", "q", 50, [{"from": 50}] * 50)
+    cache.set("arxiv", "q", 5, [{"from": 5}] * 5)
+    assert cache.get("arxiv", "q", 4) == [{"from": 5}] * 4
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = SearchCache(":memory:", ttl=60)
+    cache.set("arxiv", "q", 5, results(5))
+    clock.now += 59
+    assert cache.get("arxiv", "q", 5) is not None
+    clock.now += 2
+    assert cache.get("arxiv", "q", 5) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_is_evicted(clock):
+    cache = SearchCache(":memory:", max_entries=2)
+    cache.set("arxiv", "a", 5, results(5))
+    clock.now += 1
+    cache.set("arxiv", "b", 5, results(5))
+    clock.now += 1
+    assert cache.get("arxiv", "a", 5)  # a is now more recent than b
+    clock.now += 1
+    cache.set("arxiv", "c", 5, results(5))
+    assert cache.get("arxiv", "b", 5) is None
+    assert cache.get("arxiv", "a", 5) and cache.get("arxiv", "c", 5)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_persists_across_instances(tmp_path, clock):
+    path = str(tmp_path / "cache" / "search.sqlite3")
+    first = SearchCache(path)
+    first.set("arxiv", "q", 5, results(5))
+    first.close()
+    assert SearchCache(path).get("arxiv", "q", 5) == results(5)
@@ -0,0 +1,29 @@
+"""Entry points must start without their heavy dependencies.
+
+Timing against the budgets is left to `python -m benchmarks.run_benchmarks
+--only startup`; this only checks which modules each entry point imports,
+which does not depend on the machine.
+"""
+import pytest
+
+from benchmarks.startup import HEAVY, PROJECT_ROOT, STARTUP, imported_modules, unwanted
+
+
+@pytest.mark.parametrize("name", sorted(STARTUP))
+def test_startup_skips_heavy_imports(name):
+    entry = STARTUP[name]
+    if not entry.cwd.is_dir():
+        pytest.skip(f"{entry.cwd} is not checked out")
+    modules = imported_modules(entry.cwd, entry.args)
+    assert not unwanted(modules, entry.absent), f"{name} imports {unwanted(modules, entry.absent)}"
+
+
+def test_startup_module_is_light():
+    modules = imported_modules(PROJECT_ROOT, ["-c", "import benchmarks.startup"])
+    assert not unwanted(modules, HEAVY)
+    assert "benchmarks.run_benchmarks" not in modules
+
+
+def test_unwanted_matches_submodules():
+    assert unwanted({"numpy.linalg", "json"}, frozenset({"numpy", "aiohttp"})) == ["numpy"]
+    assert unwanted({"numpyx"}, frozenset({"numpy"})) == []
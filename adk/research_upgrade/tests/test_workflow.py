@@ -0,0 +1,37 @@
+import asyncio
+
+from benchmarks.corpus import CORPUS_QUERY
+from conftest import offline_settings, offline_workflow
+from src.memory.research_memory import ResearchMemory
+
+
+def run(workflow, topic=CORPUS_QUERY):
+    async def main():
+        try:
+            return await workflow.execute(topic)
+        finally:
+            await workflow.aclose()
+    return asyncio.run(main())
+
+
+def test_offline_run_writes_outputs(tmp_path):
+    settings = offline_settings(tmp_path, max_papers=10, enable_checkpoints=False)
+    result = run(offline_workflow(settings))
+    assert result["status"] == "success"
+    assert result["papers_analyzed"] > 0
+    assert len(result["output_files"]) == len(settings.output_formats)
+
+
+def test_injected_memory_is_left_alone(tmp_path):
+    store = ResearchMemory()
+    view = store.scoped("caller")
+    view.store_context("keep", 1)
+    workflow = offline_workflow(offline_settings(tmp_path, max_papers=5, enable_checkpoints=False), memory=view)
+    run(workflow)
+    assert workflow.memory is view
+    assert view.namespace == "caller"
+    assert view.get_context("keep") == 1
+    assert view.get_all_results() == {}
+    assert workflow.run_memory.namespace == CORPUS_QUERY
+    assert workflow.run_memory.get_agent_result("SynthesisAgent")
+    assert all(agent.memory is workflow.run_memory for agent in workflow._agents())
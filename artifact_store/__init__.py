@@ -0,0 +1,7 @@
+"""
+Content-addressed artifact store shared by both apps: the crewAI app
+(`src.research_crew`) and the ADK app (`adk/research_upgrade`). See `store`.
+"""
+from artifact_store.store import CODECS, RUN_FILE, ArtifactStore, main, run_of
+
+__all__ = ["ArtifactStore", "CODECS", "RUN_FILE", "main", "run_of"]
@@ -0,0 +1,3 @@
+from artifact_store.store import main
+
+main()
@@ -0,0 +1,235 @@
+"""
+Content-Addressed Artifact Store
+
+Keeps output files as compressed blobs named by the SHA-256 of their contents
+(`<output_dir>/.store/objects/ab/<sha256>.zst`, or `.gz` when `zstandard` is
+not installed), so identical outputs are stored once. Each run (the file name
+without its extension, e.g. `review_20250101_120000`) gets a small manifest,
+`.store/runs/<run>.json`, mapping its file names to blobs:
+
+    {"run": "...", "created": "<iso time>",
+     "files": {"<run>.md": {"blob": "<sha256>", "codec": "gz", "size": <bytes>}, ...}}
+
+The stored files stay available as views through `read_view` / `open_view`
+and the CLI (each app also runs it with its own default `--output-dir`, as
+`python -m src.output.artifact_store` and `python -m src.research_crew.artifact_store`):
+
+    python -m artifact_store --output-dir outputs ls
+    python -m artifact_store --output-dir outputs cat review_20250101_120000.md
+    python -m artifact_store --output-dir outputs export review_20250101_120000.html /tmp
+    python -m artifact_store --output-dir outputs import --remove   # move loose run files in
+
+Writers stream: `open_blob` hashes and compresses data as it is written into a
+temporary file, which is renamed to its blob path once complete.
+"""
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import threading
+import uuid
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # gzip only
+    zstandard = None
+
+CODECS = ("zst", "gz")
+# Level 1 gzip still shrinks review JSON/HTML ~5x, at ~4x the speed of the default level 6.
+GZIP_LEVEL = 1
+ZSTD_LEVEL = 3
+# `<name>_<YYYYmmdd>_<HHMMSS>.<ext>`: the run files `import` picks up.
+RUN_FILE = re.compile(r"^.+_\d{8}_\d{6}\.[A-Za-z0-9.]+$")
+_BUFFER_SIZE = 1 << 20
+
+
+def run_of(filename: str) -> str:
+    """The run a file belongs to: its name up to the first dot (`x.apa.txt` -> `x`)."""
+    return filename.split(".", 1)[0]
+
+
+class _BlobSink(io.RawIOBase):
+    """Raw binary stream that hashes and compresses everything written to it into `path`."""
+
+    def __init__(self, path: Path, codec: str):
+        self.path = path
+        self.codec = codec
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self._file = open(path, "xb")
+        if codec == "zst":
+            self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31: gzip container
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        view = memoryview(data).cast("B")
+        self.sha256.update(view)
+        # Compress large writes (a whole orjson document) in slices to bound the compressor's output.
+        for start in range(0, len(view), _BUFFER_SIZE):
+            self._file.write(self._compressor.compress(view[start:start + _BUFFER_SIZE]))
+        self.size += len(view)
+        return len(view)
+
+    def close(self) -> None:
+        if not self.closed:
+            try:
+                self._file.write(self._compressor.flush())
+            finally:
+                self._file.close()
+        super().close()
+
+
+class ArtifactStore:
+    """Blobs plus per-run manifests under `<output_dir>/.store`."""
+
+    def __init__(self, output_dir: str, codec: Optional[str] = None):
+        self.output_dir = Path(output_dir)
+        self.objects = self.output_dir / ".store" / "objects"
+        self.runs = self.output_dir / ".store" / "runs"
+        self.codec = codec or ("zst" if zstandard is not None else "gz")
+        # Files of one run may be written concurrently and share its manifest.
+        self._manifest_lock = threading.Lock()
+
+    def _blob_path(self, digest: str, codec: str) -> Path:
+        return self.objects / digest[:2] / f"{digest}.{codec}"
+
+    def _find_blob(self, digest: str) -> Optional[Path]:
+        for codec in CODECS:
+            path = self._blob_path(digest, codec)
+            if path.exists():
+                return path
+        return None
+
+    # Writing
+    @contextmanager
+    def open_blob(self, filename: str, binary: bool = False) -> Iterator[IO]:
+        """Writable stream for the view `filename`; on success it becomes a blob
+        and is recorded in the manifest of the run `filename` belongs to."""
+        self.objects.mkdir(parents=True, exist_ok=True)
+        sink = _BlobSink(self.objects / f".{uuid.uuid4().hex}.tmp", self.codec)
+        stream = io.BufferedWriter(sink, _BUFFER_SIZE)
+        if not binary:
+            stream = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        try:
+            with stream:
+                yield stream
+            digest = sink.sha256.hexdigest()
+            if self._find_blob(digest) is None:
+                target = self._blob_path(digest, self.codec)
+                target.parent.mkdir(exist_ok=True)
+                os.replace(sink.path, target)
+            self._record(filename, {"blob": digest, "codec": self.codec, "size": sink.size})
+        finally:
+            sink.path.unlink(missing_ok=True)
+
+    def write_view(self, filename: str, text: str) -> None:
+        with self.open_blob(filename) as f:
+            f.write(text)
+
+    def import_file(self, path: Path) -> None:
+        """Store the regular file `path` as the view of the same name."""
+        with open(path, "rb") as src, self.open_blob(path.name, binary=True) as dst:
+            while chunk := src.read(_BUFFER_SIZE):
+                dst.write(chunk)
+
+    def _record(self, filename: str, entry: Dict[str, Any]) -> None:
+        run = run_of(filename)
+        self.runs.mkdir(parents=True, exist_ok=True)
+        with self._manifest_lock:
+            manifest = self.manifest(run) if (self.runs / f"{run}.json").exists() else {
+                "run": run, "created": datetime.now().isoformat(), "files": {}}
+            manifest["files"][filename] = entry
+            tmp = self.runs / f".{run}.{uuid.uuid4().hex}.tmp"
+            tmp.write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+            os.replace(tmp, self.runs / f"{run}.json")
+
+    # Reading
+    def manifest(self, run: str) -> Dict[str, Any]:
+        with open(self.runs / f"{run}.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def manifests(self) -> Iterator[os.DirEntry]:
+        """Directory entries of every run manifest (cheap: no manifest is read)."""
+        if self.runs.is_dir():
+            yield from (e for e in os.scandir(self.runs) if e.name.endswith(".json"))
+
+    def views(self) -> List[str]:
+        names: List[str] = []
+        for entry in sorted(self.manifests(), key=lambda e: e.name):
+            names.extend(self.manifest(entry.name[:-len(".json")])["files"])
+        return names
+
+    def open_view(self, filename: str) -> IO[bytes]:
+        """Decompressing binary stream over the view `filename`."""
+        try:
+            entry = self.manifest(run_of(filename))["files"].get(filename)
+        except FileNotFoundError:
+            entry = None
+        path = self._find_blob(entry["blob"]) if entry else None
+        if path is None:
+            raise FileNotFoundError(filename)
+        if path.suffix == ".zst":
+            if zstandard is None:
+                raise RuntimeError("this blob is zstd-compressed; install `zstandard` to read it")
+            return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        return gzip.open(path, "rb")
+
+    def read_view(self, filename: str) -> str:
+        with self.open_view(filename) as f:
+            return f.read().decode("utf-8")
+
+    def disk_usage(self) -> int:
+        return sum(p.stat().st_size for p in (self.output_dir / ".store").rglob("*") if p.is_file())
+
+
+def main(default_output_dir: str = "./output") -> None:
+    parser = argparse.ArgumentParser(description="Inspect and fill the output artifact store")
+    parser.add_argument("--output-dir", default=default_output_dir, help="Output directory holding .store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("ls", help="List the stored views")
+    cat = sub.add_parser("cat", help="Write a view to stdout")
+    cat.add_argument("filename")
+    export = sub.add_parser("export", help="Write a view out as a regular file")
+    export.add_argument("filename")
+    export.add_argument("dest", nargs="?", default=".")
+    migrate = sub.add_parser("import", help="Store the loose <name>_<YYYYmmdd>_<HHMMSS>.* files of --output-dir")
+    migrate.add_argument("--remove", action="store_true", help="Delete the loose files once stored")
+    args = parser.parse_args()
+
+    store = ArtifactStore(args.output_dir)
+    if args.command == "ls":
+        print("\n".join(store.views()))
+        return
+    if args.command == "import":
+        loose = sorted(p for p in Path(args.output_dir).iterdir() if p.is_file() and RUN_FILE.match(p.name))
+        before = sum(p.stat().st_size for p in loose)
+        for path in loose:
+            store.import_file(path)
+            if args.remove:
+                path.unlink()
+        print(f"Imported {len(loose)} files: {before} bytes loose -> {store.disk_usage()} bytes in the store")
+        return
+    with store.open_view(args.filename) as src:
+        if args.command == "cat":
+            while chunk := src.read(_BUFFER_SIZE):
+                sys.stdout.buffer.write(chunk)
+            return
+        dest = Path(args.dest)
+        target = dest / args.filename if dest.is_dir() else dest
+        with open(target, "wb") as out:
+            while chunk := src.read(_BUFFER_SIZE):
+                out.write(chunk)
+    print(target)
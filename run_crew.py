@@ -2,6 +2,9 @@ import sys
 from src.research_crew.main import run
 
 if __name__ == "__main__":
+    if len(sys.argv) == 2 and sys.argv[1] in ("-h", "--help"):
+        print("Usage: python run_crew.py [research_topic]")
+        sys.exit(0)
     if len(sys.argv) == 1:
         sys.argv.extend(['run', 'machine learning'])
     elif len(sys.argv) == 2:
@@ -1,4 +1,12 @@
-from .crew import ResearchPaperAnalysisCrew
-from .main import run
+__all__ = ["ResearchPaperAnalysisCrew", "run"]
 
-__all__ = ["ResearchPaperAnalysisCrew", "run"]
\ No newline at end of file
+
+def __getattr__(name):
+    # Resolved on first use, so importing the package (or its CLI modules) does not load crewai.
+    if name == "ResearchPaperAnalysisCrew":
+        from .crew import ResearchPaperAnalysisCrew
+        return ResearchPaperAnalysisCrew
+    if name == "run":
+        from .main import run
+        return run
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
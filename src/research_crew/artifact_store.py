@@ -0,0 +1,16 @@
+"""
+Content-Addressed Artifact Store
+
+The store is the top-level `artifact_store` package at the repository root,
+shared with the ADK app. This module runs its CLI with this app's default
+output directory:
+
+    python -m src.research_crew.artifact_store ls
+    python -m src.research_crew.artifact_store cat Solar_Energy_20250101_120000.md
+"""
+from artifact_store import CODECS, RUN_FILE, ArtifactStore, main, run_of
+
+__all__ = ["ArtifactStore", "CODECS", "RUN_FILE", "run_of"]
+
+if __name__ == "__main__":
+    main("outputs")
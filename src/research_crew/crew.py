@@ -2,12 +2,9 @@ import os
 import json
 from crewai import LLM, Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import ArxivPaperTool, ScrapeWebsiteTool  
-from crewai_tools import SerplyScholarSearchTool
 
-
-
-scholar_search = SerplyScholarSearchTool()
+# crewai_tools is imported inside the agents that use its tools, so importing this
+# module does not load it (or build tools that need API keys) until the crew is assembled.
 
 @CrewBase
 class ResearchPaperAnalysisCrew:
@@ -32,6 +29,7 @@ class ResearchPaperAnalysisCrew:
 
     @agent
     def paper_retriever(self) -> Agent:
+        from crewai_tools import ArxivPaperTool, ScrapeWebsiteTool, SerplyScholarSearchTool
         return Agent(
             role="Academic Paper Retrieval Specialist",
             goal="Find and collect relevant academic papers and research documents for {research_topic}",
@@ -49,6 +47,7 @@ class ResearchPaperAnalysisCrew:
 
     @agent
     def content_extractor(self) -> Agent:
+        from crewai_tools import ScrapeWebsiteTool
         return Agent(
             role="Content Extraction Analyst",
             goal="Extract key information, methodologies, and findings from academic papers",
@@ -1,10 +1,29 @@
 
 import time
+import os
 import sys
 import time
 import json
+from contextlib import contextmanager
 from pathlib import Path
-from src.research_crew.crew import ResearchPaperAnalysisCrew
+from src.research_crew.artifact_store import ArtifactStore
+from src.research_crew.run_index import RunIndex
+
+# Reuse a stored run on the same or a similar topic if it is at most this many days old (0 disables)
+REUSE_DAYS = float(os.getenv("RESEARCH_CREW_REUSE_DAYS", "7"))
+# Opt-in: keep run outputs as compressed, de-duplicated blobs in outputs/.store
+# instead of regular files (read them with python -m src.research_crew.artifact_store cat ...)
+ARTIFACT_STORE = os.getenv("RESEARCH_CREW_ARTIFACT_STORE", "0") == "1"
+
+@contextmanager
+def open_output(path):
+    """Text stream for an output file: the file itself, or its artifact store view."""
+    if ARTIFACT_STORE:
+        with ArtifactStore(path.parent).open_blob(path.name) as f:
+            yield f
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            yield f
 
 def save_output(result, research_topic):
     """Save the crew output to both .md and .json files."""
@@ -22,7 +41,7 @@ def save_output(result, research_topic):
     
     # Save as Markdown
     md_file = output_dir / f"{base_filename}.md"
-    with open(md_file, 'w', encoding='utf-8') as f:
+    with open_output(md_file) as f:
         f.write(f"# Research Analysis: {research_topic}\n\n")
         f.write(f"**Generated on:** {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
         f.write("---\n\n")
@@ -39,12 +58,28 @@ def save_output(result, research_topic):
         "tasks_output": [str(task) for task in result.tasks_output] if hasattr(result, 'tasks_output') else None
     }
     
-    with open(json_file, 'w', encoding='utf-8') as f:
+    with open_output(json_file) as f:
         json.dump(output_data, f, indent=2, ensure_ascii=False)
     
     print(f"\n done done Output saved done done!")
     print(f"Markdown: {md_file}")
     print(f"JSON: {json_file}")
+    if ARTIFACT_STORE:
+        print("(stored compressed; read them with: python -m src.research_crew.artifact_store cat <file name>)")
+
+def build_crew():
+    """The crew, ready to kick off. crewai is imported here rather than at startup,
+    so `--help`, usage errors and reused runs never load it."""
+    from src.research_crew.crew import ResearchPaperAnalysisCrew
+    return ResearchPaperAnalysisCrew().crew()
+
+def find_reusable_run(research_topic):
+    """Return the newest recent run on the same or a similar topic, or None."""
+    if REUSE_DAYS <= 0:
+        return None
+    with RunIndex() as index:
+        index.refresh()
+        return index.find_recent(research_topic, REUSE_DAYS)
 
 def run():
     """Run the Research Paper Analysis crew with rate limiting."""
@@ -55,13 +90,19 @@ def run():
 
     inputs = {'research_topic': research_topic}
 
+    previous = find_reusable_run(research_topic)
+    if previous:
+        print(f"♻️ Reusing run on '{previous['topic']}' from {previous['generated_on']}: {previous['path']}")
+        print("Set RESEARCH_CREW_REUSE_DAYS=0 to force a fresh run.")
+        return RunIndex.load(previous['path'])
+
     # Add delay to avoid hitting rate limits
     print(f"🔍 Starting research analysis on: '{research_topic}'")
     print("Starting crew execution with rate limiting...")
     time.sleep(2)  # 2 second delay before starting
 
     try:
-        result = ResearchPaperAnalysisCrew().crew().kickoff(inputs=inputs)  # ← Store result
+        result = build_crew().kickoff(inputs=inputs)  # ← Store result
         save_output(result, research_topic)  # ← Add this line
         return result  # ← Add this line
     except Exception as e:
@@ -69,7 +110,7 @@ def run():
             print("Rate limit hit. Waiting 10 seconds before retry...")
             time.sleep(10)
             # Retry once
-            result = ResearchPaperAnalysisCrew().crew().kickoff(inputs=inputs)
+            result = build_crew().kickoff(inputs=inputs)
             save_output(result, research_topic)  # ← Add this line for retry too
             return result
         else:
@@ -84,7 +125,7 @@ def train():
     }
     try:
         # Fix: Use sys.argv[2] and sys.argv[3] since sys.argv[1] is 'train'
-        ResearchPaperAnalysisCrew().crew().train(
+        build_crew().train(
             n_iterations=int(sys.argv[2]), 
             filename=sys.argv[3], 
             inputs=inputs
@@ -98,7 +139,7 @@ def replay():
     """
     try:
         # Fix: Use sys.argv[2] since sys.argv[1] is 'replay'
-        ResearchPaperAnalysisCrew().crew().replay(task_id=sys.argv[2])
+        build_crew().replay(task_id=sys.argv[2])
     except Exception as e:
         raise Exception(f"An error occurred while replaying the crew: {e}")
 
@@ -111,7 +152,7 @@ def test():
     }
     try:
         # Fix: Use sys.argv[2] and sys.argv[3] since sys.argv[1] is 'test'
-        ResearchPaperAnalysisCrew().crew().test(
+        build_crew().test(
             n_iterations=int(sys.argv[2]), 
             eval_llm=sys.argv[3], 
             inputs=inputs
@@ -120,14 +161,14 @@ def test():
         raise Exception(f"An error occurred while testing the crew: {e}")
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help"):
         print("Usage: python main.py <command> [<args>]")
         print("Commands:")
         print("  run [research_topic]    - Run the crew")
         print("  train <iterations> <filename> - Train the crew")
         print("  replay <task_id>        - Replay execution")
         print("  test <iterations> <eval_llm> - Test the crew")
-        sys.exit(1)
+        sys.exit(0 if len(sys.argv) > 1 else 1)
 
     command = sys.argv[1]
     if command == "run":
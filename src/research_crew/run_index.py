@@ -0,0 +1,226 @@
+"""
+Full-text index over past crew runs.
+
+Every run saved by `save_output` (outputs/<topic>_YYYYMMDD_HHMMSS.json, as a
+loose file or as an artifact store view) is indexed into a SQLite FTS5 table:
+the topic, the final result and every task output. `refresh()` is incremental; it compares each file's size and mtime with
+what was indexed and only parses new or changed files, so it stays cheap with
+thousands of stored runs. `find_recent()` lets `run` reuse the task outputs of
+a recent run on the same or a similar topic instead of calling the LLM again.
+
+    python -m src.research_crew.run_index refresh
+    python -m src.research_crew.run_index search "solar grid storage"
+    python -m src.research_crew.run_index recent "Solar Energy" --days 7
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.research_crew.artifact_store import ArtifactStore
+
+RUN_FILE = re.compile(r"^(?P<stem>.+)_(?P<ts>\d{8}_\d{6})\.json$")
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    topic TEXT NOT NULL,
+    topic_key TEXT NOT NULL,
+    generated_on REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_topic_key ON runs (topic_key, generated_on);
+CREATE VIRTUAL TABLE IF NOT EXISTS run_text USING fts5(topic, content, tokenize = 'porter unicode61');
+"""
+
+
+def topic_key(topic: str) -> str:
+    """Case- and punctuation-insensitive form of a topic, for exact "same topic" lookups."""
+    return " ".join(_WORD.findall(topic.lower()))
+
+
+def fts_query(text: str, any_term: bool = False) -> str:
+    """Quote every word so user text can't be parsed as FTS5 syntax."""
+    terms = [f'"{w}"' for w in _WORD.findall(text)]
+    return (" OR " if any_term else " ").join(terms)
+
+
+def _generated_on(data: Dict[str, Any], timestamp: str) -> float:
+    for value, fmt in ((data.get("generated_on"), "%Y-%m-%d %H:%M:%S"), (timestamp, "%Y%m%d_%H%M%S")):
+        try:
+            return datetime.strptime(value, fmt).timestamp()
+        except (TypeError, ValueError):
+            continue
+    return 0.0
+
+
+class RunIndex:
+    """Incremental FTS5 index of the run artifacts in `outputs_dir`."""
+
+    def __init__(self, outputs_dir: str = "outputs", db_path: str = ".cache/run_index.sqlite3"):
+        self.outputs_dir = Path(outputs_dir)
+        self.store = ArtifactStore(outputs_dir)
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "RunIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def refresh(self) -> Dict[str, int]:
+        """Index new or changed run files and drop deleted ones, in one transaction."""
+        known = {row["path"]: (row["id"], row["size"], row["mtime"])
+                 for row in self.conn.execute("SELECT id, path, size, mtime FROM runs")}
+        seen = set()
+        added = updated = 0
+        # Loose run files first, then runs kept in the artifact store (indexed under
+        # their view path; a loose file of the same name takes precedence).
+        entries = list(os.scandir(self.outputs_dir)) if self.outputs_dir.is_dir() else []
+        entries += self.store.manifests()
+        with self.conn:
+            for entry in entries:
+                match = RUN_FILE.match(entry.name)
+                if not match or not entry.is_file():
+                    continue
+                path = str(self.outputs_dir / entry.name)
+                if path in seen:
+                    continue
+                seen.add(path)
+                stat = entry.stat()
+                previous = known.get(path)
+                if previous and previous[1] == stat.st_size and previous[2] == stat.st_mtime:
+                    continue
+                if previous:
+                    self._delete(previous[0])
+                    updated += 1
+                else:
+                    added += 1
+                self._insert(path, stat, match.group("ts"))
+            removed = [known[p][0] for p in known.keys() - seen]
+            for run_id in removed:
+                self._delete(run_id)
+        return {"added": added, "updated": updated, "removed": len(removed), "total": len(seen)}
+
+    def _insert(self, path: str, stat: os.stat_result, timestamp: str) -> None:
+        try:
+            data = self.load(path)
+        except (OSError, ValueError):
+            return
+        topic = str(data.get("research_topic") or "")
+        content = "\n\n".join(str(part) for part in [data.get("raw_result") or data.get("result") or "",
+                                                     *(data.get("tasks_output") or [])])
+        cursor = self.conn.execute(
+            "INSERT INTO runs (path, size, mtime, topic, topic_key, generated_on) VALUES (?, ?, ?, ?, ?, ?)",
+            (path, stat.st_size, stat.st_mtime, topic, topic_key(topic), _generated_on(data, timestamp)),
+        )
+        self.conn.execute("INSERT INTO run_text (rowid, topic, content) VALUES (?, ?, ?)",
+                          (cursor.lastrowid, topic, content))
+
+    def _delete(self, run_id: int) -> None:
+        self.conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+        self.conn.execute("DELETE FROM run_text WHERE rowid = ?", (run_id,))
+
+    @staticmethod
+    def _row(row: sqlite3.Row) -> Dict[str, Any]:
+        record = dict(row)
+        record["generated_on"] = datetime.fromtimestamp(record["generated_on"]).isoformat(sep=" ")
+        return record
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Runs whose topic or outputs match any word of `query`, best BM25 match first."""
+        match = fts_query(query, any_term=True)
+        if not match:
+            return []
+        rows = self.conn.execute(
+            """SELECT runs.path, runs.topic, runs.generated_on, bm25(run_text, 5.0, 1.0) AS score,
+                      snippet(run_text, 1, '[', ']', ' ... ', 12) AS snippet
+               FROM run_text JOIN runs ON runs.id = run_text.rowid
+               WHERE run_text MATCH ? ORDER BY score LIMIT ?""",
+            (match, limit),
+        )
+        return [self._row(r) for r in rows]
+
+    def find_recent(self, topic: str, max_age_days: float = 7.0) -> Optional[Dict[str, Any]]:
+        """Newest run on the same topic within `max_age_days`, else one on a similar topic.
+
+        "Same" ignores case and punctuation; "similar" means the stored topic has
+        the same words after stemming (e.g. "solar energies" for "solar energy").
+        """
+        since = time.time() - timedelta(days=max_age_days).total_seconds()
+        row = self.conn.execute(
+            "SELECT path, topic, generated_on FROM runs WHERE topic_key = ? AND generated_on >= ? "
+            "ORDER BY generated_on DESC LIMIT 1",
+            (topic_key(topic), since),
+        ).fetchone()
+        match = fts_query(topic)
+        if row is None and match:
+            # FTS narrows the candidates; equal word counts keep "machine" from matching "machine learning".
+            words = len(topic_key(topic).split())
+            candidates = self.conn.execute(
+                """SELECT runs.path, runs.topic, runs.topic_key, runs.generated_on
+                   FROM run_text JOIN runs ON runs.id = run_text.rowid
+                   WHERE run_text MATCH ? AND runs.generated_on >= ?
+                   ORDER BY runs.generated_on DESC LIMIT 50""",
+                (f"topic : ({match})", since),
+            )
+            row = next((r for r in candidates if len(r["topic_key"].split()) == words), None)
+        if row is None:
+            return None
+        record = self._row(row)
+        record.pop("topic_key", None)
+        return record
+
+    @staticmethod
+    def load(path: str) -> Dict[str, Any]:
+        """A run's JSON document, from the loose file or else from the artifact store."""
+        path = Path(path)
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return json.loads(ArtifactStore(path.parent).read_view(path.name))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Index and search past crew runs")
+    parser.add_argument("--outputs", default="outputs", help="Directory holding run artifacts")
+    parser.add_argument("--db", default=".cache/run_index.sqlite3", help="Index database")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("refresh", help="Index new or changed runs")
+    search = sub.add_parser("search", help="Full-text search over topics and outputs")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=10)
+    recent = sub.add_parser("recent", help="Most recent run on the same or a similar topic")
+    recent.add_argument("topic")
+    recent.add_argument("--days", type=float, default=7.0)
+    args = parser.parse_args()
+
+    with RunIndex(args.outputs, args.db) as index:
+        stats = index.refresh()
+        if args.command == "refresh":
+            print(f"Indexed {stats['total']} runs ({stats['added']} added, {stats['updated']} updated, "
+                  f"{stats['removed']} removed)")
+        elif args.command == "search":
+            for hit in index.search(args.query, args.limit):
+                print(f"{hit['generated_on']}  {hit['topic']}  {hit['path']}\n    {hit['snippet']}")
+        else:
+            hit = index.find_recent(args.topic, args.days)
+            print(f"{hit['generated_on']}  {hit['topic']}  {hit['path']}" if hit else "No recent run found")
+
+
+if __name__ == "__main__":
+    main()
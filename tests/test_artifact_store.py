@@ -0,0 +1,52 @@
+import pytest
+
+from artifact_store import ArtifactStore, run_of
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(str(tmp_path), codec="gz")
+
+
+def test_run_of():
+    assert run_of("review_20250101_120000.apa.txt") == "review_20250101_120000"
+
+
+def test_views_round_trip_and_share_blobs(store):
+    store.write_view("review_20250101_120000.md", "# Review\n\nsame ✓ text")
+    with store.open_blob("review_20250101_120000.json") as f:
+        f.write('{"a": 1}')
+    store.write_view("review_20250102_090000.md", "# Review\n\nsame ✓ text")
+
+    assert store.read_view("review_20250101_120000.md") == "# Review\n\nsame ✓ text"
+    assert store.read_view("review_20250101_120000.json") == '{"a": 1}'
+    assert store.views() == ["review_20250101_120000.md", "review_20250101_120000.json",
+                             "review_20250102_090000.md"]
+    first = store.manifest("review_20250101_120000")["files"]["review_20250101_120000.md"]
+    second = store.manifest("review_20250102_090000")["files"]["review_20250102_090000.md"]
+    assert first["blob"] == second["blob"]
+    assert len(list(store.objects.rglob("*.gz"))) == 2
+    assert sorted(e.name for e in store.manifests()) == ["review_20250101_120000.json",
+                                                         "review_20250102_090000.json"]
+
+
+def test_import_file_and_missing_views(store, tmp_path):
+    loose = tmp_path / "review_20250101_120000.html"
+    loose.write_bytes(b"<p>x</p>" * 10000)
+    store.import_file(loose)
+    assert store.read_view(loose.name) == "<p>x</p>" * 10000
+    assert store.disk_usage() < loose.stat().st_size
+    with pytest.raises(FileNotFoundError):
+        store.read_view("review_20250101_120000.bib")
+    with pytest.raises(FileNotFoundError):
+        store.read_view("other_20250101_120000.md")
+    assert not list(store.objects.glob("*.tmp"))
+
+
+def test_failed_write_records_nothing(store):
+    with pytest.raises(RuntimeError):
+        with store.open_blob("review_20250101_120000.md") as f:
+            f.write("partial")
+            raise RuntimeError("boom")
+    assert store.views() == []
+    assert not list(store.objects.rglob("*.*"))
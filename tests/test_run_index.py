@@ -0,0 +1,87 @@
+import json
+import os
+import time
+
+import pytest
+
+from src.research_crew.artifact_store import ArtifactStore
+from src.research_crew.run_index import RunIndex, fts_query, topic_key
+
+
+def write_run(outputs, topic, age_days=0.0, result="", name=None):
+    generated = time.time() - age_days * 86400
+    stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(generated))
+    path = outputs / f"{name or topic_key(topic).replace(' ', '_')}_{stamp}.json"
+    path.write_text(json.dumps({
+        "research_topic": topic,
+        "generated_on": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(generated)),
+        "result": result, "raw_result": result, "tasks_output": [f"task about {topic}"],
+    }), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def outputs(tmp_path):
+    path = tmp_path / "outputs"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def index(tmp_path, outputs):
+    with RunIndex(str(outputs), str(tmp_path / "index.sqlite3")) as index:
+        yield index
+
+
+def test_topic_key_and_fts_query():
+    assert topic_key("  Solar-Energy, 2024! ") == "solar energy 2024"
+    assert fts_query('solar AND "grid"') == '"solar" "AND" "grid"'
+    assert fts_query("a b", any_term=True) == '"a" OR "b"'
+
+
+def test_same_topic_ignores_case_and_punctuation(index, outputs):
+    write_run(outputs, "Solar Energy", age_days=3, name="old")
+    newest = write_run(outputs, "solar energy!", age_days=1, name="new")
+    index.refresh()
+    found = index.find_recent("SOLAR  energy", max_age_days=7)
+    assert found["path"] == str(newest)
+    assert found["topic"] == "solar energy!"
+
+
+def test_similar_topic_needs_the_same_stemmed_words(index, outputs):
+    write_run(outputs, "Solar Energies")
+    write_run(outputs, "Solar Energy Storage Systems")
+    index.refresh()
+    assert index.find_recent("solar energy")["topic"] == "Solar Energies"
+    assert index.find_recent("solar") is None
+
+
+def test_old_runs_are_not_reused(index, outputs):
+    write_run(outputs, "Solar Energy", age_days=10)
+    index.refresh()
+    assert index.find_recent("Solar Energy", max_age_days=7) is None
+    assert index.find_recent("Solar Energy", max_age_days=30)["topic"] == "Solar Energy"
+
+
+def test_refresh_is_incremental(index, outputs):
+    first = write_run(outputs, "Wind Power", name="wind")
+    write_run(outputs, "Tidal Power", name="tidal")
+    assert index.refresh() == {"added": 2, "updated": 0, "removed": 0, "total": 2}
+    assert index.refresh() == {"added": 0, "updated": 0, "removed": 0, "total": 2}
+    data = json.loads(first.read_text(encoding="utf-8"))
+    first.write_text(json.dumps({**data, "result": "offshore turbines"}), encoding="utf-8")
+    os.utime(first, (time.time() + 5, time.time() + 5))
+    assert index.refresh()["updated"] == 1
+    assert index.search("turbines")[0]["path"] == str(first)
+    first.unlink()
+    assert index.refresh() == {"added": 0, "updated": 0, "removed": 1, "total": 1}
+
+
+def test_runs_kept_in_the_artifact_store_are_indexed(index, outputs):
+    loose = write_run(outputs, "Geothermal Heat", result="hot rocks")
+    ArtifactStore(str(outputs)).import_file(loose)
+    loose.unlink()
+    index.refresh()
+    found = index.find_recent("geothermal heat")
+    assert found["path"] == str(loose)
+    assert RunIndex.load(found["path"])["result"] == "hot rocks"